@@ -0,0 +1,3 @@
+"""
+    Benchmarks (run as scripts, e.g. `python -m benchmarks.decoded_memory`)
+"""
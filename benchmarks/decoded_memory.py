@@ -0,0 +1,119 @@
+"""
+    Measures the resident memory of a window of decoded blocks, with and
+    without identity interning.
+
+    Usage: python -m benchmarks.decoded_memory [n_blocks] [txs_per_block]
+"""
+
+import gc
+import sys
+import tracemalloc
+from unittest.mock import patch
+
+from snakeskin.protos.common.common_pb2 import (
+    BlockHeader, BlockData, BlockMetadata, Envelope, Payload, Header,
+    ChannelHeader, SignatureHeader, Metadata, LastConfig
+)
+from snakeskin.protos.msp.identities_pb2 import SerializedIdentity
+from snakeskin.protos.peer.proposal_response_pb2 import Endorsement
+from snakeskin.protos.peer.transaction_pb2 import (
+    Transaction, TransactionAction, ChaincodeActionPayload,
+    ChaincodeEndorsedAction
+)
+from snakeskin.constants import TransactionType
+from snakeskin.models.block import RawBlock
+
+CERT_PATHS = [
+    'network-config/crypto/peerOrganizations/org1.com/users/Admin@org1.com/'
+    'msp/signcerts/Admin@org1.com-cert.pem',
+    'network-config/crypto/peerOrganizations/org1.com/peers/peer.org1.com/'
+    'msp/signcerts/peer.org1.com-cert.pem',
+    'network-config/crypto/peerOrganizations/org2.com/peers/peer.org2.com/'
+    'msp/signcerts/peer.org2.com-cert.pem',
+]
+
+
+def _identity(path, msp_id):
+    with open(path, 'rb') as inf:
+        return SerializedIdentity(mspid=msp_id, id_bytes=inf.read()).SerializeToString()
+
+
+def build_block(number, n_txs, creator, endorsers):
+    """ Builds an endorser transaction block signed by the same identities """
+    signature_header = SignatureHeader(creator=creator, nonce=b'n' * 24)
+    envelopes = []
+    for idx in range(n_txs):
+        action_payload = ChaincodeActionPayload(
+            action=ChaincodeEndorsedAction(
+                proposal_response_payload=b'',
+                endorsements=[
+                    Endorsement(endorser=e, signature=b's' * 70) for e in endorsers
+                ]
+            )
+        )
+        transaction = Transaction(actions=[TransactionAction(
+            header=signature_header.SerializeToString(),
+            payload=action_payload.SerializeToString(),
+        )])
+        payload = Payload(
+            header=Header(
+                channel_header=ChannelHeader(
+                    type=TransactionType.EndorserTransaction.value,
+                    tx_id=f'{number}-{idx}',
+                ).SerializeToString(),
+                signature_header=signature_header.SerializeToString(),
+            ),
+            data=transaction.SerializeToString()
+        )
+        envelopes.append(Envelope(
+            payload=payload.SerializeToString(), signature=b's' * 70
+        ).SerializeToString())
+
+    metadata = Metadata().SerializeToString()
+    return RawBlock(
+        header=BlockHeader(number=number),
+        data=BlockData(data=envelopes),
+        metadata=BlockMetadata(metadata=[
+            metadata,
+            Metadata(value=LastConfig().SerializeToString()).SerializeToString(),
+            bytes(n_txs),
+        ])
+    )
+
+
+def measure(raw_blocks):
+    """ Decodes all blocks and returns the memory they retain, in bytes """
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    decoded = [block.decode() for block in raw_blocks]
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del decoded
+    return end - start
+
+
+def main(n_blocks=10000, n_txs=5):
+    """ Runs the benchmark """
+    creator = _identity(CERT_PATHS[0], 'Org1MSP')
+    endorsers = [_identity(CERT_PATHS[1], 'Org1MSP'), _identity(CERT_PATHS[2], 'Org2MSP')]
+    raw_blocks = [
+        build_block(number, n_txs, creator, endorsers)
+        for number in range(n_blocks)
+    ]
+
+    with patch(
+            'snakeskin.models._decoded._intern_identity',
+            SerializedIdentity.FromString):
+        without_interning = measure(raw_blocks)
+    with_interning = measure(raw_blocks)
+
+    print(f'{n_blocks} blocks x {n_txs} transactions')
+    print(f'  without interning: {without_interning / 2**20:8.1f} MiB')
+    print(f'  with interning:    {with_interning / 2**20:8.1f} MiB')
+    print(f'  reduction:         {1 - with_interning / without_interning:8.1%}')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
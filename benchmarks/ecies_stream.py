@@ -0,0 +1,73 @@
+"""
+    Measures the throughput and peak memory of streaming ECIES encryption
+    and decryption, compared with encrypting the payload in a single chunk.
+
+    Usage: python -m benchmarks.ecies_stream [size_mib] [chunk_kib]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from snakeskin.crypto import encrypt_stream, decrypt_stream
+
+
+class _NullWriter:
+    """ Discards written bytes, so that only the crypto is measured """
+
+    @staticmethod
+    def write(data):
+        return len(data)
+
+
+def measure(operation, path, chunk_size):
+    """ Runs the operation on the file, returning (seconds, peak bytes) """
+    with open(path, 'rb') as source:
+        tracemalloc.start()
+        start = time.perf_counter()
+        operation(source, _NullWriter(), chunk_size=chunk_size)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(size_mib=64, chunk_kib=64):
+    """ Runs the benchmark """
+    size = size_mib * 2**20
+    private_key = ec.generate_private_key(ec.SECP256R1(), default_backend())
+    public_key = private_key.public_key()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        plain_path = os.path.join(tmp_dir, 'plain')
+        cipher_path = os.path.join(tmp_dir, 'cipher')
+        with open(plain_path, 'wb') as outf:
+            outf.write(os.urandom(size))
+        with open(plain_path, 'rb') as source, open(cipher_path, 'wb') as outf:
+            encrypt_stream(public_key, source, outf)
+
+        def _encrypt(source, out, chunk_size):
+            encrypt_stream(public_key, source, out, chunk_size=chunk_size)
+
+        def _decrypt(source, out, chunk_size):
+            decrypt_stream(private_key, source, out, chunk_size=chunk_size)
+
+        print(f'{size_mib} MiB payload')
+        for name, operation, path in (('encrypt', _encrypt, plain_path),
+                                      ('decrypt', _decrypt, cipher_path)):
+            for label, chunk_size in ((f'{chunk_kib} KiB chunks', chunk_kib * 2**10),
+                                      ('single chunk', size + 2**10)):
+                elapsed, peak = measure(operation, path, chunk_size)
+                print(
+                    f'  {name} {label:>14}: {size_mib / elapsed:8.1f} MiB/s, '
+                    f'peak {peak / 2**20:8.2f} MiB'
+                )
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
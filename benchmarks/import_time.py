@@ -0,0 +1,54 @@
+"""
+    Measures the import time of snakeskin modules with `python -X importtime`,
+    each in a fresh interpreter, and lists the slowest modules they load.
+
+    Usage: python -m benchmarks.import_time [module ...]
+"""
+
+import subprocess
+import sys
+from typing import List, Tuple
+
+MODULES = [
+    'snakeskin.models',
+    'snakeskin.errors',
+    'snakeskin.factories',
+    'snakeskin.events',
+    'snakeskin.config',
+]
+
+
+def measure(module: str) -> List[Tuple[int, str]]:
+    """ Imports the module in a new interpreter, returning the cumulative
+        import time in microseconds of every module it loaded
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        timings.append((int(cumulative), name.strip()))
+    return timings
+
+
+def main(modules: List[str]):
+    """ Runs the benchmark """
+    for module in modules:
+        timings = measure(module)
+        total = next(us for us, name in timings if name == module)
+        print(f'{module}: {total / 1000:8.1f} ms, {len(timings)} modules')
+        slowest = sorted(
+            (timing for timing in timings if timing[1] != module), reverse=True
+        )
+        for us, name in slowest[:5]:
+            print(f'    {us / 1000:8.1f} ms  {name}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or MODULES)
@@ -0,0 +1,56 @@
+"""
+    Measures the time to package chaincode with a single gzip stream,
+    compared with compressing gzip members in parallel.
+
+    Usage: python -m benchmarks.package_gzip [size_mib] [workers]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+
+from snakeskin.constants import ChaincodeLanguage
+from snakeskin.models import ChaincodeSpec
+from snakeskin.packaging import write_package
+
+
+def measure(cc_spec, workers):
+    """ Packages the chaincode, returning (seconds, package bytes) """
+    out = io.BytesIO()
+    start = time.perf_counter()
+    write_package(cc_spec, out, workers=workers)
+    return time.perf_counter() - start, len(out.getvalue())
+
+
+def main(size_mib=32, workers=None):
+    """ Runs the benchmark """
+    workers = workers or os.cpu_count()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        os.makedirs('mycc/vendor')
+        # Half random (incompressible) and half repetitive source, in 1 MiB
+        # files, as with vendored modules
+        for idx in range(size_mib):
+            with open(f'mycc/vendor/file{idx}.go', 'wb') as outf:
+                if idx % 2:
+                    outf.write(os.urandom(2**20))
+                else:
+                    outf.write(b'func f() { return nil }\n' * (2**20 // 24))
+        cc_spec = ChaincodeSpec(
+            name='mycc', language=ChaincodeLanguage.GOLANG, path='mycc'
+        )
+
+        print(f'{size_mib} MiB chaincode')
+        for label, count in (('single stream', None),
+                             (f'{workers} workers', workers)):
+            elapsed, size = measure(cc_spec, count)
+            print(
+                f'  {label:>14}: {elapsed:6.2f}s, '
+                f'package {size / 2**20:6.2f} MiB'
+            )
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,200 @@
+"""
+    An in-memory view of a channel's configuration, loaded from its latest
+    config block and updated as new config blocks are delivered
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+from .protos.common.common_pb2 import (
+    Envelope,
+    Payload,
+    ChannelHeader,
+    Metadata,
+    LastConfig,
+    LAST_CONFIG,
+)
+from .protos.common.configtx_pb2 import Config, ConfigEnvelope, ConfigGroup
+from .protos.common.configuration_pb2 import OrdererAddresses
+from .protos.msp.msp_config_pb2 import MSPConfig, FabricMSPConfig
+from .protos.peer.configuration_pb2 import AnchorPeers
+from .models.block import RawBlock
+from .events import PeerEvents, OrdererEvents
+from .constants import TransactionType, INDEFINITE_STOP_POSITION
+
+
+@dataclass()
+class OrganizationConfig:
+    """ The configuration of an organization on a channel """
+    # The name of the organization's config group
+    name: str
+    msp_id: str
+    root_certs: List[bytes] = field(default_factory=list)
+    intermediate_certs: List[bytes] = field(default_factory=list)
+    tls_root_certs: List[bytes] = field(default_factory=list)
+    # (host, port) of each anchor peer, for application organizations
+    anchor_peers: List[Tuple[str, int]] = field(default_factory=list)
+
+
+def last_config_index(block: RawBlock) -> int:
+    """ The number of the latest config block as of this block, from its
+        LAST_CONFIG metadata
+    """
+    metadata = block.metadata.metadata
+    if len(metadata) <= LAST_CONFIG:
+        return 0
+    return LastConfig.FromString(
+        Metadata.FromString(metadata[LAST_CONFIG]).value
+    ).index
+
+
+def _block_config(block: RawBlock) -> Optional[Config]:
+    """ The config in a block, or None if it is not a config block """
+    # Config transactions are always alone in their block, which references
+    # itself as the last config. Other blocks are skipped without decoding
+    # their transactions.
+    if len(block.data.data) != 1 or last_config_index(block) != block.header.number:
+        return None
+    payload = Payload.FromString(Envelope.FromString(block.data.data[0]).payload)
+    channel_header = ChannelHeader.FromString(payload.header.channel_header)
+    if channel_header.type != TransactionType.Config.value:
+        return None
+    return ConfigEnvelope.FromString(payload.data).config
+
+
+def _organizations(group: Optional[ConfigGroup]) -> Dict[str, OrganizationConfig]:
+    organizations: Dict[str, OrganizationConfig] = {}
+    if group is None:
+        return organizations
+    for name, org_group in group.groups.items():
+        if 'MSP' not in org_group.values:
+            continue
+        msp_config = FabricMSPConfig.FromString(
+            MSPConfig.FromString(org_group.values['MSP'].value).config
+        )
+        org = OrganizationConfig(
+            name=name,
+            msp_id=msp_config.name,
+            root_certs=list(msp_config.root_certs),
+            intermediate_certs=list(msp_config.intermediate_certs),
+            tls_root_certs=list(msp_config.tls_root_certs),
+        )
+        if 'AnchorPeers' in org_group.values:
+            org.anchor_peers = [
+                (anchor.host, anchor.port) for anchor in AnchorPeers.FromString(
+                    org_group.values['AnchorPeers'].value
+                ).anchor_peers
+            ]
+        organizations[org.msp_id] = org
+    return organizations
+
+
+class ChannelConfigView:
+    """ The configuration of a channel, kept in memory. Lookups read the
+        parsed configuration directly; it is only replaced when a config
+        block is applied.
+    """
+
+    def __init__(self):
+        self.sequence: Optional[int] = None
+        self.block_number: Optional[int] = None
+        # The newest block seen, which a watch resumes after
+        self.last_block_number: Optional[int] = None
+        self.orderer_addresses: List[str] = []
+        self.application_orgs: Dict[str, OrganizationConfig] = {}
+        self.orderer_orgs: Dict[str, OrganizationConfig] = {}
+
+    @property
+    def loaded(self) -> bool:
+        """ Whether a configuration has been applied """
+        return self.sequence is not None
+
+    def organization(self, msp_id: str) -> OrganizationConfig:
+        """ The configuration of an application or orderer organization by
+            MSP id, raising a KeyError if it is not on the channel
+        """
+        org = self.application_orgs.get(msp_id)
+        if org is None:
+            org = self.orderer_orgs[msp_id]
+        return org
+
+    def root_certs(self, msp_id: str) -> List[bytes]:
+        """ The root certificates of an organization's MSP """
+        return self.organization(msp_id).root_certs
+
+    def anchor_peers(self, msp_id: str) -> List[Tuple[str, int]]:
+        """ The (host, port) of an application organization's anchor peers """
+        return self.application_orgs[msp_id].anchor_peers
+
+    def apply_config(self, config: Config, block_number: int):
+        """ Replaces the view with a channel configuration """
+        channel_group = config.channel_group
+        addresses: List[str] = []
+        if 'OrdererAddresses' in channel_group.values:
+            addresses = list(OrdererAddresses.FromString(
+                channel_group.values['OrdererAddresses'].value
+            ).addresses)
+
+        application_orgs = _organizations(
+            channel_group.groups['Application']
+            if 'Application' in channel_group.groups else None
+        )
+        orderer_orgs = _organizations(
+            channel_group.groups['Orderer']
+            if 'Orderer' in channel_group.groups else None
+        )
+
+        self.orderer_addresses = addresses
+        self.application_orgs = application_orgs
+        self.orderer_orgs = orderer_orgs
+        self.block_number = block_number
+        self.sequence = config.sequence
+        self._seen(block_number)
+
+    def _seen(self, block_number: int):
+        if self.last_block_number is None or block_number > self.last_block_number:
+            self.last_block_number = block_number
+
+    def apply_block(self, block: RawBlock) -> bool:
+        """ Applies the configuration in a block, if it is a config block
+            newer than the current one, returning whether it was applied
+        """
+        number = block.header.number
+        self._seen(number)
+        if self.block_number is not None and number <= self.block_number:
+            return False
+        config = _block_config(block)
+        if config is None:
+            return False
+        self.apply_config(config, number)
+        return True
+
+    async def load(self, events: Union[PeerEvents, OrdererEvents]) -> int:
+        """ Loads the latest configuration, referenced by the newest block,
+            and returns the newest block's number
+        """
+        newest = await events.get_block()
+        index = last_config_index(newest)
+        config_block = newest if index == newest.number else (
+            await events.get_block(index)
+        )
+        config = _block_config(config_block)
+        if config is None:
+            raise ValueError(f'Block {index} is not a config block')
+        self.apply_config(config, config_block.header.number)
+        self._seen(newest.number)
+        return newest.number
+
+    async def watch(self,
+                    events: Union[PeerEvents, OrdererEvents],
+                    stop: int = INDEFINITE_STOP_POSITION):
+        """ Loads the latest configuration if needed, then streams blocks
+            after the newest one seen and applies each config block until
+            ``stop`` is reached
+        """
+        if not self.loaded:
+            await self.load(events)
+        assert self.last_block_number is not None
+        async for block in events.stream_blocks(
+                start=self.last_block_number + 1, stop=stop):
+            self.apply_block(block)
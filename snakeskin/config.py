@@ -4,8 +4,11 @@
 
 import os
 import json
-from dataclasses import dataclass, field, replace
-from typing import List, Mapping, Optional
+import marshal
+import sys
+import weakref
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
 
 import yaml
 import dacite
@@ -14,6 +17,19 @@ from .models import Peer, Channel, User, Orderer, ChaincodeSpec
 from .models.gateway import Gateway
 from .constants import ChaincodeLanguage
 
+
+# Identifies snapshots written by BlockchainConfig.compile, and the version
+# of their format
+SNAPSHOT_MAGIC = b'SNAKESKIN-CONFIG\x00\x01'
+
+# Snapshots are marshalled, and the marshal format may change between
+# Python versions, so snapshots record the version that wrote them
+_SNAPSHOT_PYTHON_VERSION = bytes(sys.version_info[:2])
+
+# Fields that cannot be stored in a snapshot, and are left to their defaults
+_UNSNAPSHOTTED_FIELDS = {'crypto_suite', 'signer'}
+
+
 @dataclass()
 class GatewayConfig:
     """ A gateway config object """
@@ -23,6 +39,24 @@ class GatewayConfig:
     orderers: List[str] = field(default_factory=list)
     chaincode: Optional[str] = None
 
+@dataclass()
+class ConfigDiff:
+    """ The names of the entities that changed when a config was reloaded,
+        per section (peers, orderers, users, chaincodes and gateways)
+    """
+    added: Dict[str, List[str]] = field(default_factory=dict)
+    removed: Dict[str, List[str]] = field(default_factory=dict)
+    changed: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def empty(self) -> bool:
+        """ Whether nothing changed """
+        return not (self.added or self.removed or self.changed)
+
+
+_SECTIONS = ('peers', 'orderers', 'users', 'chaincodes', 'gateways')
+
+
 @dataclass()
 class BlockchainConfig:
     """ A gateway for accessing the blockchain """
@@ -51,38 +85,195 @@ class BlockchainConfig:
             }
         ))
 
+    @classmethod
+    def compile(cls, file_path: str, snapshot_path: str) -> 'BlockchainConfig':
+        """ Loads and validates a config file, and writes it as a snapshot
+            with the contents of all referenced files resolved, which can be
+            quickly restored with from_snapshot. The snapshot includes
+            private keys, so it is only readable by its owner, and can only
+            be restored by the Python version that compiled it.
+        """
+        config = cls.from_file(file_path)
+        snapshot_fd = os.open(snapshot_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        # The mode only applies to new files
+        os.fchmod(snapshot_fd, 0o600)
+        with open(snapshot_fd, 'wb') as outf:
+            outf.write(config.to_snapshot())
+        return config
+
+    @classmethod
+    def from_snapshot(cls, snapshot_path: str) -> 'BlockchainConfig':
+        """ Restores a config from a snapshot written by compile, without
+            parsing or validating it again or reading any other files
+        """
+        with open(snapshot_path, 'rb') as inf:
+            data = inf.read()
+        if not data.startswith(SNAPSHOT_MAGIC):
+            raise ValueError(f'{snapshot_path} is not a config snapshot')
+        header_len = len(SNAPSHOT_MAGIC) + len(_SNAPSHOT_PYTHON_VERSION)
+        version = data[len(SNAPSHOT_MAGIC):header_len]
+        if version != _SNAPSHOT_PYTHON_VERSION:
+            raise ValueError(
+                f'{snapshot_path} was compiled by Python '
+                f'{".".join(str(part) for part in version)} and must be '
+                'compiled again'
+            )
+        snapshot = marshal.loads(data[header_len:])
+
+        chaincodes = {}
+        for name, values in snapshot['chaincodes'].items():
+            values['language'] = ChaincodeLanguage(values['language'])
+            chaincodes[name] = ChaincodeSpec(**values)
+        return cls(
+            peers={
+                name: Peer(**values) for name, values in snapshot['peers'].items()
+            },
+            orderers={
+                name: Orderer(**values)
+                for name, values in snapshot['orderers'].items()
+            },
+            users={
+                name: User(**values) for name, values in snapshot['users'].items()
+            },
+            chaincodes=chaincodes,
+            gateways={
+                name: GatewayConfig(**values)
+                for name, values in snapshot['gateways'].items()
+            },
+        )
+
+    def to_snapshot(self) -> bytes:
+        """ Serializes the config into a snapshot """
+        chaincodes = {}
+        for name, chaincode in self.chaincodes.items():
+            values = _field_values(chaincode)
+            values['language'] = chaincode.language.value
+            chaincodes[name] = values
+        return SNAPSHOT_MAGIC + _SNAPSHOT_PYTHON_VERSION + marshal.dumps({
+            'peers': {
+                name: _field_values(peer) for name, peer in self.peers.items()
+            },
+            'orderers': {
+                name: _field_values(orderer)
+                for name, orderer in self.orderers.items()
+            },
+            'users': {
+                name: _field_values(user) for name, user in self.users.items()
+            },
+            'chaincodes': chaincodes,
+            'gateways': {
+                name: _field_values(gateway)
+                for name, gateway in self.gateways.items()
+            },
+        })
+
     peers: Mapping[str, Peer] = field(default_factory=dict)
     orderers: Mapping[str, Orderer] = field(default_factory=dict)
     users: Mapping[str, User] = field(default_factory=dict)
     chaincodes: Mapping[str, ChaincodeSpec] = field(default_factory=dict)
     gateways: Mapping[str, GatewayConfig] = field(default_factory=dict)
+    # Gateways built by get_gateway, which are updated on reload. Dead
+    # references are pruned whenever a gateway is added
+    _live_gateways: List[Tuple[str, weakref.ReferenceType]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         # Set names to be the mapping key for all entities that weren't
-        # provided names
-        self.peers = {
-            name: replace(peer, name=peer.name or name)
-            for name, peer in self.peers.items()
-        }
-        self.orderers = {
-            name: replace(orderer, name=orderer.name or name)
-            for name, orderer in self.orderers.items()
-        }
-        self.users = {
-            name: replace(user, name=user.name or name)
-            for name, user in self.users.items()
-        }
-        self.chaincodes = {
-            name: replace(chaincode, name=chaincode.name or name)
-            for name, chaincode in self.chaincodes.items()
-        }
+        # provided names. Named entities are kept as is, rather than being
+        # rebuilt by replace()
+        self.peers = _with_names(self.peers)
+        self.orderers = _with_names(self.orderers)
+        self.users = _with_names(self.users)
+        self.chaincodes = _with_names(self.chaincodes)
+
+    def reload(self, file_path: str) -> ConfigDiff:
+        """ Reloads the config from a file (or snapshot), returning what
+            changed. Entities that are unchanged are kept, along with their
+            connections and loaded keys, and gateways built from this config
+            are updated with the new membership. Gateways derived from those
+            with dataclasses.replace() are not updated. The connections of
+            replaced peers and orderers are closed, unless a gateway whose
+            config was removed still uses them.
+        """
+        if _is_snapshot(file_path):
+            new_config = self.from_snapshot(file_path)
+        else:
+            new_config = self.from_file(file_path)
+
+        # Merge into the new config, keeping unchanged entities
+        diff = ConfigDiff()
+        for section in _SECTIONS:
+            _merge_section(
+                section, getattr(self, section), getattr(new_config, section), diff
+            )
+
+        # Resolve the membership of every live gateway before changing
+        # anything, so that an invalid config leaves everything as it was
+        updates = self._gateway_updates(new_config)
+        superseded = [
+            entity
+            for section in ('peers', 'orderers')
+            for name, entity in getattr(self, section).items()
+            if getattr(new_config, section).get(name) is not entity
+        ]
+
+        for section in _SECTIONS:
+            setattr(self, section, getattr(new_config, section))
+        for gateway, members in updates:
+            for attr, value in members.items():
+                setattr(gateway, attr, value)
+        self._prune_gateways()
+        self._close_superseded(superseded)
+        return diff
+
+    def _prune_gateways(self):
+        self._live_gateways = [
+            (name, gateway_ref) for name, gateway_ref in self._live_gateways
+            if gateway_ref() is not None
+        ]
+
+    def _close_superseded(self, superseded: List[Any]):
+        """ Closes the connections of replaced peers and orderers that no
+            live gateway uses
+        """
+        in_use: Set[int] = set()
+        for _, gateway_ref in self._live_gateways:
+            gateway = gateway_ref()
+            if gateway is not None:
+                in_use.update(id(member) for member in gateway.endorsing_peers)
+                in_use.update(id(member) for member in gateway.orderers)
+        for entity in superseded:
+            if id(entity) not in in_use:
+                entity.close()
+
+    def _gateway_updates(self, new_config: 'BlockchainConfig'
+                        ) -> List[Tuple[Gateway, Dict[str, Any]]]:
+        """ The new members of every live gateway that is still configured """
+        updates = []
+        for name, gateway_ref in self._live_gateways:
+            gateway = gateway_ref()
+            if gateway is not None and name in new_config.gateways:
+                updates.append((
+                    gateway,
+                    # pylint: disable=protected-access
+                    new_config._gateway_members(new_config.gateways[name])
+                ))
+        return updates
 
     def get_gateway(self, name: str):
-        """ Gets a gateway using the config name """
+        """ Gets a gateway using the config name, which is updated when the
+            config is reloaded
+        """
         if name not in self.gateways:
             raise KeyError(f'No gateway defined with name "{name}"')
-        config = self.gateways[name]
-        return Gateway(
+        gateway = Gateway(**self._gateway_members(self.gateways[name]))
+        self._prune_gateways()
+        self._live_gateways.append((name, weakref.ref(gateway)))
+        return gateway
+
+    def _gateway_members(self, config: GatewayConfig) -> Dict[str, Any]:
+        return dict(
             endorsing_peers=[
                 self.get_peer(peer) for peer in config.endorsing_peers
             ],
@@ -117,3 +308,42 @@ class BlockchainConfig:
         if not name in self.chaincodes:
             raise KeyError(f'No chaincode defined with name "{name}"')
         return self.chaincodes[name]
+
+
+def _with_names(entities: Mapping[str, Any]) -> Dict[str, Any]:
+    return {
+        name: entity if entity.name else replace(entity, name=name)
+        for name, entity in entities.items()
+    }
+
+
+def _merge_section(section: str,
+                   current: Mapping[str, Any],
+                   merged: Dict[str, Any],
+                   diff: ConfigDiff):
+    """ Records the entities added, changed and removed in a section,
+        keeping the current instance of every unchanged entity
+    """
+    for name, entity in merged.items():
+        if name not in current:
+            diff.added.setdefault(section, []).append(name)
+        elif current[name] != entity:
+            diff.changed.setdefault(section, []).append(name)
+        else:
+            merged[name] = current[name]
+    removed = [name for name in current if name not in merged]
+    if removed:
+        diff.removed[section] = removed
+
+
+def _field_values(entity: Any) -> Dict[str, Any]:
+    return {
+        f.name: getattr(entity, f.name)
+        for f in fields(entity)
+        if f.name not in _UNSNAPSHOTTED_FIELDS
+    }
+
+
+def _is_snapshot(file_path: str) -> bool:
+    with open(file_path, 'rb') as inf:
+        return inf.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
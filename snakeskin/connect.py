@@ -2,7 +2,7 @@
     Manage connections to peer and orderer
 """
 
-from typing import List
+from typing import List, TYPE_CHECKING
 
 from .errors import (
     handle_conn_errors, TrasactionCommitError, BlockchainError,
@@ -10,12 +10,14 @@ from .errors import (
 )
 from .factories import build_envelope_stream
 from .models import Orderer, Peer
-from .protos.common.common_pb2 import Envelope
-from .protos.peer.proposal_pb2 import SignedProposal
-from .protos.peer.proposal_response_pb2 import ProposalResponse
 
+if TYPE_CHECKING:
+    from .protos.common.common_pb2 import Envelope
+    from .protos.peer.proposal_pb2 import SignedProposal
+    from .protos.peer.proposal_response_pb2 import ProposalResponse
 
-async def broadcast_to_orderer(envelope: Envelope,
+
+async def broadcast_to_orderer(envelope: 'Envelope',
                                orderer: Orderer,
                                tx_id: str):
     """ Broadcasts an envelope of data to an orderer node
@@ -33,7 +35,7 @@ async def broadcast_to_orderer(envelope: Envelope,
             return resp
 
 
-async def broadcast_to_orderers(envelope: Envelope,
+async def broadcast_to_orderers(envelope: 'Envelope',
                                 orderers: List[Orderer],
                                 tx_id: str):
     """ Broadcast an envelope of data to orderer nodes in order and
@@ -58,8 +60,8 @@ async def broadcast_to_orderers(envelope: Envelope,
     raise error
 
 
-async def process_proposal_on_peer(proposal: SignedProposal,
-                                   peer: Peer) -> ProposalResponse:
+async def process_proposal_on_peer(proposal: 'SignedProposal',
+                                   peer: Peer) -> 'ProposalResponse':
     """
         Processes a proposed connection on the peer
     """
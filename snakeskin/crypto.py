@@ -2,7 +2,24 @@
     Cryptography logic
 """
 
-from ._hfc.crypto import ecies
+import hmac
+import itertools
+from typing import Any, BinaryIO, Iterable, Iterator, Tuple, Union
+
+from Cryptodome.Cipher import AES
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import constant_time
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+from hkdf import Hkdf
+
+from ._hfc.crypto import ecies, AES_KEY_LENGTH, HMAC_KEY_LENGTH, IV_LENGTH
+
+
+# The default number of bytes read from a stream at a time
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+ByteSource = Union[BinaryIO, Iterable[bytes]]
 
 
 class CryptoSuite: # pylint: disable=too-few-public-methods
@@ -14,3 +31,147 @@ class CryptoSuite: # pylint: disable=too-few-public-methods
     def set_default(cls, default):
         """ Sets the default crypto suite """
         cls.default = default
+
+
+def encrypt_stream(public_key,
+                   source: ByteSource,
+                   out: BinaryIO,
+                   crypto_suite=None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """ ECIES encrypts a stream, in the same format as Ecies.encrypt, reading
+        from a file-like object or an iterable of bytes and writing to a
+        file-like object one chunk at a time. Returns the number of bytes
+        written.
+    """
+    crypto_suite = crypto_suite or CryptoSuite.default
+    ephemeral_private_key = ec.generate_private_key(
+        crypto_suite.curve(), default_backend()
+    )
+    aes_key, hmac_key = _derive_keys(
+        crypto_suite,
+        ephemeral_private_key.exchange(ec.ECDH(), public_key)
+    )
+    aes_cipher = AES.new(aes_key, AES.MODE_CFB)
+    init_vector = bytes(aes_cipher.iv)
+    mac = hmac.new(hmac_key, init_vector, crypto_suite.hash)
+
+    written = out.write(ephemeral_private_key.public_key().public_bytes(
+        Encoding.X962, PublicFormat.UncompressedPoint
+    ))
+    written += out.write(init_vector)
+    for chunk in _iter_chunks(source, chunk_size):
+        encrypted = aes_cipher.encrypt(chunk)
+        mac.update(encrypted)
+        written += out.write(encrypted)
+    written += out.write(mac.digest())
+    return written
+
+
+def decrypt_stream(private_key,
+                   source: ByteSource,
+                   out: BinaryIO,
+                   crypto_suite=None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """ Decrypts an ECIES encrypted stream, reading from a file-like object or
+        an iterable of bytes and writing to a file-like object one chunk at a
+        time. Returns the number of bytes written.
+
+        The HMAC can only be checked once the whole stream has been read, so
+        plain text is written before it is authenticated. If a ValueError is
+        raised, everything written to out must be discarded.
+    """
+    crypto_suite = crypto_suite or CryptoSuite.default
+    d_len, rb_len = _key_lengths(private_key, crypto_suite)
+    chunks = _iter_chunks(source, chunk_size)
+
+    pending = bytearray()
+    for chunk in chunks:
+        pending += chunk
+        if len(pending) >= rb_len + IV_LENGTH:
+            break
+    if len(pending) < rb_len + IV_LENGTH:
+        raise _cipher_text_length_error(rb_len + IV_LENGTH + d_len)
+    aes_cipher, mac = _stream_ciphers(
+        private_key,
+        crypto_suite,
+        ephemeral_key=bytes(pending[:rb_len]),
+        init_vector=bytes(pending[rb_len:rb_len + IV_LENGTH]),
+    )
+    del pending[:rb_len + IV_LENGTH]
+
+    written = 0
+    # Decrypts what was read with the header before reading further chunks
+    for chunk in itertools.chain([b''], chunks):
+        pending += chunk
+        # Hold back the trailing HMAC, which may span chunks
+        ready = len(pending) - d_len
+        if ready > 0:
+            encrypted = bytes(pending[:ready])
+            del pending[:ready]
+            mac.update(encrypted)
+            written += out.write(aes_cipher.decrypt(encrypted))
+
+    if len(pending) != d_len:
+        raise _cipher_text_length_error(rb_len + IV_LENGTH + d_len)
+    if not constant_time.bytes_eq(mac.digest(), bytes(pending)):
+        raise ValueError('Hmac verify failed.')
+    return written
+
+
+def _key_lengths(private_key, crypto_suite) -> Tuple[int, int]:
+    """ The lengths of the HMAC and of the encoded ephemeral public key for
+        a private key, checking it matches the crypto suite's curve
+    """
+    key_len = private_key.curve.key_size
+    if key_len != crypto_suite.curve.key_size:
+        raise ValueError(
+            f'Invalid key. Input security level {key_len} does not match the '
+            f'current security level {crypto_suite.curve.key_size}'
+        )
+    return key_len >> 3, ((key_len + 7) // 8) * 2 + 1
+
+
+def _stream_ciphers(private_key,
+                    crypto_suite,
+                    ephemeral_key: bytes,
+                    init_vector: bytes) -> Tuple[Any, hmac.HMAC]:
+    """ The AES cipher and HMAC for decrypting a stream, from its header """
+    ephemeral_public_key = ec.EllipticCurvePublicKey.from_encoded_point(
+        crypto_suite.curve(), ephemeral_key
+    )
+    aes_key, hmac_key = _derive_keys(
+        crypto_suite,
+        private_key.exchange(ec.ECDH(), ephemeral_public_key)
+    )
+    return (
+        AES.new(key=aes_key, mode=AES.MODE_CFB, iv=init_vector),
+        hmac.new(hmac_key, init_vector, crypto_suite.hash),
+    )
+
+
+def _cipher_text_length_error(min_length: int) -> ValueError:
+    return ValueError(
+        'Illegal cipher text length: cipher text must be at least '
+        f'{min_length} bytes'
+    )
+
+
+def _derive_keys(crypto_suite, shared_key: bytes):
+    hkdf_output = Hkdf(
+        salt=None, input_key_material=shared_key, hash=crypto_suite.hash
+    ).expand(length=AES_KEY_LENGTH + HMAC_KEY_LENGTH)
+    return (
+        hkdf_output[:AES_KEY_LENGTH],
+        hkdf_output[AES_KEY_LENGTH:AES_KEY_LENGTH + HMAC_KEY_LENGTH]
+    )
+
+
+def _iter_chunks(source: ByteSource, chunk_size: int) -> Iterator[bytes]:
+    if hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size) # type: ignore
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source # type: ignore
@@ -4,13 +4,15 @@
 
 import sys
 from contextlib import contextmanager
-
-import grpc # type: ignore
+from typing import TYPE_CHECKING
 
 from .protos.peer.transaction_pb2 import TxValidationCode
 from .protos.common.common_pb2 import Status
 from .protos.orderer.ab_pb2 import BroadcastResponse
-from .models.transaction import EndorsedTX
+
+if TYPE_CHECKING:
+    # Imported for annotations only, so that models can raise these errors
+    from .models.transaction import EndorsedTX # pylint: disable=cyclic-import
 
 class BlockchainError(Exception):
     """ Generic blockhchain exception """
@@ -60,7 +62,7 @@ class TrasactionCommitError(TransactionError):
 class TransactionProposalError(TransactionError):
     """ An exception class for failures in generating a proposal on a peer """
 
-    def __init__(self, msg: str, transaction: EndorsedTX):
+    def __init__(self, msg: str, transaction: 'EndorsedTX'):
         self.transaction = transaction
         super().__init__(msg, transaction.tx_id)
 
@@ -90,6 +92,20 @@ class BlockRetrievalError(BlockchainError):
         super().__init__(msg)
 
 
+class BlockVerificationError(BlockchainError):
+    """ An exception class for delivered blocks that fail integrity checks """
+
+    def __init__(self, msg: str, number: int):
+        self.number = number
+        super().__init__(f'{msg} (block {number})')
+
+
+class SigningError(BlockchainError):
+    """ An exception class for failures when a signer cannot sign a
+        message
+    """
+
+
 class BlockchainConnectionError(BlockchainError, ConnectionError):
     """ An exception class for blockchain connection errors """
 
@@ -101,6 +117,19 @@ class BlockchainConnectionError(BlockchainError, ConnectionError):
         )
 
 
+class CommitStatusUnknownError(BlockchainError, ConnectionError):
+    """ An exception class for connection failures while broadcasting a
+        transaction to the orderer or waiting for it to commit, after which
+        the transaction may still commit
+    """
+
+    def __init__(self, tx_id: str, error: ConnectionError):
+        self.tx_id = tx_id
+        super().__init__(
+            f'Failed committing tx {tx_id}, which may have committed: {error}'
+        )
+
+
 class TransactionValidationError(BlockchainError):
     """ An exception class for a transactions that failed to commit to the blockchain """
 
@@ -124,6 +153,9 @@ def handle_conn_errors():
         to blockchain connection errors
     """
 
+    # gRPC is imported on first use, so that importing errors stays cheap
+    import grpc # type: ignore
+
     try:
         yield
     except grpc.RpcError as rpc_error_call:
@@ -3,9 +3,14 @@
 """
 
 import asyncio
-from typing import AsyncIterator, Generic, TypeVar
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import (
+    AsyncGenerator, AsyncIterator, Callable, Dict, Generic, List, Optional, Tuple, TypeVar, Union,
+    TYPE_CHECKING
+)
 
-from .protos.common.common_pb2 import Envelope
 from .protos.peer.transaction_pb2 import TxValidationCode
 
 from .models import Channel, Peer, User, Orderer
@@ -25,10 +30,114 @@ from .factories import (
 )
 from .constants import SeekBehavior, INDEFINITE_STOP_POSITION
 
+if TYPE_CHECKING:
+    from .protos.common.common_pb2 import Envelope
+
 
 BlockType = TypeVar('BlockType')
 TXType = TypeVar('TXType')
 
+
+@dataclass()
+class PrefetchStats:
+    """ Metrics collected by a BlockPrefetcher """
+    # Number of blocks (and their serialized size) currently buffered
+    queue_depth: int = 0
+    queued_bytes: int = 0
+    # The largest number of blocks buffered at once
+    max_queue_depth: int = 0
+    # Total number of blocks read from the stream
+    blocks_read: int = 0
+    # Seconds the network reader waited for buffer space
+    reader_stall_time: float = 0.0
+    # Seconds the consumer waited for a block to become available
+    consumer_stall_time: float = 0.0
+
+
+class BlockPrefetcher: # pylint: disable=too-few-public-methods
+    """ Reads ahead of a block stream on a separate task, building blocks
+        while the consumer processes earlier ones. The buffer is bounded by
+        a number of blocks and, optionally, by their serialized size. A
+        single block larger than ``max_bytes`` is still delivered.
+    """
+
+    def __init__(self, max_blocks: int = 16, max_bytes: Optional[int] = None):
+        if max_blocks < 1:
+            raise ValueError('max_blocks must be at least 1')
+        self.max_blocks = max_blocks
+        self.max_bytes = max_bytes
+        self.stats = PrefetchStats()
+
+    def _has_room(self, size: int) -> bool:
+        stats = self.stats
+        if not stats.queue_depth:
+            return True
+        if stats.queue_depth >= self.max_blocks:
+            return False
+        return self.max_bytes is None or stats.queued_bytes + size <= self.max_bytes
+
+    async def prefetch(self,
+                       responses: AsyncIterator,
+                       pull_block: Callable) -> AsyncIterator:
+        """ Yields ``pull_block(response)`` for every response, reading and
+            building blocks ahead of the consumer
+        """
+        loop = asyncio.get_event_loop()
+        stats = self.stats
+        buffer: deque = deque()
+        cond = asyncio.Condition()
+        done = False
+        errors: List[Exception] = []
+
+        def _ready():
+            return buffer or done
+
+        async def _read():
+            nonlocal done
+            try:
+                async for resp in responses:
+                    size = resp.ByteSize()
+                    block = pull_block(resp)
+                    async with cond:
+                        if not self._has_room(size):
+                            stall_start = loop.time()
+                            await cond.wait_for(lambda size=size: self._has_room(size))
+                            stats.reader_stall_time += loop.time() - stall_start
+                        buffer.append((block, size))
+                        stats.blocks_read += 1
+                        stats.queue_depth += 1
+                        stats.queued_bytes += size
+                        stats.max_queue_depth = max(
+                            stats.max_queue_depth, stats.queue_depth
+                        )
+                        cond.notify_all()
+            except Exception as err: # pylint: disable=broad-except
+                errors.append(err)
+            finally:
+                async with cond:
+                    done = True
+                    cond.notify_all()
+
+        reader = asyncio.ensure_future(_read())
+        try:
+            while True:
+                async with cond:
+                    if not buffer and not done:
+                        stall_start = loop.time()
+                        await cond.wait_for(_ready)
+                        stats.consumer_stall_time += loop.time() - stall_start
+                    if not buffer:
+                        break
+                    block, size = buffer.popleft()
+                    stats.queue_depth -= 1
+                    stats.queued_bytes -= size
+                    cond.notify_all()
+                yield block
+            if errors:
+                raise errors[0]
+        finally:
+            reader.cancel()
+
 class _EventHub(Generic[BlockType, TXType]):
     """ An event hub attached to the provided peer """
 
@@ -50,12 +159,68 @@ class _EventHub(Generic[BlockType, TXType]):
                     return transaction
         raise RuntimeError('Could not get transaction')
 
+    async def get_block(self, number: int = None) -> BlockType:
+        """ Gets a single block by number, or the newest block if no number
+            is provided
+        """
+        blocks = self.stream_blocks(
+            start=number, stop=number, behavior=SeekBehavior.FailIfNotReady
+        )
+        try:
+            async for block in blocks:
+                return block
+        finally:
+            # Closes the deliver stream, which returning mid-iteration leaves
+            # open until the generator is collected
+            await blocks.aclose()
+        raise BlockRetrievalError(f'Could not retrieve block {number}')
+
+    async def find_block_by_time(self,
+                                 timestamp: datetime,
+                                 newest: int = None) -> Optional[int]:
+        """ Finds the number of the first block created at or after the
+            provided timestamp, or None if every block is older. Runs a
+            binary search over block numbers, reading one block per probe.
+            Naive timestamps are interpreted as UTC.
+
+            :param timestamp: The timestamp to seek to
+            :param newest: The number of the newest block to consider. If
+                           omitted, the newest block is retrieved from the
+                           stream
+        """
+        if timestamp.tzinfo:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+        if newest is None:
+            newest_block = await self.get_block()
+            newest = newest_block.number # type: ignore
+            if self._block_timestamp(newest_block) < timestamp:
+                return None
+        elif self._block_timestamp(await self.get_block(newest)) < timestamp:
+            return None
+
+        low, high = 0, newest
+        while low < high:
+            mid = (low + high) // 2
+            if self._block_timestamp(await self.get_block(mid)) < timestamp:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    @staticmethod
+    def _block_timestamp(block) -> datetime:
+        return block.timestamp
+
     async def stream_blocks(self,
                             start: int = None,
-                            stop: int = INDEFINITE_STOP_POSITION,
-                            behavior: SeekBehavior = SeekBehavior.BlockUntilReady
-                           ) -> AsyncIterator[BlockType]:
-        """ Stream blocks from the peer """
+                            stop: Optional[int] = INDEFINITE_STOP_POSITION,
+                            behavior: SeekBehavior = SeekBehavior.BlockUntilReady,
+                            prefetcher: Optional[BlockPrefetcher] = None
+                           ) -> AsyncGenerator[BlockType, None]:
+        """ Stream blocks from the peer. If a prefetcher is provided, blocks
+            are read ahead of the consumer into its bounded buffer.
+        """
         envelope = self._get_connection_envelope(
             start=start,
             stop=stop,
@@ -63,7 +228,18 @@ class _EventHub(Generic[BlockType, TXType]):
         )
 
         stream = self._build_stream(build_envelope_stream(envelope))
+        responses = self._read_responses(stream)
+
+        if prefetcher:
+            async for block in prefetcher.prefetch(
+                    responses, self._pull_block_from_response):
+                yield block
+        else:
+            async for resp in responses:
+                yield self._pull_block_from_response(resp)
 
+    @staticmethod
+    async def _read_responses(stream):
         with handle_conn_errors():
             async for resp in stream:
                 if resp.status:
@@ -71,13 +247,13 @@ class _EventHub(Generic[BlockType, TXType]):
                         'Failed to retrieve block',
                         status=resp.status,
                     )
-                yield self._pull_block_from_response(resp)
+                yield resp
 
     def _get_connection_envelope(self,
                                  behavior: SeekBehavior = SeekBehavior.BlockUntilReady,
                                  start: int = None,
-                                 stop: int = INDEFINITE_STOP_POSITION
-                                ) -> Envelope:
+                                 stop: Optional[int] = INDEFINITE_STOP_POSITION
+                                ) -> 'Envelope':
         """
             Builds an envelope that will be sent to the peer to initiate
             streaming events
@@ -93,7 +269,7 @@ class _EventHub(Generic[BlockType, TXType]):
 
         )
 
-    def _build_stream(self, envelope: Envelope):
+    def _build_stream(self, envelope: 'Envelope'):
         raise NotImplementedError
 
     def _pull_block_from_response(self, resp):
@@ -158,6 +334,16 @@ class PeerFilteredEvents(_EventHub[FilteredBlock, FilteredTX]):
             raise TransactionValidationError(transaction.tx_validation_code)
         return transaction
 
+    async def find_block_by_time(self,
+                                 timestamp: datetime,
+                                 newest: int = None) -> Optional[int]:
+        """ Not supported, as filtered blocks do not include transaction
+            timestamps
+        """
+        raise NotImplementedError(
+            'Filtered blocks do not include transaction timestamps'
+        )
+
     @property
     def _client_cert(self):
         return self.peer.client_cert
@@ -191,3 +377,102 @@ class OrdererEvents(_EventHub[RawBlock, DecodedTX]):
 
     def _pull_block_from_response(self, resp):
         return RawBlock.from_proto(resp.block)
+
+
+class PeerChannelMultiplexer:
+    """ Streams blocks for many channels from a single peer, merging them
+        into one stream of (channel, block) pairs. All Deliver streams share
+        the peer's gRPC connection.
+    """
+
+    def __init__(self,
+                 requestor: User,
+                 peer: Peer,
+                 channels: List[Channel],
+                 filtered: bool = False,
+                 max_buffered: int = 64):
+        hub_cls: type = PeerFilteredEvents if filtered else PeerEvents
+        self.peer = peer
+        self.max_buffered = max_buffered
+        self._hubs: Dict[str, Union[PeerEvents, PeerFilteredEvents]] = {
+            channel.name: hub_cls(
+                requestor=requestor, channel=channel, peer=peer
+            ) for channel in channels
+        }
+        self._start: Optional[int] = None
+        self._next_blocks: Dict[str, int] = {}
+        self._tasks: Dict[str, asyncio.Future] = {}
+        self._queue: Optional[asyncio.Queue] = None
+
+    @property
+    def channels(self) -> List[Channel]:
+        """ The channels being streamed """
+        return [hub.channel for hub in self._hubs.values()]
+
+    def start(self, start: int = None):
+        """ Starts streaming all channels concurrently, each from the
+            provided block number (or the newest block if omitted)
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_buffered)
+        self._start = start
+        for name in self._hubs:
+            if name not in self._tasks:
+                self._start_stream(name)
+
+    def refresh(self, channel: Channel = None):
+        """ Restarts the stream for one channel, or all channels if none is
+            provided, resuming after the last block that was delivered.
+            Does nothing until the multiplexer is started.
+        """
+        if self._queue is None:
+            return
+        names = [channel.name] if channel else list(self._hubs)
+        for name in names:
+            task = self._tasks.pop(name, None)
+            if task:
+                task.cancel()
+            self._start_stream(name)
+
+    def close(self):
+        """ Stops streaming all channels """
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    async def stream_blocks(self) -> AsyncIterator[Tuple[Channel, object]]:
+        """ Yields (channel, block) pairs as blocks arrive on any channel,
+            raising the first error encountered by any channel stream
+        """
+        if not self._tasks:
+            self.start(self._start)
+        assert self._queue is not None
+
+        try:
+            while True:
+                channel, block, error = await self._queue.get()
+                if error:
+                    raise error
+                yield channel, block
+        finally:
+            self.close()
+
+    def _start_stream(self, name: str):
+        self._tasks[name] = asyncio.ensure_future(self._pump(name))
+
+    async def _pump(self, name: str):
+        hub = self._hubs[name]
+        queue = self._queue
+        assert queue is not None
+        try:
+            async for block in hub.stream_blocks(
+                    start=self._next_blocks.get(name, self._start)):
+                await queue.put((hub.channel, block, None))
+                # Only advance once the block is queued, so that a refresh
+                # during a blocked put re-reads that block
+                self._next_blocks[name] = block.number + 1
+        except Exception as err: # pylint: disable=broad-except
+            # CancelledError is an Exception before Python 3.8
+            if isinstance(err, asyncio.CancelledError):
+                raise
+            await queue.put((hub.channel, None, err))
@@ -0,0 +1,196 @@
+"""
+    Export decoded blocks as compact JSON lines, writing JSON fragments
+    directly from the decoded models and protobufs rather than converting
+    them into intermediate dictionaries
+"""
+
+import base64
+import dataclasses
+import math
+from hashlib import sha256
+from json.encoder import encode_basestring_ascii # type: ignore
+from typing import AsyncIterator, Callable, Dict, List, TextIO, Tuple, Union
+
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.message import Message
+from google.protobuf.timestamp_pb2 import Timestamp
+
+from .protos.msp.identities_pb2 import SerializedIdentity
+from .models.block import RawBlock
+from .models._decoded import DecodedBlock
+
+
+_DATACLASS_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+
+class BlockJSONWriter:
+    """ Writes decoded blocks to a text stream, one compact JSON object per
+        line. Bytes are written as base64 (or hex) strings, timestamps as ISO
+        8601 strings, non-finite floats as "NaN", "Infinity" or "-Infinity"
+        (as in the protobuf JSON mapping), and serialized identities are summarized by their MSP
+        id and the SHA-256 hash of their certificate.
+    """
+
+    def __init__(self, out: TextIO, bytes_encoding: str = 'base64'):
+        if bytes_encoding == 'base64':
+            self._encode_bytes: Callable[[bytes], str] = (
+                lambda val: base64.b64encode(val).decode('ascii')
+            )
+        elif bytes_encoding == 'hex':
+            self._encode_bytes = lambda val: val.hex()
+        else:
+            raise ValueError(f'Unsupported bytes encoding {bytes_encoding}')
+        self.out = out
+
+    def write_block(self, block: Union[DecodedBlock, RawBlock]):
+        """ Writes a single block as a JSON line """
+        if isinstance(block, RawBlock):
+            block = block.decode()
+        parts: List[str] = []
+        self._write_value(block, parts)
+        parts.append('\n')
+        self.out.write(''.join(parts))
+
+    async def write_stream(self, blocks: AsyncIterator) -> int:
+        """ Writes every block in the stream, returning the number of blocks
+            written
+        """
+        count = 0
+        async for block in blocks:
+            self.write_block(block)
+            count += 1
+        return count
+
+    def _write_value(self, value, parts: List[str]):
+        # pylint: disable=too-many-branches
+        if value is None:
+            parts.append('null')
+        elif isinstance(value, bool):
+            parts.append('true' if value else 'false')
+        elif isinstance(value, int):
+            parts.append(repr(value))
+        elif isinstance(value, float):
+            parts.append(_encode_float(value))
+        elif isinstance(value, str):
+            parts.append(encode_basestring_ascii(value))
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            parts.append('"')
+            parts.append(self._encode_bytes(bytes(value)))
+            parts.append('"')
+        elif isinstance(value, SerializedIdentity):
+            parts.append('{"mspid":')
+            parts.append(encode_basestring_ascii(value.mspid))
+            parts.append(',"cert_sha256":"')
+            parts.append(sha256(value.id_bytes).hexdigest())
+            parts.append('"}')
+        elif isinstance(value, Timestamp):
+            parts.append('"')
+            parts.append(value.ToJsonString())
+            parts.append('"')
+        elif isinstance(value, Message):
+            self._write_message(value, parts)
+        elif isinstance(value, (list, tuple)) or _is_repeated(value):
+            self._write_sequence(value, parts)
+        elif dataclasses.is_dataclass(value):
+            self._write_dataclass(value, parts)
+        else:
+            raise TypeError(f'Cannot serialize value of type {type(value)}')
+
+    def _write_sequence(self, values, parts: List[str]):
+        parts.append('[')
+        for idx, item in enumerate(values):
+            if idx:
+                parts.append(',')
+            self._write_value(item, parts)
+        parts.append(']')
+
+    def _write_dataclass(self, value, parts: List[str]):
+        cls = type(value)
+        names = _DATACLASS_FIELDS.get(cls)
+        if names is None:
+            names = tuple(f.name for f in dataclasses.fields(value))
+            _DATACLASS_FIELDS[cls] = names
+
+        parts.append('{')
+        for idx, name in enumerate(names):
+            if idx:
+                parts.append(',')
+            parts.append(encode_basestring_ascii(name))
+            parts.append(':')
+            self._write_value(getattr(value, name), parts)
+        parts.append('}')
+
+    def _write_message(self, message: Message, parts: List[str]):
+        # Scalars are always written, so that zero values (such as block
+        # number 0) are not dropped. Unset messages and empty repeated
+        # fields are omitted
+        parts.append('{')
+        first = True
+        for field in message.DESCRIPTOR.fields:
+            value = getattr(message, field.name)
+            if field.label == FieldDescriptor.LABEL_REPEATED:
+                if not value:
+                    continue
+            elif (field.type == FieldDescriptor.TYPE_MESSAGE
+                  and not message.HasField(field.name)):
+                continue
+
+            if not first:
+                parts.append(',')
+            first = False
+            parts.append(encode_basestring_ascii(field.name))
+            parts.append(':')
+            if _is_map_field(field):
+                self._write_map(field, value, parts)
+            elif field.type == FieldDescriptor.TYPE_ENUM:
+                if field.label == FieldDescriptor.LABEL_REPEATED:
+                    self._write_sequence(
+                        [_enum_name(field, val) for val in value], parts
+                    )
+                else:
+                    self._write_value(_enum_name(field, value), parts)
+            else:
+                self._write_value(value, parts)
+        parts.append('}')
+
+    def _write_map(self, field: FieldDescriptor, mapping, parts: List[str]):
+        value_field = field.message_type.fields_by_name['value']
+        parts.append('{')
+        for idx, key in enumerate(sorted(mapping)):
+            if idx:
+                parts.append(',')
+            parts.append(encode_basestring_ascii(str(key)))
+            parts.append(':')
+            if value_field.type == FieldDescriptor.TYPE_ENUM:
+                self._write_value(_enum_name(value_field, mapping[key]), parts)
+            else:
+                self._write_value(mapping[key], parts)
+        parts.append('}')
+
+
+def _encode_float(value: float) -> str:
+    """ Encodes a float as JSON, writing non-finite values as strings, which
+        JSON numbers cannot represent
+    """
+    if math.isfinite(value):
+        return repr(value)
+    if math.isnan(value):
+        return '"NaN"'
+    return '"Infinity"' if value > 0 else '"-Infinity"'
+
+
+def _is_repeated(value) -> bool:
+    """ Whether the value is a protobuf repeated field container """
+    return hasattr(value, '__len__') and hasattr(value, 'MergeFrom')
+
+
+def _is_map_field(field: FieldDescriptor) -> bool:
+    return (
+        field.type == FieldDescriptor.TYPE_MESSAGE
+        and field.message_type.GetOptions().map_entry
+    )
+
+
+def _enum_name(field: FieldDescriptor, number: int) -> Union[str, int]:
+    enum_value = field.enum_type.values_by_number.get(number)
+    return enum_value.name if enum_value else number
@@ -4,7 +4,7 @@
 
 import base64
 from hashlib import sha256
-from typing import List
+from typing import List, Tuple
 
 from google.protobuf.timestamp_pb2 import Timestamp
 from .protos.common.common_pb2 import (
@@ -174,7 +174,22 @@ def build_endorsed_tx_envelope(endorsed_tx: EndorsedTX,
     """ Builds an Envelope protobuf that contains an endorsed transaction
         payload for sending to the Orderer
     """
+    return wrap_transaction(
+        requestor, _build_endorsed_tx_payload(endorsed_tx)
+    )
+
+
+async def build_endorsed_tx_envelope_async(endorsed_tx: EndorsedTX, # pylint: disable=invalid-name
+                                           requestor: User) -> Envelope:
+    """ Builds an Envelope protobuf that contains an endorsed transaction
+        payload for sending to the Orderer, awaiting the signature
+    """
+    return await wrap_transaction_async(
+        requestor, _build_endorsed_tx_payload(endorsed_tx)
+    )
+
 
+def _build_endorsed_tx_payload(endorsed_tx: EndorsedTX) -> Payload:
     response = endorsed_tx.peer_responses[0]
 
     action_payload = ChaincodeActionPayload(
@@ -195,15 +210,11 @@ def build_endorsed_tx_envelope(endorsed_tx: EndorsedTX,
             )
         ]
     )
-    payload = Payload(
+    return Payload(
         header=endorsed_tx.header,
         data=transaction.SerializeToString()
     )
 
-    return wrap_transaction(
-        requestor, payload
-    )
-
 
 def tx_context_from_user(user: User) -> TXContext:
     """ Creates a TXContext object from a User """
@@ -246,9 +257,27 @@ def wrap_transaction(user: User,
         payload=payload_bytes
     )
 
+
+async def wrap_transaction_async(user: User,
+                                 payload: Payload) -> Envelope:
+    """ Wraps a transaction payload in an envelope, awaiting the signature """
+    payload_bytes = payload.SerializeToString()
+    return Envelope(
+        signature=await sign_async(user, payload_bytes),
+        payload=payload_bytes
+    )
+
+
 def sign(user: User, payload: bytes) -> bytes:
-    """ Signs a payload using the user's private key """
-    return user.crypto_suite.sign(user.private_key, payload)
+    """ Signs a payload using the user's signer """
+    return user.active_signer.sign_sync(payload)
+
+
+async def sign_async(user: User, payload: bytes) -> bytes:
+    """ Signs a payload using the user's signer, without blocking the event
+        loop if the signer supports it
+    """
+    return await user.active_signer.sign(payload)
 
 
 def build_endorsement_policy(policy: EndorsementPolicy,
@@ -399,6 +428,40 @@ def build_generated_tx(requestor: User,
     """ Generically generates a transaction that can be sent to peers for
         endorsement
     """
+    generated_tx, transient_proposal_bytes = _build_unsigned_tx(
+        requestor, cc_name, args, channel, transient_map
+    )
+    generated_tx.signed_proposal.signature = sign(
+        requestor, transient_proposal_bytes
+    )
+    return generated_tx
+
+
+async def build_generated_tx_async(requestor: User,
+                                   cc_name: str,
+                                   args: List[bytes],
+                                   channel: Channel = None,
+                                   transient_map: dict = None) -> GeneratedTX:
+    """ Generically generates a transaction that can be sent to peers for
+        endorsement, awaiting the proposal signature
+    """
+    generated_tx, transient_proposal_bytes = _build_unsigned_tx(
+        requestor, cc_name, args, channel, transient_map
+    )
+    generated_tx.signed_proposal.signature = await sign_async(
+        requestor, transient_proposal_bytes
+    )
+    return generated_tx
+
+
+def _build_unsigned_tx(requestor: User,
+                       cc_name: str,
+                       args: List[bytes],
+                       channel: Channel = None,
+                       transient_map: dict = None) -> Tuple[GeneratedTX, bytes]:
+    """ Generates a transaction with an unsigned proposal, returned along
+        with the proposal bytes to sign
+    """
 
     chaincode_id = ChaincodeID(
         name=cc_name,
@@ -457,7 +520,6 @@ def build_generated_tx(requestor: User,
     transient_proposal_bytes = transient_proposal.SerializeToString()
 
     signed_proposal = SignedProposal(
-        signature=sign(requestor, transient_proposal_bytes),
         proposal_bytes=transient_proposal_bytes
     )
 
@@ -466,4 +528,4 @@ def build_generated_tx(requestor: User,
         signed_proposal=signed_proposal,
         proposal=proposal,
         header=header
-    )
+    ), transient_proposal_bytes
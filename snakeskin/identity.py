@@ -0,0 +1,124 @@
+"""
+    Resolution of serialized identities into parsed certificate attributes
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from hashlib import sha256
+from threading import Lock
+from typing import Any, Tuple
+
+from cryptography import x509
+from cryptography.x509.oid import NameOID
+from cryptography.hazmat.backends import default_backend
+
+from .protos.msp.identities_pb2 import SerializedIdentity
+
+
+@dataclass()
+class Identity:
+    """ The attributes of an identity's X.509 certificate """
+    __slots__ = (
+        'msp_id',
+        'cert_sha256',
+        'common_name',
+        'organizational_units',
+        'public_key',
+        'expiry',
+    )
+
+    msp_id: str
+    cert_sha256: bytes
+    common_name: str
+    organizational_units: Tuple[str, ...]
+    public_key: Any
+    expiry: datetime
+
+
+class IdentityResolver:
+    """ Resolves identities from their certificates, keeping the most
+        recently used ones in an LRU cache keyed by MSP id and certificate
+        hash. Resolved identities are shared and must not be mutated.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        if max_size < 1:
+            raise ValueError('max_size must be at least 1')
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: 'OrderedDict[Tuple[str, bytes], Identity]' = OrderedDict()
+        self._lock = Lock()
+
+    def resolve(self, identity: SerializedIdentity) -> Identity:
+        """ Resolves a SerializedIdentity """
+        return self.resolve_cert(identity.mspid, identity.id_bytes)
+
+    def resolve_cert(self, msp_id: str, cert: bytes) -> Identity:
+        """ Resolves a PEM encoded certificate belonging to an MSP. Raises
+            a ValueError if the certificate cannot be parsed.
+        """
+        cert_sha256 = sha256(cert).digest()
+        key = (msp_id, cert_sha256)
+        with self._lock:
+            resolved = self._cache.get(key)
+            if resolved is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return resolved
+
+        resolved = _parse_identity(msp_id, cert_sha256, cert)
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = resolved
+            if len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return resolved
+
+    def clear(self):
+        """ Empties the cache """
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+
+def _parse_identity(msp_id: str, cert_sha256: bytes, cert: bytes) -> Identity:
+    certificate = x509.load_pem_x509_certificate(cert, default_backend())
+    subject = certificate.subject
+    common_names = subject.get_attributes_for_oid(NameOID.COMMON_NAME)
+    try:
+        expiry = certificate.not_valid_after_utc
+    except AttributeError:
+        expiry = certificate.not_valid_after.replace(tzinfo=timezone.utc)
+    return Identity(
+        msp_id=msp_id,
+        cert_sha256=cert_sha256,
+        common_name=_attribute_text(common_names[0]) if common_names else '',
+        organizational_units=tuple(
+            _attribute_text(attr) for attr in subject.get_attributes_for_oid(
+                NameOID.ORGANIZATIONAL_UNIT_NAME
+            )
+        ),
+        public_key=certificate.public_key(),
+        expiry=expiry,
+    )
+
+
+def _attribute_text(attr: x509.NameAttribute) -> str:
+    """ The value of a name attribute. Only bit string attributes, which
+        are not used for names or units, have bytes values
+    """
+    value = attr.value
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+# The resolver shared by decoded models and verification within a process
+DEFAULT_RESOLVER = IdentityResolver()
+
+
+def resolve_identity(identity: SerializedIdentity) -> Identity:
+    """ Resolves a SerializedIdentity with the default resolver """
+    return DEFAULT_RESOLVER.resolve(identity)
@@ -1,45 +1,38 @@
 """
     Blockchain models
 """
-from datetime import datetime
-from dataclasses import dataclass, field
-from typing import List, Mapping, Union, Optional, Any
+import importlib
+from dataclasses import InitVar, dataclass, field
+from hashlib import sha256
+from threading import Lock
+from typing import Dict, List, Optional, Any
 
-import aiogrpc # type: ignore
 from cryptography.hazmat.primitives.serialization import load_pem_private_key
 from cryptography.hazmat.backends import default_backend
 
-from ..protos.orderer.ab_pb2_grpc import AtomicBroadcastStub
-from ..protos.common.common_pb2 import (
-    Header,
-    BlockMetadata,
-    BlockHeader,
-    Metadata,
-    LastConfig,
-    ChannelHeader
-)
-from ..protos.common.configtx_pb2 import (Config, ConfigGroup)
-from ..protos.msp.identities_pb2 import SerializedIdentity
-from ..protos.peer.proposal_response_pb2 import (
-    ProposalResponse,
-    ProposalResponsePayload
-)
-from ..protos.peer.proposal_pb2 import (
-    Proposal,
-    ChaincodeProposalPayload,
-    SignedProposal
-)
-from ..protos.peer.peer_pb2_grpc import EndorserStub
-from ..protos.peer.events_pb2_grpc import DeliverStub
-from ..protos.peer.transaction_pb2 import TxValidationCode
-from ..protos.peer.events_pb2 import FilteredTransaction
-from ..protos.discovery.protocol_pb2_grpc import DiscoveryStub
-
 from ..constants import ChaincodeLanguage, PolicyExpression
 from ..crypto import CryptoSuite
+from ..signing import Signer, InProcessSigner
 
 DEFAULT_CRYPTO_BACKEND = default_backend()
 
+# Parsed private keys, shared by every user in the process, keyed by the
+# hash of the PEM encoded key
+_PRIVATE_KEYS: Dict[bytes, Any] = {}
+_PRIVATE_KEYS_LOCK = Lock()
+
+
+def _load_private_key(key: bytes) -> Any:
+    """ Parses a PEM encoded private key, parsing identical keys only once """
+    digest = sha256(key).digest()
+    with _PRIVATE_KEYS_LOCK:
+        private_key = _PRIVATE_KEYS.get(digest)
+        if private_key is None:
+            private_key = load_pem_private_key(key, None, DEFAULT_CRYPTO_BACKEND)
+            _PRIVATE_KEYS[digest] = private_key
+    return private_key
+
+
 @dataclass()
 class User:
     """ A model to represent a Hyperledger Fabric User """
@@ -51,9 +44,15 @@ class User:
     cert: Optional[bytes] = None
     key: Optional[bytes] = None
     crypto_suite: Any = field(default=CryptoSuite.default, compare=False)
-    private_key: Any = field(default=None, compare=False)
+    # Signs on behalf of the user. If not provided, messages are signed in
+    # process with the user's private key (see active_signer). If provided,
+    # the private key is optional
+    signer: Optional[Signer] = field(default=None, compare=False)
+    # An already parsed private key, for users without a key or key_path.
+    # Otherwise the key is parsed on first use
+    private_key: InitVar[Any] = None
 
-    def __post_init__(self):
+    def __post_init__(self, private_key: Any):
 
         if not self.cert:
             if not self.cert_path:
@@ -61,17 +60,101 @@ class User:
             with open(self.cert_path, 'rb') as inf:
                 self.cert = inf.read()
 
-        if not self.key:
-            if not self.key_path:
-                raise ValueError(
-                    'Must provide either key or key_path'
-                )
+        if not self.key and self.key_path:
             with open(self.key_path, 'rb') as inf:
                 self.key = inf.read()
 
-        self.private_key = load_pem_private_key(
-            self.key, None, DEFAULT_CRYPTO_BACKEND
+        if self.key:
+            # Copies made with dataclasses.replace() pass on the original
+            # user's parsed key, which may not match a replaced key
+            return
+        if private_key is not None:
+            _set_private_key(self, private_key)
+        elif not self.signer:
+            raise ValueError(
+                'Must provide either key, key_path, private_key or signer'
+            )
+
+    @property
+    def active_signer(self) -> Signer:
+        """ The signer used for the user: the provided signer, or one that
+            signs in process with the user's current private key
+        """
+        if self.signer:
+            return self.signer
+        # Not a field, so that copies made with dataclasses.replace() create
+        # their own rather than signing with the original user's key
+        key_signer = self.__dict__.get('_key_signer')
+        if key_signer is None:
+            key_signer = self.__dict__['_key_signer'] = _UserKeySigner(self)
+        return key_signer
+
+
+
+def _get_private_key(user: User) -> Any:
+    """ The user's parsed private key, parsed on first use and again
+        whenever the key changes
+    """
+    key, private_key = user.__dict__.get('_private_key', (None, None))
+    if user.key and (private_key is None or key != user.key):
+        private_key = _load_private_key(user.key)
+        user.__dict__['_private_key'] = (user.key, private_key)
+    return private_key
+
+
+def _set_private_key(user: User, private_key: Any):
+    user.__dict__['_private_key'] = (user.key, private_key)
+
+
+# Set after the class is created, so that the dataclass keeps private_key as
+# an optional init argument
+User.private_key = property( # type: ignore
+    _get_private_key, _set_private_key, doc=_get_private_key.__doc__
+)
+
+
+class _UserKeySigner(InProcessSigner):
+    """ Signs in process with a user's private key, so that the key is only
+        parsed once the user first signs
+    """
+
+    def __init__(self, user: User): # pylint: disable=super-init-not-called
+        self._user = user
+
+    @property
+    def private_key(self):
+        """ The user's current private key """
+        return self._user.private_key # type: ignore
+
+    @property
+    def crypto_suite(self):
+        """ The user's crypto suite """
+        return self._user.crypto_suite
+
+
+class _LazyStub: # pylint: disable=too-few-public-methods
+    """ A gRPC stub on a model's channel, created (and its module imported)
+        on first access, so that unused services are never loaded and no
+        connection is made until a service is used
+    """
+
+    def __init__(self, module: str, name: str):
+        self.module = module
+        self.name = name
+        self.attr = ''
+
+    def __set_name__(self, owner, attr: str):
+        self.attr = attr
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        stub_class = getattr(
+            importlib.import_module(self.module, __package__), self.name
         )
+        # pylint: disable=protected-access
+        stub = instance.__dict__[self.attr] = stub_class(instance._grpc_channel)
+        return stub
 
 
 @dataclass()
@@ -99,11 +182,33 @@ class _ConnectedModel:
             with open(self.client_key_path, 'rb') as inf:
                 self.client_key = inf.read()
 
+    @property
+    def _grpc_channel(self):
+        """ The gRPC channel, created on first use """
+        channel = self.__dict__.get('_channel')
+        if channel is None:
+            channel = self.__dict__['_channel'] = self._create_channel()
+        return channel
+
+    def close(self):
+        """ Closes the gRPC channel, if one was created. A new channel is
+            created if the model is used again.
+        """
+        for klass in type(self).__mro__:
+            for attr, value in vars(klass).items():
+                if isinstance(value, _LazyStub):
+                    self.__dict__.pop(attr, None)
+        channel = self.__dict__.pop('_channel', None)
+        if channel is not None:
+            channel.close()
+
+    def _create_channel(self):
+        import aiogrpc # type: ignore
+
         opts = [
             ("grpc.ssl_target_name_override", self.ssl_target_name)
         ] if self.ssl_target_name else []
 
-        # pylint: disable=attribute-defined-outside-init
         # Create GRPC channel
         if self.tls_ca_cert:
             # Add client credentials if available
@@ -116,13 +221,9 @@ class _ConnectedModel:
             else:
                 creds = aiogrpc.ssl_channel_credentials(self.tls_ca_cert)
             # Create secure channel
-            self._grpc_channel = aiogrpc.secure_channel(
-                self.endpoint, creds, opts
-            )
-        else:
-            # Create insecure channel if no cert
-            self._grpc_channel = aiogrpc.insecure_channel(self.endpoint, opts)
-        # pylint: enable=attribute-defined-outside-init
+            return aiogrpc.secure_channel(self.endpoint, creds, opts)
+        # Create insecure channel if no cert
+        return aiogrpc.insecure_channel(self.endpoint, opts)
 
 
 @dataclass()
@@ -130,14 +231,9 @@ class Peer(_ConnectedModel):
     """ A model to represent a Hyperledger Fabric Peer """
     name: Optional[str] = None
 
-    def __post_init__(self):
-        super().__post_init__()
-        # pylint: disable=attribute-defined-outside-init
-        self.endorser = EndorserStub(self._grpc_channel)
-        self.discovery = DiscoveryStub(self._grpc_channel)
-        self.deliver = DeliverStub(self._grpc_channel)
-        # pylint: enable=attribute-defined-outside-init
-
+    endorser = _LazyStub('..protos.peer.peer_pb2_grpc', 'EndorserStub')
+    discovery = _LazyStub('..protos.discovery.protocol_pb2_grpc', 'DiscoveryStub')
+    deliver = _LazyStub('..protos.peer.events_pb2_grpc', 'DeliverStub')
 
 
 
@@ -146,12 +242,8 @@ class Orderer(_ConnectedModel):
     """ A model to represent a Hyperledger Fabric Orderer """
     name: Optional[str] = None
 
-    def __post_init__(self):
-        super().__post_init__()
-        # pylint: disable=attribute-defined-outside-init
-        self.broadcaster = AtomicBroadcastStub(self._grpc_channel)
-        self.deliver = AtomicBroadcastStub(self._grpc_channel)
-        # pylint: enable=attribute-defined-outside-init
+    broadcaster = _LazyStub('..protos.orderer.ab_pb2_grpc', 'AtomicBroadcastStub')
+    deliver = _LazyStub('..protos.orderer.ab_pb2_grpc', 'AtomicBroadcastStub')
 
 
 @dataclass
@@ -3,9 +3,12 @@
     where all of the properties are deserialized into their corresponding
     models.
 
+    Decoded models are slotted, and identical serialized identities within
+    and across blocks are decoded once and shared. Shared identities must
+    not be mutated.
 """
 
-from typing import List, Union, Tuple
+from typing import Dict, List, Union, Tuple
 from dataclasses import dataclass
 
 from ..protos.common.common_pb2 import (
@@ -40,6 +43,29 @@ from ..protos.peer.transaction_pb2 import (
 
 
 from ..constants import TransactionType
+from ..identity import Identity, resolve_identity
+
+
+# The max number of distinct identities kept in the interning table. Blocks
+# are typically signed by a handful of creators and endorsers, so this only
+# bounds memory when decoding ledgers with very many identities
+MAX_INTERNED_IDENTITIES = 4096
+
+_INTERNED_IDENTITIES: Dict[bytes, SerializedIdentity] = {}
+
+
+def _intern_identity(identity_bytes: bytes) -> SerializedIdentity:
+    """ Decodes a SerializedIdentity, returning a shared instance for
+        identical serialized identities
+    """
+    identity = _INTERNED_IDENTITIES.get(identity_bytes)
+    if identity is None:
+        identity = SerializedIdentity.FromString(identity_bytes)
+        if len(_INTERNED_IDENTITIES) >= MAX_INTERNED_IDENTITIES:
+            # Evict the oldest entry
+            del _INTERNED_IDENTITIES[next(iter(_INTERNED_IDENTITIES))]
+        _INTERNED_IDENTITIES[identity_bytes] = identity
+    return identity
 
 
 @dataclass()
@@ -47,6 +73,8 @@ class DecodedBlock:
     """ A Hyperledger Fabric block, decoded into a normalized data-structure
         decoded
     """
+    __slots__ = ('header', 'data', 'metadata')
+
     header: BlockHeader
     data: '_DecodedBlockData'
     metadata: '_DecodedBlockMetadata'
@@ -102,6 +130,8 @@ class DecodedBlock:
 @dataclass()
 class DecodedTX:
     """ Decoded BlockDataEnvelope """
+    __slots__ = ('signature', 'payload')
+
     signature: bytes
     payload: '_DecodedPayload'
 
@@ -136,10 +166,17 @@ class DecodedTX:
         """ The unique identifier for this transaction """
         return self.payload.header.channel_header.tx_id
 
+    @property
+    def creator_identity(self) -> Identity:
+        """ The resolved identity of the transaction creator """
+        return self.payload.header.signature_header.creator_identity
+
 
 @dataclass()
 class _DecodedSignatureHeader:
     """ Decoded SignatureHeader"""
+    __slots__ = ('creator', 'nonce')
+
     creator: SerializedIdentity
     nonce: bytes
 
@@ -148,14 +185,21 @@ class _DecodedSignatureHeader:
         """ Decodes from bytes """
         signature_header = SignatureHeader.FromString(header_bytes)
         return cls(
-            creator=SerializedIdentity.FromString(signature_header.creator),
+            creator=_intern_identity(signature_header.creator),
             nonce=signature_header.nonce
         )
 
+    @property
+    def creator_identity(self) -> Identity:
+        """ The resolved identity of the creator """
+        return resolve_identity(self.creator)
+
 
 @dataclass()
 class _DecodedConfigUpdateSignature:
     """ Decoded ConfigUpdateSignature """
+    __slots__ = ('signature_header', 'signature')
+
     signature_header: _DecodedSignatureHeader
     signature: bytes
 
@@ -163,6 +207,8 @@ class _DecodedConfigUpdateSignature:
 @dataclass()
 class _DecodedConfigUpdateEnvelope:
     """ Decoded ConfigUpdate Signature """
+    __slots__ = ('config_update', 'signatures')
+
     config_update: ConfigUpdate
     signatures: List[_DecodedConfigUpdateSignature]
 
@@ -185,6 +231,8 @@ class _DecodedConfigUpdateEnvelope:
 @dataclass()
 class _DecodedHeader:
     """ Decoded Header """
+    __slots__ = ('channel_header', 'signature_header')
+
     channel_header: ChannelHeader
     signature_header: _DecodedSignatureHeader
 
@@ -202,6 +250,8 @@ class _DecodedHeader:
 @dataclass()
 class _DecodedConfigLastUpdate:
     """ Decoded ConfigLastUpdate """
+    __slots__ = ('header', 'data')
+
     header: _DecodedHeader
     data: _DecodedConfigUpdateEnvelope
 
@@ -209,6 +259,8 @@ class _DecodedConfigLastUpdate:
 @dataclass()
 class _DecodedConfigLastUpdateEnvelope:
     """ Decoded ConfigLastUpdateEnvelope """
+    __slots__ = ('payload', 'signature')
+
     payload: _DecodedConfigLastUpdate
     signature: bytes
 
@@ -216,6 +268,8 @@ class _DecodedConfigLastUpdateEnvelope:
 @dataclass()
 class _DecodedConfig:
     """ Decoded Config """
+    __slots__ = ('config', 'last_update')
+
     config: Config
     last_update: _DecodedConfigLastUpdateEnvelope
 
@@ -240,13 +294,22 @@ class _DecodedConfig:
 @dataclass()
 class _DecodedEndoresement:
     """ Decoded Endorsement """
+    __slots__ = ('endorser', 'signature')
+
     endorser: SerializedIdentity
     signature: bytes
 
+    @property
+    def endorser_identity(self) -> Identity:
+        """ The resolved identity of the endorser """
+        return resolve_identity(self.endorser)
+
 
 @dataclass()
 class _DecodedChaincodeEndorsedAction:
     """ Decoded ChaincodeEndorsedAction """
+    __slots__ = ('proposal_response_payload', 'endorsements')
+
     proposal_response_payload: ProposalResponsePayload
     endorsements: List[_DecodedEndoresement]
 
@@ -254,6 +317,8 @@ class _DecodedChaincodeEndorsedAction:
 @dataclass()
 class _DecodedChaincodeActionPayload:
     """ Decoded ChaincodeActionPayload """
+    __slots__ = ('action', 'chaincode_proposal_payload')
+
     action: _DecodedChaincodeEndorsedAction
     chaincode_proposal_payload: ChaincodeProposalPayload
 
@@ -261,6 +326,8 @@ class _DecodedChaincodeActionPayload:
 @dataclass()
 class _DecodedTransactionAction:
     """ Decoded TransactionAction """
+    __slots__ = ('header', 'payload')
+
     header: _DecodedSignatureHeader
     payload: _DecodedChaincodeActionPayload
 
@@ -278,7 +345,7 @@ class _DecodedTransactionAction:
                     ),
                     endorsements=[
                         _DecodedEndoresement(
-                            endorser=SerializedIdentity.FromString(e.endorser),
+                            endorser=_intern_identity(e.endorser),
                             signature=e.signature
                         ) for e in payload.action.endorsements
                     ]
@@ -293,6 +360,8 @@ class _DecodedTransactionAction:
 @dataclass()
 class _DecodedTransactionBody:
     """ Decoded Transaction """
+    __slots__ = ('actions',)
+
     actions: List[_DecodedTransactionAction]
 
     @classmethod
@@ -314,6 +383,8 @@ _DecodedPayloadData = Union[
 @dataclass()
 class _DecodedPayload:
     """ Decoded Payload """
+    __slots__ = ('header', 'data')
+
     header: _DecodedHeader
     data: _DecodedPayloadData
 
@@ -321,6 +392,8 @@ class _DecodedPayload:
 @dataclass()
 class _DecodedMetadataSignature:
     """ Decoded MetadataSignature """
+    __slots__ = ('signatures', 'signature_header')
+
     signatures: bytes
     signature_header: _DecodedSignatureHeader
 
@@ -328,12 +401,16 @@ class _DecodedMetadataSignature:
 @dataclass()
 class _DecodedLastConfigMetadata:
     """ Decoded LastConfigMetadata """
+    __slots__ = ('signatures', 'value')
+
     signatures: List[_DecodedMetadataSignature]
     value: LastConfig
 
 @dataclass()
 class _DecodedMetadata:
     """ Decoded Metadata """
+    __slots__ = ('signatures', 'value')
+
     signatures: List[_DecodedMetadataSignature]
     value: bytes
 
@@ -346,10 +423,14 @@ _DecodedMetadataSequence = Tuple[
 @dataclass()
 class _DecodedBlockMetadata:
     """ Decoded BlockMetadata """
+    __slots__ = ('metadata',)
+
     metadata: _DecodedMetadataSequence
 
 
 @dataclass()
 class _DecodedBlockData:
     """ Decoded BlockData """
+    __slots__ = ('data',)
+
     data: List[DecodedTX]
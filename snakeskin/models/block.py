@@ -3,18 +3,25 @@
 """
 
 from dataclasses import dataclass
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 from ..protos.common.common_pb2 import (
     Block as _Block,
     BlockHeader,
     BlockData,
-    BlockMetadata
+    BlockMetadata,
+    Envelope,
+    Payload,
+    ChannelHeader,
+    TRANSACTIONS_FILTER,
 )
 from ..protos.peer.events_pb2 import FilteredBlock as _FilteredBlock
+from ..protos.peer.transaction_pb2 import TxValidationCode
 
 from .transaction import FilteredTX
 from ._decoded import DecodedBlock
+from .rwset import RWSetBatch, iter_envelope_rwsets
 
 
 @dataclass()
@@ -37,6 +44,23 @@ class RawBlock:
             metadata=block.metadata,
         )
 
+    @property
+    def number(self) -> int:
+        """ The number of this block """
+        return self.header.number
+
+    @property
+    def timestamp(self) -> datetime:
+        """ The (naive, UTC) timestamp of the first transaction in this block,
+            decoding only that transaction's channel header
+        """
+        if not self.data.data:
+            raise ValueError(f'Block {self.number} has no transactions')
+        envelope = Envelope.FromString(self.data.data[0])
+        payload = Payload.FromString(envelope.payload)
+        channel_header = ChannelHeader.FromString(payload.header.channel_header)
+        return channel_header.timestamp.ToDatetime()
+
     @property
     def transactions(self) -> List[bytes]:
         """ A list of transactions in this block as raw bytes """
@@ -48,6 +72,43 @@ class RawBlock:
         """
         return DecodedBlock.decode(self)
 
+    @property
+    def tx_validation_codes(self) -> bytes:
+        """ The validation code of each transaction in this block, as set by
+            the committing peer. Blocks that have not been validated (such
+            as those delivered by the orderer) return an empty value
+        """
+        metadata = self.metadata.metadata
+        if len(metadata) > TRANSACTIONS_FILTER:
+            return metadata[TRANSACTIONS_FILTER]
+        return b''
+
+    def is_valid_transaction(self, tx_index: int) -> bool:
+        """ Whether the transaction at the provided index was marked valid.
+            Transactions without a validation code are considered valid
+        """
+        codes = self.tx_validation_codes
+        if tx_index < len(codes):
+            return codes[tx_index] == TxValidationCode.VALID
+        return True
+
+    def to_rwset_batch(self, batch: Optional[RWSetBatch] = None) -> RWSetBatch:
+        """ Decodes the key/value read/write sets of every valid transaction
+            in this block into flat columns, appending to ``batch`` if one
+            is provided
+        """
+        if batch is None:
+            batch = RWSetBatch()
+
+        number = self.header.number
+        for tx_index, envelope_bytes in enumerate(self.data.data):
+            if not self.is_valid_transaction(tx_index):
+                continue
+            for namespace, kv_rwset in iter_envelope_rwsets(envelope_bytes):
+                batch.add_kv_rwset(number, tx_index, namespace, kv_rwset)
+
+        return batch
+
     def as_proto(self) -> _Block:
         """ Returns the protobuf version of this block """
         return _Block(
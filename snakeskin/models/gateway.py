@@ -4,16 +4,21 @@
 
 import asyncio
 from dataclasses import dataclass, field, replace
-from typing import List, Optional, Callable, NoReturn, Awaitable
+from typing import Dict, List, Optional, Callable, NoReturn, Awaitable
 
-from ..errors import BlockRetrievalError, BlockchainError
+from ..errors import BlockRetrievalError, BlockchainError, CommitStatusUnknownError
 from ..models import (
     Peer, Channel, User, Orderer, ChaincodeSpec, EndorsementPolicy
 )
 from ..models.transaction import EndorsedTX, GeneratedTX, FilteredTX
+from ..models.block import RawBlock
 from ..events import PeerFilteredEvents
+from ..retry import RetryPolicy
+from ..scheduler import KeyConflictScheduler
+from ..submitter import TransactionSubmitter
 from ..transact import (
     generate_cc_tx,
+    generate_cc_tx_async,
     propose_tx,
     commit_tx,
     raise_tx_proposal_error
@@ -21,9 +26,12 @@ from ..transact import (
 from ..operations import (
     create_channel,
     join_channel,
+    fetch_genesis_block,
     query_instantiated_chaincodes,
     install_chaincode,
-    instantiate_chaincode
+    ensure_chaincode_installed,
+    instantiate_chaincode,
+    PeerInstallResult,
 )
 
 
@@ -36,21 +44,18 @@ class Gateway:
     channel: Optional[Channel] = None
     requestor: Optional[User] = None
     chaincode: Optional[ChaincodeSpec] = None
+    # Channel origin blocks by channel name, which never change once created
+    _genesis_blocks: Dict[str, RawBlock] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     def transact(self,
                  fcn: str,
                  args: Optional[List[str]] = None,
                  transient_map: Optional[dict] = None) -> 'GatewayTXBuilder':
         """ Begins a transaction against the blockchain """
-        if not self.endorsing_peers:
-            raise ValueError('Must provided at least one endorsing peer')
-        if not self.channel:
-            raise ValueError('Must specify a channel')
-        if not self.requestor:
-            raise ValueError('Must specify a requestor')
-        if not (self.chaincode and self.chaincode.name):
-            raise ValueError('Must specify a chaincode name')
-
+        self._check_transact()
+        assert self.requestor and self.channel and self.chaincode and self.chaincode.name
         generated_tx = generate_cc_tx(
             requestor=self.requestor,
             cc_name=self.chaincode.name,
@@ -65,21 +70,101 @@ class Gateway:
             generated_tx=generated_tx
         )
 
+    async def transact_async(self,
+                             fcn: str,
+                             args: Optional[List[str]] = None,
+                             transient_map: Optional[dict] = None
+                            ) -> 'GatewayTXBuilder':
+        """ Begins a transaction against the blockchain, awaiting the
+            proposal signature
+        """
+        self._check_transact()
+        assert self.requestor and self.channel and self.chaincode and self.chaincode.name
+        generated_tx = await generate_cc_tx_async(
+            requestor=self.requestor,
+            cc_name=self.chaincode.name,
+            channel=self.channel,
+            fcn=fcn,
+            args=args,
+            transient_map=transient_map
+        )
+
+        return GatewayTXBuilder(
+            gateway=self,
+            generated_tx=generated_tx
+        )
+
+    def _check_transact(self):
+        if not self.endorsing_peers:
+            raise ValueError('Must provided at least one endorsing peer')
+        if not self.channel:
+            raise ValueError('Must specify a channel')
+        if not self.requestor:
+            raise ValueError('Must specify a requestor')
+        if not (self.chaincode and self.chaincode.name):
+            raise ValueError('Must specify a chaincode name')
+
     async def invoke(self,
                      fcn: str,
                      args: Optional[List[str]] = None,
                      transient_map: Optional[dict] = None,
-                     timeout: int = 30):
-        """ Invokes the chaincode"""
+                     timeout: int = 30,
+                     retry_policy: Optional[RetryPolicy] = None,
+                     scheduler: Optional[KeyConflictScheduler] = None):
+        """ Invokes the chaincode. If a retry policy is provided, the
+            transaction is generated and endorsed again after retryable
+            failures, such as MVCC read conflicts. If a scheduler is
+            provided, the transaction is not submitted while it reads keys
+            written by other in-flight transactions using the scheduler.
+            Connection failures once the transaction is broadcast raise a
+            CommitStatusUnknownError, which is never retried.
+        """
 
-        return await (
-            self.transact(
+        async def _commit(builder):
+            # The orderer may accept the transaction even if the connection
+            # fails during the broadcast
+            try:
+                await builder.submit()
+                return await builder.wait_for_commit(timeout=timeout)
+            except ConnectionError as err:
+                raise CommitStatusUnknownError(
+                    builder.transaction.tx_id, err
+                ) from err
+
+        async def _invoke():
+            builder = await self.transact_async(
                 fcn=fcn, args=args, transient_map=transient_map
             )
-            .propose()
-            .submit()
-            .wait_for_commit(timeout=timeout)
-        )
+            await builder.propose()
+            return await _commit(builder)
+
+        async def _invoke_scheduled():
+            builder = None
+
+            async def _endorse():
+                nonlocal builder
+                builder = await self.transact_async(
+                    fcn=fcn, args=args, transient_map=transient_map
+                )
+                return await builder.propose()
+
+            endorsed_tx = await scheduler.endorse(_endorse)
+            try:
+                return await _commit(builder)
+            finally:
+                scheduler.release(endorsed_tx.tx_id)
+
+        operation = _invoke_scheduled if scheduler else _invoke
+        if retry_policy:
+            return await retry_policy.run(operation)
+        return await operation()
+
+    def submitter(self, **kwargs) -> TransactionSubmitter:
+        """ Creates a queue that invokes the chaincode with admission
+            control. See TransactionSubmitter for the available options.
+        """
+        self._check_transact()
+        return TransactionSubmitter(self, **kwargs)
 
     async def query(self,
                     fcn: str,
@@ -87,12 +172,10 @@ class Gateway:
                     transient_map: Optional[dict] = None):
         """ Invokes the chaincode"""
 
-        return await (
-            self.transact(
-                fcn=fcn, args=args, transient_map=transient_map
-            )
-            .propose()
+        builder = await self.transact_async(
+            fcn=fcn, args=args, transient_map=transient_map
         )
+        return await builder.propose()
 
     async def create_channel(self, tx_file_path: str):
         """ Creates a channel from a transaction file that was generated
@@ -112,27 +195,56 @@ class Gateway:
             tx_file_path=tx_file_path
         )
 
-    async def join_channel(self, peers: List[Peer] = None):
+    async def join_channel(self,
+                           peers: List[Peer] = None,
+                           max_concurrency: int = 8):
         """
             Joins all provided peers the channel for this gateway.
             If no peers are provided, all endorsing peers are joined to the
-            channel.
+            channel. The channel's origin block is retrieved once and cached
+            on the gateway, and up to max_concurrency peers are joined at
+            once. If any peer fails to join, the first error is raised after
+            every join has finished.
         """
         if not peers:
             peers = self.endorsing_peers
 
-        if not self.channel:
+        # Bound to locals, so they stay narrowed in the join closure
+        channel, requestor = self.channel, self.requestor
+        if not channel:
             raise ValueError('Must specify a channel')
-        if not self.requestor:
+        if not requestor:
             raise ValueError('Must specify a requestor')
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
 
-        for peer in peers:
-            await join_channel(
-                requestor=self.requestor,
+        genesis_block = self._genesis_blocks.get(channel.name)
+        if genesis_block is None:
+            genesis_block = await fetch_genesis_block(
+                requestor=requestor,
                 orderers=self.orderers,
-                channel=self.channel,
-                peer=peer
+                channel=channel,
             )
+            self._genesis_blocks[channel.name] = genesis_block
+
+        slots = asyncio.Semaphore(max_concurrency)
+
+        async def _join(peer: Peer):
+            async with slots:
+                await join_channel(
+                    requestor=requestor,
+                    orderers=self.orderers,
+                    channel=channel,
+                    peer=peer,
+                    genesis_block=genesis_block,
+                )
+
+        results = await asyncio.gather(
+            *[_join(peer) for peer in peers], return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
 
     async def query_instantiated_chaincodes(self):
         """
@@ -173,6 +285,32 @@ class Gateway:
             cc_spec=self.chaincode,
         )
 
+    async def ensure_chaincode_installed(self,
+                                         peers: Optional[List[Peer]] = None,
+                                         max_concurrency: int = 8
+                                        ) -> List[PeerInstallResult]:
+        """
+            Installs chaincode on each peer for this gateway that does not
+            already have it installed, returning the result for each peer
+        """
+
+        if not peers:
+            peers = self.endorsing_peers
+
+        if not self.requestor:
+            raise ValueError('Must specify a requestor')
+        if not peers:
+            raise ValueError('Must specify at least one peer')
+        if not self.chaincode:
+            raise ValueError('Must specify chaincode')
+
+        return await ensure_chaincode_installed(
+            requestor=self.requestor,
+            peers=peers,
+            cc_spec=self.chaincode,
+            max_concurrency=max_concurrency,
+        )
+
     async def instantiate_chaincode(self,
                                     endorsement_policy: EndorsementPolicy = None,
                                     upgrade: bool = False,
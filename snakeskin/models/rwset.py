@@ -0,0 +1,132 @@
+"""
+    Models for storing the read/write sets of Hyperledger Fabric transactions
+    in flat, array-backed columns rather than as nested protobuf objects
+"""
+
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterator, List, Tuple
+
+from ..protos.common.common_pb2 import Envelope, Payload, ChannelHeader
+from ..protos.ledger.rwset.rwset_pb2 import TxReadWriteSet
+from ..protos.ledger.rwset.kvrwset.kv_rwset_pb2 import KVRWSet
+from ..protos.peer.proposal_pb2 import ChaincodeAction
+from ..protos.peer.proposal_response_pb2 import ProposalResponsePayload
+from ..protos.peer.transaction_pb2 import Transaction, ChaincodeActionPayload
+
+from ..constants import TransactionType
+
+
+@dataclass()
+class KVWriteColumns:
+    """ The key/value writes of a set of transactions, stored column-wise.
+        Row ``i`` has its value stored in
+        ``values[value_offsets[i]:value_offsets[i + 1]]``
+    """
+    block_number: array = field(default_factory=lambda: array('Q'))
+    tx_index: array = field(default_factory=lambda: array('L'))
+    namespace: List[str] = field(default_factory=list)
+    key: List[str] = field(default_factory=list)
+    value_offsets: array = field(default_factory=lambda: array('Q', [0]))
+    is_delete: array = field(default_factory=lambda: array('B'))
+    values: bytearray = field(default_factory=bytearray)
+
+    def __len__(self):
+        return len(self.key)
+
+    def value(self, idx: int) -> memoryview:
+        """ A zero-copy view of the value written by row ``idx`` """
+        start, end = self.value_offsets[idx], self.value_offsets[idx + 1]
+        return memoryview(self.values)[start:end]
+
+
+@dataclass()
+class KVReadColumns:
+    """ The key reads of a set of transactions, stored column-wise. Reads of
+        keys that did not exist at simulation time have ``has_version``
+        set to 0
+    """
+    block_number: array = field(default_factory=lambda: array('Q'))
+    tx_index: array = field(default_factory=lambda: array('L'))
+    namespace: List[str] = field(default_factory=list)
+    key: List[str] = field(default_factory=list)
+    has_version: array = field(default_factory=lambda: array('B'))
+    version_block_num: array = field(default_factory=lambda: array('Q'))
+    version_tx_num: array = field(default_factory=lambda: array('Q'))
+
+    def __len__(self):
+        return len(self.key)
+
+
+@dataclass()
+class RWSetBatch:
+    """ The read/write sets of the valid transactions in one or more blocks,
+        stored in flat columns. Blocks can be appended to an existing batch
+        with ``RawBlock.to_rwset_batch(batch=...)``
+    """
+    writes: KVWriteColumns = field(default_factory=KVWriteColumns)
+    reads: KVReadColumns = field(default_factory=KVReadColumns)
+
+    def add_kv_rwset(self,
+                     block_number: int,
+                     tx_index: int,
+                     namespace: str,
+                     kv_rwset: KVRWSet):
+        """ Appends the reads and writes of a single namespace """
+        namespace = sys.intern(namespace)
+
+        writes = self.writes
+        for write in kv_rwset.writes:
+            writes.block_number.append(block_number)
+            writes.tx_index.append(tx_index)
+            writes.namespace.append(namespace)
+            writes.key.append(write.key)
+            writes.is_delete.append(write.is_delete)
+            writes.values += write.value
+            writes.value_offsets.append(len(writes.values))
+
+        reads = self.reads
+        for read in kv_rwset.reads:
+            reads.block_number.append(block_number)
+            reads.tx_index.append(tx_index)
+            reads.namespace.append(namespace)
+            reads.key.append(read.key)
+            has_version = read.HasField('version')
+            reads.has_version.append(has_version)
+            reads.version_block_num.append(
+                read.version.block_num if has_version else 0
+            )
+            reads.version_tx_num.append(
+                read.version.tx_num if has_version else 0
+            )
+
+
+def iter_envelope_rwsets(envelope_bytes: bytes) -> Iterator[Tuple[str, KVRWSet]]:
+    """ Yields the (namespace, KVRWSet) pairs of every action in a serialized
+        transaction envelope. Envelopes that are not endorser transactions
+        yield nothing
+    """
+    envelope = Envelope.FromString(envelope_bytes)
+    payload = Payload.FromString(envelope.payload)
+    channel_header = ChannelHeader.FromString(payload.header.channel_header)
+    if channel_header.type != TransactionType.EndorserTransaction.value:
+        return
+
+    transaction = Transaction.FromString(payload.data)
+    for action in transaction.actions:
+        action_payload = ChaincodeActionPayload.FromString(action.payload)
+        yield from iter_proposal_response_rwsets(
+            action_payload.action.proposal_response_payload
+        )
+
+
+def iter_proposal_response_rwsets(prp_bytes: bytes) -> Iterator[Tuple[str, KVRWSet]]:
+    """ Yields the (namespace, KVRWSet) pairs from a serialized
+        ProposalResponsePayload
+    """
+    response_payload = ProposalResponsePayload.FromString(prp_bytes)
+    cc_action = ChaincodeAction.FromString(response_payload.extension)
+    tx_rwset = TxReadWriteSet.FromString(cc_action.results)
+    for ns_rwset in tx_rwset.ns_rwset:
+        yield ns_rwset.namespace, KVRWSet.FromString(ns_rwset.rwset)
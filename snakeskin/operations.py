@@ -2,17 +2,22 @@
     Blockchain operations
 """
 
-import io
-import os
-import struct
-import tarfile
-from typing import List
+import asyncio
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import List, Optional
 
 from .protos.peer.query_pb2 import ChaincodeQueryResponse
+from .protos.peer.lifecycle.lifecycle_pb2 import (
+    InstallChaincodeArgs,
+    QueryInstalledChaincodeArgs,
+    QueryInstalledChaincodeResult,
+)
 from .protos.common.configtx_pb2 import ConfigUpdateEnvelope
 from .protos.common.common_pb2 import Envelope, Payload
 
-from .models.transaction import EndorsedTX
+from .models.transaction import EndorsedTX, GeneratedTX
+from .models.block import RawBlock
 from .models import (
     Channel,
     Orderer,
@@ -24,12 +29,9 @@ from .models import (
 
 from .events import OrdererEvents
 
-from .errors import BlockRetrievalError
+from .errors import BlockRetrievalError, BlockchainError
 
-from .constants import (
-    ChaincodeProposalType,
-    ChaincodeLanguage
-)
+from .constants import ChaincodeProposalType
 
 from .factories import (
     tx_context_from_user,
@@ -49,6 +51,16 @@ from .transact import (
 
 from .connect import broadcast_to_orderers
 
+from .packaging import PackageCache, build_package, default_package_cache
+
+
+# The system chaincode for the new chaincode lifecycle
+LIFECYCLE_SCC = '+lifecycle'
+
+# Part of the error message of a peer's response to a +lifecycle query for
+# a chaincode name and version that has no install package
+_LIFECYCLE_NOT_FOUND = "chaincode install package '{name}:{version}' not found"
+
 
 async def create_channel(requestor: User, orderers: List[Orderer],
                          channel: Channel, tx_file_path: str):
@@ -84,51 +96,77 @@ async def create_channel(requestor: User, orderers: List[Orderer],
     )
 
 
-async def join_channel(requestor: User,
-                       orderers: List[Orderer],
-                       channel: Channel,
-                       peer: Peer):
+async def fetch_genesis_block(requestor: User,
+                              orderers: List[Orderer],
+                              channel: Channel) -> RawBlock:
     """
-        A high-level operation that joins a peer to a channel, with the
-        following transaction flow:
-
-        - Generates a transaction proposal
-        - Sends that proposal to each of the peers for endorsement
-        - Validates that all endorsements succeeded
+        Retrieves the origin block of a channel, trying each orderer in turn
+        until one delivers it
 
         :param requestor: The user who will sign all requests
-        :param peer: A peer that will join the channel
         :param orderers: Orderers that will be used to find the origin block
                          for this channel
-        :param channel: The channel that the peer will join
+        :param channel: The channel to retrieve the origin block of
+
+        :return: The channel's origin block
     """
 
     if not orderers:
         raise ValueError('Must provide at least one orderer')
 
-    block = None
-    conn_error = None
+    error: Exception = BlockRetrievalError(
+        'Could not retrieve channel origin block from orderer'
+    )
     for orderer in orderers:
-
         events = OrdererEvents(
             requestor=requestor,
             channel=channel,
             orderer=orderer
         )
+        blocks = events.stream_blocks(start=0, stop=0)
         try:
-            async for block in events.stream_blocks(start=0, stop=0):
-                break
-        except ConnectionError as err:
-            conn_error = err
+            async for block in blocks:
+                return block
+        # Try the next orderer, raising the last error if none succeed
+        except (ConnectionError, BlockRetrievalError) as err:
+            error = err
+        finally:
+            # Closes the deliver stream, which returning mid-iteration leaves
+            # open until the generator is collected
+            await blocks.aclose()
 
-    if conn_error:
-        raise conn_error
+    raise error
 
-    if not block:
-        raise BlockRetrievalError(
-            'Could not retrieve channel origin block from orderer'
-        )
 
+async def join_channel(requestor: User,
+                       orderers: List[Orderer],
+                       channel: Channel,
+                       peer: Peer,
+                       genesis_block: Optional[RawBlock] = None):
+    """
+        A high-level operation that joins a peer to a channel, with the
+        following transaction flow:
+
+        - Retrieves the channel's origin block from the orderers, unless
+          it is provided
+        - Generates a transaction proposal
+        - Sends that proposal to each of the peers for endorsement
+        - Validates that all endorsements succeeded
+
+        :param requestor: The user who will sign all requests
+        :param peer: A peer that will join the channel
+        :param orderers: Orderers that will be used to find the origin block
+                         for this channel
+        :param channel: The channel that the peer will join
+        :param genesis_block: The channel's origin block, if it has already
+                              been retrieved
+    """
+
+    block = genesis_block or await fetch_genesis_block(
+        requestor=requestor,
+        orderers=orderers,
+        channel=channel,
+    )
 
     generated_tx = build_generated_tx(
         requestor=requestor,
@@ -236,72 +274,58 @@ async def query_installed_chaincodes(requestor: User,
     return ChaincodeQueryResponse.FromString(resp.response.payload)
 
 
-def package_chaincode(cc_spec: ChaincodeSpec):
-    """ Package chaincode into a tar.gz file
-        Returns: The chaincode pkg path or None
-    """
-
-    if cc_spec.language == ChaincodeLanguage.GOLANG:
-        if not cc_spec.path:
-            raise ValueError('Must specify path on chaincode spec')
-
-
-
-        # Check in GOPATH first, else use cc_spec.path as the file location
-        try:
-            go_path = os.environ.get('GOPATH', '/opt/gopath')
-            proj_path = os.path.join(go_path, 'src', cc_spec.path)
-            os.listdir(proj_path)
-        except FileNotFoundError:
-            proj_path = cc_spec.path
-
-        try:
-            os.listdir(proj_path)
-        except FileNotFoundError:
-            raise ValueError(f'No directory found at path {proj_path}')
+def package_chaincode(cc_spec: ChaincodeSpec,
+                      package_cache: Optional[PackageCache] = None) -> bytes:
+    """ Package chaincode into a tar.gz file, reusing the cached package if
+        a cache is used and the chaincode source has not changed
 
+        :param cc_spec: A specification of the chaincode to package
+        :param package_cache: The cache to package the chaincode through,
+                              defaulting to a cache in SNAKESKIN_PACKAGE_CACHE
+                              if set. Otherwise the chaincode is packaged in
+                              memory
 
+        :return: The tar.gz file contents
+    """
+    package_cache = package_cache or default_package_cache()
+    if package_cache:
+        return package_cache.package(cc_spec)
+    return build_package(cc_spec)
 
-        with io.BytesIO() as tar_stream:
-            with tarfile.open(fileobj=tar_stream, mode='w|gz') as dist:
-                for dir_path, _, file_names in os.walk(cc_spec.path):
-                    for filename in file_names:
-                        file_path = os.path.join(dir_path, filename)
 
-                        with open(file_path, mode='rb') as file_obj:
-                            # Adding src to the file path ensures compatibility
-                            # with the chaincode container
-                            arcname = os.path.join('src', file_path)
-                            tarinfo = dist.gettarinfo(file_path, arcname)
-                            # standardizes the tar metadata so that is
-                            # consistent across all files - this allows
-                            # consistent fingerprinting regardless of the SDK
-                            # used ton package chaincode
-                            tarinfo.uid = tarinfo.gid = 500
-                            tarinfo.mode = 100644
-                            tarinfo.mtime = 0
-                            tarinfo.pax_headers = {
-                                'atime': '0',
-                                'ctime': '0',
-                            }
-                            dist.addfile(tarinfo, file_obj)
+def _build_install_tx(requestor: User,
+                      cc_spec: ChaincodeSpec,
+                      package_cache: Optional[PackageCache]) -> GeneratedTX:
+    if not cc_spec.name:
+        raise ValueError('Must provide chaincode name')
 
-            # Uses a timestamp of zero to allow for consistent fingerprinting
-            tar_stream.seek(4)
-            timestamp_bytes = struct.pack("<L", 0)
-            tar_stream.write(timestamp_bytes)
+    cc_pkg = package_chaincode(cc_spec, package_cache)
 
-            tar_stream.seek(0)
-            return tar_stream.read()
+    cc_deployment_spec = build_cc_deployment_spec(
+        language=cc_spec.language,
+        name=cc_spec.name,
+        version=cc_spec.version,
+        path=cc_spec.path,
+        code_package=cc_pkg,
+    )
 
-    else:
-        raise ValueError('Currently only support install GOLANG chaincode')
+    args = [
+        encode_proto_bytes(ChaincodeProposalType.Install.value),
+        cc_deployment_spec.SerializeToString()
+    ]
 
+    return build_generated_tx(
+        requestor=requestor,
+        cc_name='lscc',
+        args=args
+    )
 
 
 async def install_chaincode(requestor: User,
                             peers: List[Peer],
-                            cc_spec: ChaincodeSpec) -> EndorsedTX:
+                            cc_spec: ChaincodeSpec,
+                            package_cache: Optional[PackageCache] = None
+                           ) -> EndorsedTX:
     """
         A high-level operation that packages and installs chaincode onto the
         provided peers with the following transaction flow:
@@ -318,45 +342,297 @@ async def install_chaincode(requestor: User,
                       fails
         :param cc_spec: A specification of the metadata needed to install
                         the chaincode
+        :param package_cache: The cache to package the chaincode through,
+                              as in package_chaincode
 
         :return: The endorsed transaction
     """
 
+    generated_tx = _build_install_tx(requestor, cc_spec, package_cache)
+
+    endorsed_tx = await propose_tx(
+        peers=peers,
+        generated_tx=generated_tx,
+    )
+
+    raise_tx_proposal_error(
+        endorsed_tx=endorsed_tx,
+        msg=f'Failed install chaincode {cc_spec.name} version {cc_spec.version}'
+    )
+
+    return endorsed_tx
+
+
+@dataclass()
+class PeerInstallResult:
+    """ The outcome of ensuring chaincode is installed on a peer """
+    peer: Peer
+    # One of 'installed', 'already_installed' or 'failed'
+    status: str
+    endorsed_tx: Optional[EndorsedTX] = None
+    error: Optional[BaseException] = None
+
+
+async def ensure_chaincode_installed(requestor: User,
+                                     peers: List[Peer],
+                                     cc_spec: ChaincodeSpec,
+                                     max_concurrency: int = 8,
+                                     package_cache: Optional[PackageCache] = None
+                                    ) -> List[PeerInstallResult]:
+    """
+        A high-level operation that installs chaincode onto each of the
+        provided peers that does not already have its name and version
+        installed, with the following transaction flow:
+
+        - Queries the installed chaincodes on all peers concurrently
+        - Packages the chaincode and generates a single install proposal,
+          if any peer needs it
+        - Sends the proposal to each of those peers, with at most
+          max_concurrency uploads in flight
+        - Returns the result for each peer, in the order provided
+
+        Unlike install_chaincode, a failure on one peer does not fail the
+        others; it is reported in that peer's result.
+
+        :param requestor: The user who will sign all requests
+        :param peers: The peers to install the chaincode onto
+        :param cc_spec: A specification of the metadata needed to install
+                        the chaincode
+        :param max_concurrency: The max number of peers to upload the
+                                chaincode package to at once
+        :param package_cache: The cache to package the chaincode through,
+                              as in package_chaincode
+
+        :return: The install result for each peer
+    """
+
     if not cc_spec.name:
         raise ValueError('Must provide chaincode name')
+    if max_concurrency < 1:
+        raise ValueError('max_concurrency must be at least 1')
+
+    installed = await asyncio.gather(*[
+        query_installed_chaincodes(requestor=requestor, peer=peer)
+        for peer in peers
+    ], return_exceptions=True)
+
+    results = []
+    to_install = []
+    for peer, resp in zip(peers, installed):
+        if isinstance(resp, BaseException):
+            result = PeerInstallResult(peer=peer, status='failed', error=resp)
+        elif any(cc.name == cc_spec.name and cc.version == cc_spec.version
+                 for cc in resp.chaincodes):
+            result = PeerInstallResult(peer=peer, status='already_installed')
+        else:
+            result = PeerInstallResult(peer=peer, status='installed')
+            to_install.append(result)
+        results.append(result)
+
+    if not to_install:
+        return results
+
+    # Packaging reads the chaincode source from disk, so is kept off the
+    # event loop
+    generated_tx = await asyncio.get_event_loop().run_in_executor(
+        None, _build_install_tx, requestor, cc_spec, package_cache
+    )
+    await _propose_installs(to_install, generated_tx, cc_spec, max_concurrency)
+    return results
 
-    cc_pkg = package_chaincode(cc_spec)
 
-    cc_deployment_spec = build_cc_deployment_spec(
+async def _propose_installs(to_install: List[PeerInstallResult],
+                            generated_tx: GeneratedTX,
+                            cc_spec: ChaincodeSpec,
+                            max_concurrency: int):
+    """ Sends an install proposal to each peer, with at most max_concurrency
+        in flight, recording any failure in the peer's result
+    """
+    slots = asyncio.Semaphore(max_concurrency)
+
+    async def _install(result: PeerInstallResult):
+        async with slots:
+            try:
+                result.endorsed_tx = await propose_tx(
+                    peers=[result.peer],
+                    generated_tx=generated_tx,
+                )
+                raise_tx_proposal_error(
+                    endorsed_tx=result.endorsed_tx,
+                    msg=(
+                        f'Failed install chaincode {cc_spec.name} version '
+                        f'{cc_spec.version} on peer {result.peer.name}'
+                    )
+                )
+            except Exception as err: # pylint: disable=broad-except
+                result.status = 'failed'
+                result.error = err
+
+    await asyncio.gather(*[_install(result) for result in to_install])
+
+
+def lifecycle_package(cc_spec: ChaincodeSpec,
+                      package_cache: Optional[PackageCache] = None) -> bytes:
+    """ The install package for the new chaincode lifecycle: the serialized
+        ChaincodeDeploymentSpec of the packaged chaincode
+
+        :param cc_spec: A specification of the chaincode to package
+        :param package_cache: The cache to package the chaincode through,
+                              as in package_chaincode
+
+        :return: The install package
+    """
+    if not cc_spec.name:
+        raise ValueError('Must provide chaincode name')
+    return build_cc_deployment_spec(
         language=cc_spec.language,
         name=cc_spec.name,
         version=cc_spec.version,
         path=cc_spec.path,
-        code_package=cc_pkg,
-    )
+        code_package=package_chaincode(cc_spec, package_cache),
+    ).SerializeToString()
 
-    args = [
-        encode_proto_bytes(ChaincodeProposalType.Install.value),
-        cc_deployment_spec.SerializeToString()
-    ]
+
+def lifecycle_package_hash(install_package: bytes) -> bytes:
+    """ The hash a peer stores an install package under, as returned by
+        +lifecycle InstallChaincode and QueryInstalledChaincode
+    """
+    return sha256(install_package).digest()
+
+
+async def query_lifecycle_installed(requestor: User,
+                                    peer: Peer,
+                                    cc_spec: ChaincodeSpec) -> Optional[bytes]:
+    """
+        Queries the hash of the package installed on the provided peer for
+        the chaincode's name and version through the +lifecycle system
+        chaincode
+
+        :param requestor: The user who will sign all requests
+        :param peer: The peer to query
+        :param cc_spec: A specification of the chaincode to query
+
+        :return: The hash of the installed package, or None if the peer
+                 does not have the chaincode installed
+    """
 
     generated_tx = build_generated_tx(
         requestor=requestor,
-        cc_name='lscc',
-        args=args
+        cc_name=LIFECYCLE_SCC,
+        args=[
+            encode_proto_bytes('QueryInstalledChaincode'),
+            QueryInstalledChaincodeArgs(
+                name=cc_spec.name,
+                version=cc_spec.version,
+            ).SerializeToString(),
+        ],
     )
 
     endorsed_tx = await propose_tx(
-        peers=peers,
-        generated_tx=generated_tx,
+        peers=[peer],
+        generated_tx=generated_tx
     )
 
+    # The peer responds with an error if nothing is installed
+    resp = endorsed_tx.peer_responses[0]
+    if resp.response.status != 200 and _LIFECYCLE_NOT_FOUND.format(
+            name=cc_spec.name, version=cc_spec.version) in resp.response.message:
+        return None
     raise_tx_proposal_error(
         endorsed_tx=endorsed_tx,
-        msg=f'Failed install chaincode {cc_spec.name} version {cc_spec.version}'
+        msg='Failed query +lifecycle installed chaincode'
     )
+    return QueryInstalledChaincodeResult.FromString(resp.response.payload).hash
 
-    return endorsed_tx
+
+async def lifecycle_install_chaincode(requestor: User,
+                                      peers: List[Peer],
+                                      cc_spec: ChaincodeSpec,
+                                      max_concurrency: int = 8,
+                                      package_cache: Optional[PackageCache] = None
+                                     ) -> List[PeerInstallResult]:
+    """
+        A high-level operation that installs chaincode onto each of the
+        provided peers through the +lifecycle system chaincode, unless the
+        peer already has the same package installed, with the following
+        transaction flow:
+
+        - Packages the chaincode and computes its hash locally, while
+          querying the hash installed on every peer concurrently
+        - Sends a single install proposal to each peer that has nothing
+          installed, with at most max_concurrency uploads in flight
+        - Returns the result for each peer, in the order provided
+
+        A peer with a different package installed under the same name and
+        version fails, as the peer would reject the install.
+
+        :param requestor: The user who will sign all requests
+        :param peers: The peers to install the chaincode onto
+        :param cc_spec: A specification of the metadata needed to install
+                        the chaincode
+        :param max_concurrency: The max number of peers to upload the
+                                chaincode package to at once
+        :param package_cache: The cache to package the chaincode through,
+                              as in package_chaincode
+
+        :return: The install result for each peer
+    """
+
+    if not cc_spec.name:
+        raise ValueError('Must provide chaincode name')
+    if max_concurrency < 1:
+        raise ValueError('max_concurrency must be at least 1')
+
+    # Packaging reads the chaincode source from disk, so is kept off the
+    # event loop, while the peers are queried
+    packaging = asyncio.get_event_loop().run_in_executor(
+        None, lifecycle_package, cc_spec, package_cache
+    )
+    installed = await asyncio.gather(*[
+        query_lifecycle_installed(requestor=requestor, peer=peer, cc_spec=cc_spec)
+        for peer in peers
+    ], return_exceptions=True)
+    install_package = await packaging
+    package_hash = lifecycle_package_hash(install_package)
+
+    results = []
+    to_install = []
+    for peer, installed_hash in zip(peers, installed):
+        if isinstance(installed_hash, BaseException):
+            result = PeerInstallResult(
+                peer=peer, status='failed', error=installed_hash
+            )
+        elif installed_hash == package_hash:
+            result = PeerInstallResult(peer=peer, status='already_installed')
+        elif installed_hash is not None:
+            result = PeerInstallResult(peer=peer, status='failed', error=(
+                BlockchainError(
+                    f'Peer {peer.name} has a different package installed for '
+                    f'chaincode {cc_spec.name} version {cc_spec.version}'
+                )
+            ))
+        else:
+            result = PeerInstallResult(peer=peer, status='installed')
+            to_install.append(result)
+        results.append(result)
+
+    if not to_install:
+        return results
+
+    generated_tx = build_generated_tx(
+        requestor=requestor,
+        cc_name=LIFECYCLE_SCC,
+        args=[
+            encode_proto_bytes('InstallChaincode'),
+            InstallChaincodeArgs(
+                name=cc_spec.name,
+                version=cc_spec.version,
+                chaincode_install_package=install_package,
+            ).SerializeToString(),
+        ],
+    )
+    await _propose_installs(to_install, generated_tx, cc_spec, max_concurrency)
+    return results
 
 
 async def instantiate_chaincode(requestor: User,
@@ -0,0 +1,319 @@
+"""
+    Packaging of chaincode source into deterministic tarballs, optionally
+    cached on disk by a fingerprint of the source files so that unchanged
+    chaincode is only packaged once
+"""
+
+import io
+import os
+import struct
+import tarfile
+import tempfile
+import zlib
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from hashlib import sha256
+from threading import Lock
+from functools import partial
+from typing import IO, Deque, List, Optional, Tuple, cast
+
+from .models import ChaincodeSpec
+from .constants import ChaincodeLanguage
+
+
+# Changing how packages are built must change this, so that packages cached
+# by an earlier version are not reused
+_PACKAGE_FORMAT = b'snakeskin-chaincode-package-1'
+_READ_SIZE = 1024 * 1024
+
+# Parallel packages are compressed in gzip members of this much tar data.
+# It is fixed, rather than derived from the number of workers, so that the
+# package is the same however many workers compress it
+PARALLEL_CHUNK_SIZE = 1024 * 1024
+
+# The number of packages a cache keeps by default
+DEFAULT_MAX_ENTRIES = 32
+
+
+def _source_files(cc_spec: ChaincodeSpec) -> List[Tuple[str, str]]:
+    """ The (file path, archive name) of every file in the chaincode """
+
+    if cc_spec.language != ChaincodeLanguage.GOLANG:
+        raise ValueError('Currently only support install GOLANG chaincode')
+    if not cc_spec.path:
+        raise ValueError('Must specify path on chaincode spec')
+
+    # Check in GOPATH first, else use cc_spec.path as the file location
+    try:
+        go_path = os.environ.get('GOPATH', '/opt/gopath')
+        proj_path = os.path.join(go_path, 'src', cc_spec.path)
+        os.listdir(proj_path)
+    except FileNotFoundError:
+        proj_path = cc_spec.path
+
+    try:
+        os.listdir(proj_path)
+    except FileNotFoundError:
+        raise ValueError(f'No directory found at path {proj_path}')
+
+    files = []
+    for dir_path, _, file_names in os.walk(cc_spec.path):
+        for filename in file_names:
+            file_path = os.path.join(dir_path, filename)
+            # Adding src to the file path ensures compatibility with the
+            # chaincode container
+            files.append((file_path, os.path.join('src', file_path)))
+    return files
+
+
+def _compression(workers: Optional[int]) -> bytes:
+    """ Identifies how a package is compressed in its fingerprint """
+    return b'gzip' if workers is None else b'parallel-gzip'
+
+
+def package_fingerprint(cc_spec: ChaincodeSpec,
+                        workers: Optional[int] = None) -> str:
+    """ A hex digest over the archive name, size and content hash of every
+        file in the chaincode and how it is compressed, which changes
+        whenever the package would
+    """
+    digest = sha256(_PACKAGE_FORMAT)
+    digest.update(_compression(workers))
+    for file_path, arcname in _source_files(cc_spec):
+        content = sha256()
+        size = 0
+        with open(file_path, 'rb') as file_obj:
+            for chunk in iter(partial(file_obj.read, _READ_SIZE), b''):
+                content.update(chunk)
+                size += len(chunk)
+        encoded_name = arcname.encode('utf-8')
+        digest.update(struct.pack('>I', len(encoded_name)))
+        digest.update(encoded_name)
+        digest.update(struct.pack('>Q', size))
+        digest.update(content.digest())
+    return digest.hexdigest()
+
+
+def _add_source_files(dist: tarfile.TarFile, cc_spec: ChaincodeSpec):
+    for file_path, arcname in _source_files(cc_spec):
+        with open(file_path, mode='rb') as file_obj:
+            tarinfo = dist.gettarinfo(file_path, arcname)
+            # standardizes the tar metadata so that is consistent across all
+            # files - this allows consistent fingerprinting regardless of the
+            # SDK used ton package chaincode
+            tarinfo.uid = tarinfo.gid = 500
+            tarinfo.mode = 100644
+            tarinfo.mtime = 0
+            tarinfo.pax_headers = {
+                'atime': '0',
+                'ctime': '0',
+            }
+            dist.addfile(tarinfo, file_obj)
+
+
+def _gzip_member(data: bytes) -> bytes:
+    """ Compresses data as a complete gzip member. zlib writes a header with
+        a zero timestamp and no file name, so members are deterministic.
+    """
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+class _ParallelGzipWriter:
+    """ A write-only file that compresses every PARALLEL_CHUNK_SIZE bytes
+        written to it as a separate gzip member on an executor, writing the
+        members to the output in order. Concatenated members are a valid
+        gzip stream.
+    """
+
+    def __init__(self, out: IO[bytes], executor: Executor, max_pending: int):
+        self.out = out
+        self.executor = executor
+        self.max_pending = max_pending
+        self._buffer = bytearray()
+        self._pending: Deque[Future] = deque()
+
+    def write(self, data: bytes) -> int:
+        """ Buffers data, compressing every complete chunk """
+        self._buffer.extend(data)
+        while len(self._buffer) >= PARALLEL_CHUNK_SIZE:
+            chunk = bytes(self._buffer[:PARALLEL_CHUNK_SIZE])
+            del self._buffer[:PARALLEL_CHUNK_SIZE]
+            self._submit(chunk)
+        return len(data)
+
+    def close(self):
+        """ Compresses any remaining data and waits for every member """
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        while self._pending:
+            self.out.write(self._pending.popleft().result())
+
+    def _submit(self, chunk: bytes):
+        while len(self._pending) >= self.max_pending:
+            self.out.write(self._pending.popleft().result())
+        self._pending.append(self.executor.submit(_gzip_member, chunk))
+
+
+def write_package(cc_spec: ChaincodeSpec,
+                  out: IO[bytes],
+                  workers: Optional[int] = None):
+    """ Writes the chaincode as a tar.gz to a seekable binary file, starting
+        at its current position. If workers is set, the tar is compressed in
+        independent gzip members on that many threads instead of a single
+        stream, which is faster for large chaincode.
+    """
+    if workers is None:
+        start = out.tell()
+        with tarfile.open(fileobj=out, mode='w|gz') as dist:
+            _add_source_files(dist, cc_spec)
+
+        # Uses a timestamp of zero to allow for consistent fingerprinting
+        end = out.tell()
+        out.seek(start + 4)
+        out.write(struct.pack('<L', 0))
+        out.seek(end)
+        return
+
+    if workers < 1:
+        raise ValueError('workers must be at least 1')
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        writer = _ParallelGzipWriter(out, executor, max_pending=workers * 2)
+        # In stream mode, tarfile only writes to the file object
+        with tarfile.open(fileobj=cast(IO[bytes], writer), mode='w|') as dist:
+            _add_source_files(dist, cc_spec)
+        writer.close()
+
+
+def build_package(cc_spec: ChaincodeSpec, workers: Optional[int] = None) -> bytes:
+    """ Packages the chaincode in memory, without caching it """
+    with io.BytesIO() as out:
+        write_package(cc_spec, out, workers)
+        return out.getvalue()
+
+
+def default_cache_dir() -> str:
+    """ The directory packages are cached in: SNAKESKIN_PACKAGE_CACHE if set,
+        else snakeskin/chaincode under the user's cache directory
+    """
+    cache_dir = os.environ.get('SNAKESKIN_PACKAGE_CACHE')
+    if cache_dir:
+        return cache_dir
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache'
+    )
+    return os.path.join(cache_home, 'snakeskin', 'chaincode')
+
+
+class PackageCache:
+    """ Caches chaincode packages on disk, keyed by their fingerprint.
+        Packages are written to a temporary file in the cache directory and
+        renamed into place once complete, so that concurrent writers never
+        expose a partial package. Once the cache holds more than max_entries
+        packages, the least recently used are removed. If workers is set,
+        packages are compressed in parallel (see write_package).
+    """
+
+    def __init__(self,
+                 cache_dir: Optional[str] = None,
+                 workers: Optional[int] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        if workers is not None and workers < 1:
+            raise ValueError('workers must be at least 1')
+        if max_entries < 1:
+            raise ValueError('max_entries must be at least 1')
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.workers = workers
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+
+    def package_path(self, cc_spec: ChaincodeSpec) -> str:
+        """ The path of the packaged chaincode, packaging it if it has
+            changed since it was last cached
+        """
+        path = os.path.join(
+            self.cache_dir,
+            f'{package_fingerprint(cc_spec, self.workers)}.tar.gz'
+        )
+        try:
+            # Marks the package as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        else:
+            with self._lock:
+                self.hits += 1
+            return path
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+                dir=self.cache_dir, suffix='.tmp', delete=False) as tmp:
+            try:
+                write_package(cc_spec, tmp, self.workers)
+            except BaseException:
+                tmp.close()
+                os.unlink(tmp.name)
+                raise
+        os.replace(tmp.name, path)
+        with self._lock:
+            self.misses += 1
+        self._evict(keep=path)
+        return path
+
+    def package(self, cc_spec: ChaincodeSpec) -> bytes:
+        """ The packaged chaincode """
+        with open(self.package_path(cc_spec), 'rb') as package_file:
+            return package_file.read()
+
+    def clear(self):
+        """ Removes every cached package """
+        for path in self._package_paths():
+            _unlink_missing_ok(path)
+
+    def _evict(self, keep: str):
+        """ Removes the least recently used packages beyond max_entries """
+        paths = []
+        for path in self._package_paths():
+            try:
+                paths.append((os.stat(path).st_mtime, path))
+            except FileNotFoundError:
+                continue
+        paths.sort(reverse=True)
+        for _, path in paths[self.max_entries:]:
+            if path != keep:
+                _unlink_missing_ok(path)
+
+    def _package_paths(self) -> List[str]:
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir) if name.endswith('.tar.gz')
+        ]
+
+
+def _unlink_missing_ok(path: str):
+    """ Removes a file, which another process may already have removed """
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+_DEFAULT_CACHE: Optional[PackageCache] = None
+
+
+def default_package_cache() -> Optional[PackageCache]:
+    """ The cache shared within a process, in SNAKESKIN_PACKAGE_CACHE. None
+        if that is not set, as packages are only cached on disk on request.
+    """
+    global _DEFAULT_CACHE # pylint: disable=global-statement
+    cache_dir = os.environ.get('SNAKESKIN_PACKAGE_CACHE')
+    if not cache_dir:
+        return None
+    if _DEFAULT_CACHE is None or _DEFAULT_CACHE.cache_dir != cache_dir:
+        _DEFAULT_CACHE = PackageCache(cache_dir)
+    return _DEFAULT_CACHE
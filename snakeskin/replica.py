@@ -0,0 +1,116 @@
+"""
+    Local, queryable replica of chaincode world state, materialized from
+    the write sets of committed blocks
+"""
+
+import sqlite3
+from typing import Dict, Optional, Tuple
+
+from .events import PeerEvents
+from .models.block import RawBlock
+from .constants import INDEFINITE_STOP_POSITION
+
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS state (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    block_num INTEGER NOT NULL,
+    tx_num INTEGER NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS replica_meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+'''
+
+
+class StateReplica:
+    """ A SQLite copy of chaincode state keyed by (namespace, key). Blocks
+        are applied in order, each in a single SQL transaction, and the
+        replica resumes from the last applied block when reopened.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    @property
+    def height(self) -> int:
+        """ The number of blocks applied to this replica, which is also the
+            number of the next block to apply
+        """
+        row = self._conn.execute(
+            "SELECT value FROM replica_meta WHERE name = 'height'"
+        ).fetchone()
+        return row[0] if row else 0
+
+    def apply_block(self, block: RawBlock):
+        """ Applies the write sets of the valid transactions in a block.
+            Blocks below the current height are ignored, so that replaying
+            a stream is safe.
+        """
+        number = block.header.number
+        height = self.height
+        if number < height:
+            return
+        if number > height:
+            raise ValueError(
+                f'Cannot apply block {number} to replica at height {height}'
+            )
+
+        writes = block.to_rwset_batch().writes
+
+        # Only the last write to a key within a block is visible afterwards
+        final: Dict[Tuple[str, str], int] = {}
+        for idx, key in enumerate(writes.key):
+            final[(writes.namespace[idx], key)] = idx
+
+        upserts = []
+        deletes = []
+        for (namespace, key), idx in final.items():
+            if writes.is_delete[idx]:
+                deletes.append((namespace, key))
+            else:
+                upserts.append((
+                    namespace, key, bytes(writes.value(idx)),
+                    number, writes.tx_index[idx]
+                ))
+
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO state VALUES (?, ?, ?, ?, ?)', upserts
+            )
+            self._conn.executemany(
+                'DELETE FROM state WHERE namespace = ? AND key = ?', deletes
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO replica_meta VALUES ('height', ?)",
+                (number + 1,)
+            )
+
+    async def sync(self,
+                   events: PeerEvents,
+                   stop: int = INDEFINITE_STOP_POSITION):
+        """ Streams blocks from the peer, starting at the current height,
+            and applies them until ``stop`` is reached
+        """
+        async for block in events.stream_blocks(start=self.height, stop=stop):
+            self.apply_block(block)
+
+    def get_state(self, namespace: str, key: str) -> Optional[bytes]:
+        """ Gets the current value of a key, or None if it does not exist """
+        row = self._conn.execute(
+            'SELECT value FROM state WHERE namespace = ? AND key = ?',
+            (namespace, key)
+        ).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        """ Closes the underlying database connection """
+        self._conn.close()
@@ -0,0 +1,127 @@
+"""
+    Retry policies for transactions, which classify errors as retryable and
+    limit retries with jittered backoff and a shared retry budget
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Awaitable, Callable, FrozenSet, TypeVar
+
+from .protos.peer.transaction_pb2 import TxValidationCode
+from .protos.common.common_pb2 import Status
+from .errors import (
+    BlockchainConnectionError,
+    TrasactionCommitError,
+    TransactionValidationError,
+)
+
+
+_Result = TypeVar('_Result')
+
+
+class RetryBudget:
+    """ Limits retries across every operation sharing the budget. Each retry
+        spends a token, and each success earns ``token_ratio`` tokens, up to
+        ``max_tokens``. When contention makes most attempts fail, the tokens
+        run out and failures are raised instead of retried.
+    """
+
+    def __init__(self, max_tokens: float = 10, token_ratio: float = 0.1):
+        if max_tokens < 1:
+            raise ValueError('max_tokens must be at least 1')
+        self.max_tokens = max_tokens
+        self.token_ratio = token_ratio
+        self.tokens = max_tokens
+        self._lock = Lock()
+
+    def try_spend(self) -> bool:
+        """ Spends a token for a retry, returning whether one was available """
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def record_success(self):
+        """ Earns tokens for a successful operation """
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.token_ratio)
+
+
+# The budget shared by retry policies within a process
+DEFAULT_RETRY_BUDGET = RetryBudget()
+
+
+@dataclass()
+class RetryPolicy:
+    """ Which errors to retry, and how often. Operations are retried with
+        full jitter: a random delay of up to base_delay * 2 ** retry seconds,
+        capped at max_delay.
+
+        Only errors after which the transaction cannot have committed are
+        retryable by default: read conflicts, orderer rejections and
+        connection failures while endorsing. Connection failures once the
+        transaction is broadcast raise a CommitStatusUnknownError, which is
+        not retried. Each retry must generate a new transaction, as the
+        failed transaction id cannot be reused.
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 5.0
+    # Names of grpc.StatusCode members
+    retryable_grpc_codes: FrozenSet[str] = frozenset({
+        'UNAVAILABLE',
+        'RESOURCE_EXHAUSTED',
+    })
+    retryable_validation_codes: FrozenSet[int] = frozenset({
+        TxValidationCode.MVCC_READ_CONFLICT,
+        TxValidationCode.PHANTOM_READ_CONFLICT,
+    })
+    retryable_broadcast_statuses: FrozenSet[int] = frozenset({
+        Status.SERVICE_UNAVAILABLE,
+    })
+    budget: RetryBudget = field(
+        default_factory=lambda: DEFAULT_RETRY_BUDGET, compare=False, repr=False
+    )
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1')
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """ Whether an error may succeed if the transaction is retried """
+        if isinstance(error, TransactionValidationError):
+            return error.code in self.retryable_validation_codes
+        if isinstance(error, BlockchainConnectionError):
+            return getattr(error.code, 'name', None) in self.retryable_grpc_codes
+        if isinstance(error, TrasactionCommitError):
+            return error.status in self.retryable_broadcast_statuses
+        return False
+
+    def backoff(self, retry: int) -> float:
+        """ The delay in seconds before a retry, counting from 0 """
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** retry)
+        )
+
+    async def run(self, operation: Callable[[], Awaitable[_Result]]) -> _Result:
+        """ Runs the operation, calling it again after each retryable error
+            until it succeeds, max_attempts is reached or the budget runs
+            out. The last error is raised.
+        """
+        retry = 0
+        while True:
+            try:
+                result = await operation()
+            except Exception as err: # pylint: disable=broad-except
+                if (retry + 1 >= self.max_attempts
+                        or not self.is_retryable(err)
+                        or not self.budget.try_spend()):
+                    raise
+                await asyncio.sleep(self.backoff(retry))
+                retry += 1
+            else:
+                self.budget.record_success()
+                return result
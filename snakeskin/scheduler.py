@@ -0,0 +1,107 @@
+"""
+    Client-side scheduling of transactions that touch the same keys, so that
+    a transaction is not submitted while it would fail validation with an
+    MVCC read conflict
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Set, Tuple
+
+from .models.transaction import EndorsedTX
+from .models.rwset import iter_proposal_response_rwsets
+
+
+_Key = Tuple[str, str]
+
+
+def read_write_keys(endorsed_tx: EndorsedTX) -> Tuple[Set[_Key], Set[_Key]]:
+    """ The (namespace, key) pairs read and written by an endorsed
+        transaction, from the first peer's response
+    """
+    reads: Set[_Key] = set()
+    writes: Set[_Key] = set()
+    for namespace, rwset in iter_proposal_response_rwsets(
+            endorsed_tx.peer_responses[0].payload):
+        reads.update((namespace, read.key) for read in rwset.reads)
+        writes.update((namespace, write.key) for write in rwset.writes)
+    return reads, writes
+
+
+class KeyConflictScheduler:
+    """ Tracks the keys written by transactions that have been submitted
+        but not yet committed. A transaction that read one of those keys was
+        endorsed against a version that the in-flight write will replace,
+        so it waits for that transaction to finish and is endorsed again
+        before it is submitted.
+
+        Transactions are released once they are committed on the peer the
+        gateway waits on; a peer that lags behind it may still endorse a
+        stale read.
+    """
+
+    def __init__(self, max_reendorsements: int = 5):
+        if max_reendorsements < 0:
+            raise ValueError('max_reendorsements must not be negative')
+        self.max_reendorsements = max_reendorsements
+        self.reendorsements = 0
+        self._writers: Dict[_Key, Set[str]] = {}
+        self._in_flight: Dict[str, Tuple[Set[_Key], asyncio.Event]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """ The number of admitted transactions that have not been released """
+        return len(self._in_flight)
+
+    async def admit(self, endorsed_tx: EndorsedTX, wait: bool = True) -> bool:
+        """ Admits the transaction and returns True if it read no keys
+            written by in-flight transactions, registering the keys it
+            writes. Otherwise waits for those transactions to be released
+            and returns False, after which the transaction should be
+            endorsed again. If wait is False, the transaction is admitted
+            regardless of conflicts.
+        """
+        reads, writes = read_write_keys(endorsed_tx)
+        blockers = {
+            tx_id for key in reads for tx_id in self._writers.get(key, ())
+        }
+        blockers.discard(endorsed_tx.tx_id)
+        if blockers and wait:
+            await asyncio.wait([
+                asyncio.ensure_future(self._in_flight[tx_id][1].wait())
+                for tx_id in blockers
+            ])
+            return False
+
+        self._in_flight[endorsed_tx.tx_id] = (writes, asyncio.Event())
+        for key in writes:
+            self._writers.setdefault(key, set()).add(endorsed_tx.tx_id)
+        return True
+
+    def release(self, tx_id: str):
+        """ Releases an admitted transaction once it has committed or
+            failed, waking any transactions waiting on its writes
+        """
+        entry = self._in_flight.pop(tx_id, None)
+        if entry is None:
+            return
+        writes, done = entry
+        for key in writes:
+            writers = self._writers[key]
+            writers.discard(tx_id)
+            if not writers:
+                del self._writers[key]
+        done.set()
+
+    async def endorse(self, endorse: Callable[[], Awaitable[EndorsedTX]]) -> EndorsedTX:
+        """ Endorses a transaction and admits it, endorsing a new transaction
+            after each conflict up to max_reendorsements times. The returned
+            transaction must be released.
+        """
+        endorsed_tx = await endorse()
+        for _ in range(self.max_reendorsements):
+            if await self.admit(endorsed_tx):
+                return endorsed_tx
+            self.reendorsements += 1
+            endorsed_tx = await endorse()
+        await self.admit(endorsed_tx, wait=False)
+        return endorsed_tx
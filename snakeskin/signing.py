@@ -0,0 +1,251 @@
+"""
+    Signers, which sign messages on behalf of a user without blocking the
+    event loop, optionally keeping the private key out of the application
+    process entirely
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import struct
+import threading
+from concurrent.futures import Executor
+from typing import Any, List, Optional, Tuple
+
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from cryptography.hazmat.backends import default_backend
+
+from .crypto import CryptoSuite
+from .errors import SigningError
+
+
+# Requests are a 4 byte big-endian length followed by the message. Responses
+# are a status byte, a 4 byte length, and either the signature or an error
+_LENGTH = struct.Struct('>I')
+_RESPONSE_HEADER = struct.Struct('>BI')
+_STATUS_OK = 0
+_STATUS_ERROR = 1
+
+
+class Signer:
+    """ Signs messages on behalf of a user """
+
+    def sign_sync(self, message: bytes) -> bytes:
+        """ Signs a message, blocking until the signature is available """
+        raise NotImplementedError
+
+    async def sign(self, message: bytes) -> bytes:
+        """ Signs a message """
+        return self.sign_sync(message)
+
+
+class InProcessSigner(Signer):
+    """ Signs messages on the calling thread with a private key held in this
+        process
+    """
+
+    def __init__(self, private_key: Any, crypto_suite: Any = None):
+        self.private_key = private_key
+        self.crypto_suite = crypto_suite or CryptoSuite.default
+
+    def sign_sync(self, message: bytes) -> bytes:
+        return self.crypto_suite.sign(self.private_key, message)
+
+
+class ThreadPoolSigner(InProcessSigner):
+    """ Signs messages on an executor (the loop's default executor if none is
+        provided), so that signing does not block the event loop and
+        concurrent signatures are computed in parallel
+    """
+
+    def __init__(self,
+                 private_key: Any,
+                 crypto_suite: Any = None,
+                 executor: Optional[Executor] = None):
+        super().__init__(private_key, crypto_suite)
+        self.executor = executor
+
+    async def sign(self, message: bytes) -> bytes:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.executor, self.sign_sync, message
+        )
+
+
+class SigningDaemon:
+    """ Serves signatures over a unix socket, so that a single process holds
+        the private key and is shared by any number of worker processes
+        using a SocketSigner
+    """
+
+    def __init__(self, socket_path: str, signer: Signer):
+        self.socket_path = socket_path
+        self.signer = signer
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        """ Starts listening on the socket, which only the owner can
+            connect to
+        """
+        # The socket is bound before the first await, so the umask only
+        # applies while it is created
+        umask = os.umask(0o077)
+        try:
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, path=self.socket_path
+            )
+        finally:
+            os.umask(umask)
+
+    async def serve_forever(self):
+        """ Starts listening on the socket and serves until cancelled """
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """ Stops listening on the socket """
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self,
+                                 reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(_LENGTH.size)
+                except asyncio.IncompleteReadError:
+                    return
+                (length,) = _LENGTH.unpack(header)
+                message = await reader.readexactly(length)
+                try:
+                    status = _STATUS_OK
+                    body = await self.signer.sign(message)
+                except Exception as err: # pylint: disable=broad-except
+                    status = _STATUS_ERROR
+                    body = str(err).encode('utf-8')
+                writer.write(_RESPONSE_HEADER.pack(status, len(body)) + body)
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+class SocketSigner(Signer):
+    """ Signs messages using a SigningDaemon listening on a unix socket.
+        Up to max_connections requests are in flight at once.
+    """
+
+    def __init__(self, socket_path: str, max_connections: int = 4):
+        if max_connections < 1:
+            raise ValueError('max_connections must be at least 1')
+        self.socket_path = socket_path
+        self.max_connections = max_connections
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._sync_socket: Optional[socket.socket] = None
+        self._sync_lock = threading.Lock()
+
+    async def sign(self, message: bytes) -> bytes:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_connections)
+        async with self._slots:
+            if self._idle:
+                reader, writer = self._idle.pop()
+            else:
+                try:
+                    reader, writer = await asyncio.open_unix_connection(
+                        self.socket_path
+                    )
+                except OSError as err:
+                    raise SigningError(
+                        f'Could not connect to signing daemon: {err}'
+                    ) from err
+            # Only connections that completed a request are reused. Others,
+            # including those interrupted by cancellation, may still have a
+            # response in flight
+            completed = False
+            try:
+                writer.write(_LENGTH.pack(len(message)) + message)
+                await writer.drain()
+                status, length = _RESPONSE_HEADER.unpack(
+                    await reader.readexactly(_RESPONSE_HEADER.size)
+                )
+                body = await reader.readexactly(length)
+                completed = True
+            except (OSError, asyncio.IncompleteReadError) as err:
+                raise SigningError(f'Signing daemon connection failed: {err}') from err
+            finally:
+                if completed:
+                    self._idle.append((reader, writer))
+                else:
+                    writer.close()
+        return _check_response(status, body)
+
+    def sign_sync(self, message: bytes) -> bytes:
+        with self._sync_lock:
+            try:
+                if not self._sync_socket:
+                    self._sync_socket = socket.socket(socket.AF_UNIX)
+                    self._sync_socket.connect(self.socket_path)
+                self._sync_socket.sendall(_LENGTH.pack(len(message)) + message)
+                status, length = _RESPONSE_HEADER.unpack(
+                    _recv_exactly(self._sync_socket, _RESPONSE_HEADER.size)
+                )
+                body = _recv_exactly(self._sync_socket, length)
+            except OSError as err:
+                if self._sync_socket:
+                    self._sync_socket.close()
+                    self._sync_socket = None
+                raise SigningError(f'Signing daemon connection failed: {err}') from err
+        return _check_response(status, body)
+
+    def close(self):
+        """ Closes all connections to the daemon """
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+        with self._sync_lock:
+            if self._sync_socket:
+                self._sync_socket.close()
+                self._sync_socket = None
+
+
+def _recv_exactly(sock: socket.socket, length: int) -> bytes:
+    chunks = []
+    while length:
+        chunk = sock.recv(length)
+        if not chunk:
+            raise ConnectionResetError('Signing daemon closed the connection')
+        chunks.append(chunk)
+        length -= len(chunk)
+    return b''.join(chunks)
+
+
+def _check_response(status: int, body: bytes) -> bytes:
+    if status != _STATUS_OK:
+        raise SigningError(f'Signing daemon failed: {body.decode("utf-8")}')
+    return body
+
+
+def main():
+    """ Runs a signing daemon for a PEM encoded private key """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('socket_path')
+    parser.add_argument('key_path')
+    args = parser.parse_args()
+
+    with open(args.key_path, 'rb') as inf:
+        private_key = load_pem_private_key(inf.read(), None, default_backend())
+
+    daemon = SigningDaemon(args.socket_path, ThreadPoolSigner(private_key))
+    asyncio.get_event_loop().run_until_complete(daemon.serve_forever())
+
+
+if __name__ == '__main__':
+    main()
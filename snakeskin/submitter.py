@@ -0,0 +1,286 @@
+"""
+    Admission-controlled submission of transactions through a gateway, with
+    bounded queueing and an in-flight limit that adapts to the network
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import List, Optional, Set, Tuple, Union, TYPE_CHECKING
+
+from .errors import BlockchainConnectionError, TrasactionCommitError
+from .protos.common.common_pb2 import Status
+
+if TYPE_CHECKING:
+    # pylint: disable=cyclic-import
+    from .models.gateway import Gateway
+    from .models.transaction import EndorsedTX
+
+
+@dataclass()
+class SubmitterStats:
+    """ Metrics collected by a TransactionSubmitter """
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    # Failures that indicate the network is overloaded
+    overloaded: int = 0
+    # Exponentially weighted moving average of transaction latency, seconds
+    latency: float = 0.0
+
+
+@dataclass()
+class SubmitterOptions: # pylint: disable=too-many-instance-attributes
+    """ The options of a TransactionSubmitter. Stages without a limit are
+        only bounded by the in-flight limit.
+    """
+    max_in_flight: int = 64
+    min_in_flight: int = 1
+    max_queued: int = 1024
+    max_endorsing: Optional[int] = None
+    max_broadcasting: Optional[int] = None
+    max_committing: Optional[int] = None
+    latency_target: Optional[float] = None
+    decrease_ratio: float = 0.5
+    # Seconds to wait for each transaction to commit
+    timeout: int = 30
+
+    def __post_init__(self):
+        if not 1 <= self.min_in_flight <= self.max_in_flight:
+            raise ValueError('Must have 1 <= min_in_flight <= max_in_flight')
+        if not 0 < self.decrease_ratio < 1:
+            raise ValueError('decrease_ratio must be between 0 and 1')
+
+
+_QueueItem = Tuple[str, Optional[List[str]], Optional[dict], 'asyncio.Future[EndorsedTX]']
+
+
+class TransactionSubmitter:
+    """ Invokes chaincode through a gateway from a bounded queue. Submitting
+        waits while the queue is full, so that producers slow down to the
+        rate transactions complete. At most ``limit`` transactions are in
+        flight, and each stage (endorsing, broadcasting and waiting for the
+        commit) may be limited separately.
+
+        The limit adapts with additive increase, multiplicative decrease:
+        while transactions are queued and complete within latency_target, it
+        grows by about one per round trip, up to max_in_flight. When a
+        transaction times out, finds a peer or orderer unavailable, or
+        exceeds latency_target, it is multiplied by decrease_ratio, at most
+        once per round trip, down to min_in_flight. Transactions that fail
+        for other reasons do not change the limit.
+    """
+
+    def __init__(self,
+                 gateway: 'Gateway',
+                 *,
+                 max_in_flight: int = 64,
+                 min_in_flight: int = 1,
+                 max_queued: int = 1024,
+                 max_endorsing: Optional[int] = None,
+                 max_broadcasting: Optional[int] = None,
+                 max_committing: Optional[int] = None,
+                 latency_target: Optional[float] = None,
+                 decrease_ratio: float = 0.5,
+                 timeout: int = 30):
+        # pylint: disable=too-many-arguments
+        self.gateway = gateway
+        self.options = SubmitterOptions(
+            max_in_flight=max_in_flight,
+            min_in_flight=min_in_flight,
+            max_queued=max_queued,
+            max_endorsing=max_endorsing,
+            max_broadcasting=max_broadcasting,
+            max_committing=max_committing,
+            latency_target=latency_target,
+            decrease_ratio=decrease_ratio,
+            timeout=timeout,
+        )
+        self.limit = float(max_in_flight)
+        self.stats = SubmitterStats()
+        self._pipeline: Optional[_Pipeline] = None
+        self._last_decrease = 0.0
+        self._closed = False
+
+    @property
+    def in_flight(self) -> int:
+        """ The number of transactions being processed """
+        return self._pipeline.in_flight if self._pipeline else 0
+
+    @property
+    def queue_depth(self) -> int:
+        """ The number of transactions waiting to be processed """
+        return self._pipeline.queue.qsize() if self._pipeline else 0
+
+    def start(self):
+        """ Starts processing queued transactions """
+        self._started()
+
+    def _started(self) -> '_Pipeline':
+        if self._pipeline is None:
+            # Created once started, so that they belong to the running loop
+            self._pipeline = _Pipeline(self.options)
+            self._pipeline.dispatcher = asyncio.ensure_future(
+                self._dispatch(self._pipeline)
+            )
+        return self._pipeline
+
+    async def submit(self,
+                     fcn: str,
+                     args: Optional[List[str]] = None,
+                     transient_map: Optional[dict] = None
+                    ) -> 'asyncio.Future[EndorsedTX]':
+        """ Queues an invoke, waiting while the queue is full, and returns a
+            future for the committed transaction
+        """
+        if self._closed:
+            raise ValueError('Cannot submit to a closed submitter')
+        pipeline = self._started()
+        future = asyncio.get_event_loop().create_future()
+        await pipeline.queue.put((fcn, args, transient_map, future))
+        self.stats.submitted += 1
+        return future
+
+    async def close(self):
+        """ Stops accepting transactions and waits for queued ones to
+            finish
+        """
+        self._closed = True
+        pipeline = self._pipeline
+        if not (pipeline and pipeline.dispatcher):
+            return
+        await pipeline.queue.join()
+        pipeline.dispatcher.cancel()
+        pipeline.dispatcher = None
+
+    async def __aenter__(self) -> 'TransactionSubmitter':
+        self.start()
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+    async def _dispatch(self, pipeline: '_Pipeline'):
+        while True:
+            # Waits for a slot before taking a transaction, so that waiting
+            # transactions stay in the queue and count towards max_queued.
+            # Only the dispatcher takes slots, so the slot is still free
+            # once a transaction arrives
+            async with pipeline.slots:
+                await pipeline.slots.wait_for(
+                    lambda: pipeline.in_flight < max(1, int(self.limit))
+                )
+            item = await pipeline.queue.get()
+            pipeline.in_flight += 1
+            # Tasks are referenced until done, so they are not collected
+            task = asyncio.ensure_future(self._process(pipeline, *item))
+            pipeline.tasks.add(task)
+            task.add_done_callback(pipeline.tasks.discard)
+
+    async def _process(self,
+                       pipeline: '_Pipeline',
+                       fcn: str,
+                       args: Optional[List[str]],
+                       transient_map: Optional[dict],
+                       future: 'asyncio.Future[EndorsedTX]'):
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        endorsing, broadcasting, committing = pipeline.stages
+        try:
+            async with endorsing:
+                builder = await self.gateway.transact_async(
+                    fcn=fcn, args=args, transient_map=transient_map
+                )
+                endorsed_tx = await builder.propose()
+            async with broadcasting:
+                await builder.submit()
+            async with committing:
+                await builder.wait_for_commit(timeout=self.options.timeout)
+        except Exception as err: # pylint: disable=broad-except
+            self.stats.failed += 1
+            if _is_overload(err):
+                self.stats.overloaded += 1
+                self._decrease(loop.time(), loop.time() - start)
+            if not future.done():
+                future.set_exception(err)
+        else:
+            self.stats.succeeded += 1
+            self._on_success(loop.time(), loop.time() - start)
+            if not future.done():
+                future.set_result(endorsed_tx)
+        finally:
+            async with pipeline.slots:
+                pipeline.in_flight -= 1
+                pipeline.slots.notify()
+            pipeline.queue.task_done()
+
+    def _on_success(self, now: float, latency: float):
+        stats = self.stats
+        stats.latency = latency if stats.succeeded == 1 else (
+            0.8 * stats.latency + 0.2 * latency
+        )
+        options = self.options
+        if options.latency_target and latency > options.latency_target:
+            self._decrease(now, latency)
+        elif self.queue_depth:
+            self.limit = min(options.max_in_flight, self.limit + 1 / self.limit)
+
+    def _decrease(self, now: float, latency: float):
+        # Only decrease once per round trip, as every transaction in flight
+        # when the network became overloaded is likely to fail
+        if now - self._last_decrease < (self.stats.latency or latency):
+            return
+        self._last_decrease = now
+        self.limit = max(
+            self.options.min_in_flight, self.limit * self.options.decrease_ratio
+        )
+
+
+class _Pipeline: # pylint: disable=too-few-public-methods
+    """ The queue and concurrency limits of a started submitter """
+
+    def __init__(self, options: SubmitterOptions):
+        self.queue: 'asyncio.Queue[_QueueItem]' = asyncio.Queue(
+            maxsize=options.max_queued
+        )
+        # Notified when a transaction in flight finishes
+        self.slots = asyncio.Condition()
+        # Endorsing, broadcasting and committing
+        self.stages = (
+            _stage(options.max_endorsing),
+            _stage(options.max_broadcasting),
+            _stage(options.max_committing),
+        )
+        self.in_flight = 0
+        self.tasks: Set[asyncio.Future] = set()
+        self.dispatcher: Optional[asyncio.Future] = None
+
+
+def _stage(limit: Optional[int]) -> Union[asyncio.Semaphore, '_Unlimited']:
+    return asyncio.Semaphore(limit) if limit else _Unlimited()
+
+
+class _Unlimited:
+    """ A stage without a concurrency limit """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        return None
+
+
+# Names of grpc.StatusCode members returned by overloaded peers and orderers
+_OVERLOAD_GRPC_CODES = frozenset({
+    'UNAVAILABLE', 'RESOURCE_EXHAUSTED', 'DEADLINE_EXCEEDED'
+})
+
+
+def _is_overload(error: Exception) -> bool:
+    """ Whether an error suggests the network is overloaded, rather than a
+        problem with the transaction itself
+    """
+    if isinstance(error, BlockchainConnectionError):
+        return getattr(error.code, 'name', None) in _OVERLOAD_GRPC_CODES
+    if isinstance(error, TrasactionCommitError):
+        return error.status == Status.SERVICE_UNAVAILABLE
+    return isinstance(error, (ConnectionError, asyncio.TimeoutError))
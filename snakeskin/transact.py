@@ -30,7 +30,8 @@ from .factories import (
     build_signature_policy_envelope,
     build_cc_deployment_spec,
     build_generated_tx,
-    build_endorsed_tx_envelope,
+    build_generated_tx_async,
+    build_endorsed_tx_envelope_async,
     encode_proto_bytes,
 )
 
@@ -101,6 +102,26 @@ def generate_cc_tx(requestor: User,
     )
 
 
+async def generate_cc_tx_async(requestor: User,
+                               cc_name: str,
+                               channel: Channel,
+                               fcn: str,
+                               args: List[str] = None,
+                               transient_map: dict = None) -> GeneratedTX:
+    """ Generates an invoke transaction, awaiting the proposal signature """
+    full_args = [
+        encode_proto_bytes(a) for a in [fcn] + (args or [])
+    ]
+
+    return await build_generated_tx_async(
+        requestor=requestor,
+        cc_name=cc_name,
+        args=full_args,
+        channel=channel,
+        transient_map=transient_map,
+    )
+
+
 async def propose_tx(peers: List[Peer],
                      generated_tx: GeneratedTX) -> EndorsedTX:
     """ Execute a transaction proposal across all provided peers, raising an
@@ -134,7 +155,7 @@ async def commit_tx(requestor: User,
         the orderer
     """
 
-    envelope = build_endorsed_tx_envelope(endorsed_tx, requestor)
+    envelope = await build_endorsed_tx_envelope_async(endorsed_tx, requestor)
     return await broadcast_to_orderers(
         envelope, orderers, endorsed_tx.tx_id
     )
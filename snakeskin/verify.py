@@ -0,0 +1,285 @@
+"""
+    Verification of delivered blocks
+"""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from hashlib import sha256
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+
+from .protos.common.common_pb2 import (
+    BlockHeader,
+    BlockData,
+    Envelope,
+    Payload,
+    ChannelHeader,
+    SignatureHeader,
+    Metadata,
+    SIGNATURES,
+    LAST_CONFIG,
+)
+from .protos.msp.identities_pb2 import SerializedIdentity
+from .protos.peer.transaction_pb2 import Transaction, ChaincodeActionPayload
+from .models.block import RawBlock
+from .constants import TransactionType
+from .crypto import CryptoSuite
+from .identity import DEFAULT_RESOLVER
+from .errors import BlockVerificationError
+
+
+def _der_length(length: int) -> bytes:
+    if length < 0x80:
+        return bytes([length])
+    encoded = length.to_bytes((length.bit_length() + 7) // 8, 'big')
+    return bytes([0x80 | len(encoded)]) + encoded
+
+
+def _der_tlv(tag: int, value: bytes) -> bytes:
+    return bytes([tag]) + _der_length(len(value)) + value
+
+
+def block_header_bytes(header: BlockHeader) -> bytes:
+    """ The ASN.1 DER encoding of a block header that Fabric hashes to chain
+        blocks together: SEQUENCE { INTEGER number, OCTET STRING
+        previous_hash, OCTET STRING data_hash }
+    """
+    number = header.number
+    number_bytes = number.to_bytes((number.bit_length() + 8) // 8, 'big')
+    return _der_tlv(0x30, (
+        _der_tlv(0x02, number_bytes)
+        + _der_tlv(0x04, header.previous_hash)
+        + _der_tlv(0x04, header.data_hash)
+    ))
+
+
+def block_header_hash(header: BlockHeader) -> bytes:
+    """ The hash of a block header, as referenced by the next block's
+        previous_hash
+    """
+    return sha256(block_header_bytes(header)).digest()
+
+
+def block_data_hash(data: BlockData) -> bytes:
+    """ The hash of a block's data, as stored in its header's data_hash """
+    digest = sha256()
+    for envelope in data.data:
+        digest.update(envelope)
+    return digest.digest()
+
+
+def _compute_hashes(block: RawBlock) -> Tuple[bytes, bytes]:
+    return block_data_hash(block.data), block_header_hash(block.header)
+
+
+class BlockChainVerifier:
+    """ Verifies that consecutive blocks are internally consistent: that each
+        header's data_hash matches its data, and that its previous_hash
+        matches the hash of the prior header. Only the previous header hash
+        is kept as state.
+    """
+
+    def __init__(self, previous_hash: Optional[bytes] = None):
+        self.previous_hash = previous_hash
+
+    def verify(self, block: RawBlock) -> bytes:
+        """ Verifies a block, raising a BlockVerificationError if it is
+            inconsistent, and returns its header hash
+        """
+        return self._check(block, _compute_hashes(block))
+
+    async def verify_stream(self,
+                            blocks: AsyncIterator[RawBlock],
+                            executor: Optional[Executor] = None
+                           ) -> AsyncIterator[RawBlock]:
+        """ Verifies and yields each block in a stream. Hashes are computed
+            on the executor (the loop's default executor if none is
+            provided), while the next block is read from the stream.
+        """
+        loop = asyncio.get_event_loop()
+        iterator = blocks.__aiter__()
+        next_block = asyncio.ensure_future(iterator.__anext__())
+        try:
+            while True:
+                try:
+                    block = await next_block
+                except StopAsyncIteration:
+                    return
+                hashes = loop.run_in_executor(executor, _compute_hashes, block)
+                next_block = asyncio.ensure_future(iterator.__anext__())
+                self._check(block, await hashes)
+                yield block
+        finally:
+            next_block.cancel()
+
+    def _check(self, block: RawBlock, hashes: Tuple[bytes, bytes]) -> bytes:
+        data_hash, header_hash = hashes
+        header = block.header
+        if data_hash != header.data_hash:
+            raise BlockVerificationError(
+                'Block data does not match the header data hash',
+                number=header.number
+            )
+        if self.previous_hash is not None and header.previous_hash != self.previous_hash:
+            raise BlockVerificationError(
+                'Block previous hash does not match the prior block header',
+                number=header.number
+            )
+        self.previous_hash = header_hash
+        return header_hash
+
+
+@dataclass()
+class SignedItem:
+    """ A signature found in a block, along with the identity that should
+        have produced it and the message it signs
+    """
+    block_number: int
+    # One of 'endorsement', 'block_signature' or 'last_config_signature'
+    kind: str
+    msp_id: str
+    cert: bytes
+    message: bytes
+    signature: bytes
+    # The index of the transaction for endorsements
+    tx_index: Optional[int] = None
+
+
+@dataclass()
+class SignatureVerificationResult:
+    """ The outcome of verifying all signatures in a block """
+    block_number: int
+    checked: int = 0
+    invalid: List[SignedItem] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        """ Whether every signature in the block was valid """
+        return not self.invalid
+
+
+def collect_signed_items(block: RawBlock) -> List[SignedItem]:
+    """ Collects the endorsements of every endorser transaction and the
+        orderer signatures in the block metadata
+    """
+    return _collect_endorsements(block) + _collect_metadata_signatures(block)
+
+
+def _collect_endorsements(block: RawBlock) -> List[SignedItem]:
+    number = block.header.number
+    items = []
+    for tx_index, envelope_bytes in enumerate(block.data.data):
+        payload = Payload.FromString(Envelope.FromString(envelope_bytes).payload)
+        channel_header = ChannelHeader.FromString(payload.header.channel_header)
+        if channel_header.type != TransactionType.EndorserTransaction.value:
+            continue
+        for action in Transaction.FromString(payload.data).actions:
+            endorsed_action = ChaincodeActionPayload.FromString(action.payload).action
+            for endorsement in endorsed_action.endorsements:
+                endorser = SerializedIdentity.FromString(endorsement.endorser)
+                items.append(SignedItem(
+                    block_number=number,
+                    kind='endorsement',
+                    msp_id=endorser.mspid,
+                    cert=endorser.id_bytes,
+                    message=(
+                        endorsed_action.proposal_response_payload
+                        + endorsement.endorser
+                    ),
+                    signature=endorsement.signature,
+                    tx_index=tx_index,
+                ))
+    return items
+
+
+def _collect_metadata_signatures(block: RawBlock) -> List[SignedItem]:
+    metadata = block.metadata.metadata
+    header_bytes = block_header_bytes(block.header)
+    items = []
+    for index, kind in ((SIGNATURES, 'block_signature'),
+                        (LAST_CONFIG, 'last_config_signature')):
+        if len(metadata) <= index:
+            continue
+        block_metadata = Metadata.FromString(metadata[index])
+        for metadata_signature in block_metadata.signatures:
+            creator = SerializedIdentity.FromString(
+                SignatureHeader.FromString(
+                    metadata_signature.signature_header
+                ).creator
+            )
+            items.append(SignedItem(
+                block_number=block.header.number,
+                kind=kind,
+                msp_id=creator.mspid,
+                cert=creator.id_bytes,
+                message=(
+                    block_metadata.value
+                    + metadata_signature.signature_header
+                    + header_bytes
+                ),
+                signature=metadata_signature.signature,
+            ))
+    return items
+
+
+def verify_signatures(signed: Sequence[Tuple[str, bytes, bytes, bytes]]) -> List[bool]:
+    """ Verifies (msp_id, certificate, message, signature) tuples, returning
+        whether each is valid. Malformed certificates or signatures are
+        reported as invalid. Public keys are resolved through the process's
+        default identity resolver.
+    """
+    crypto_suite = CryptoSuite.default
+    results = []
+    for msp_id, cert, message, signature in signed:
+        try:
+            public_key = DEFAULT_RESOLVER.resolve_cert(msp_id, cert).public_key
+            results.append(
+                crypto_suite.verify(public_key, message, signature)
+            )
+        except ValueError:
+            results.append(False)
+    return results
+
+
+class SignatureVerifier:
+    """ Verifies the endorsement and orderer signatures of blocks in
+        batches on an executor. A process pool is created if no executor
+        is provided; each worker process caches resolved identities.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, batch_size: int = 256):
+        self._owns_executor = executor is None
+        self.executor = executor or ProcessPoolExecutor()
+        self.batch_size = batch_size
+
+    async def verify_block(self, block: RawBlock) -> SignatureVerificationResult:
+        """ Verifies every signature in the block, reporting the invalid
+            ones
+        """
+        loop = asyncio.get_event_loop()
+        items = collect_signed_items(block)
+        batches = [
+            items[idx:idx + self.batch_size]
+            for idx in range(0, len(items), self.batch_size)
+        ]
+        results = await asyncio.gather(*[
+            loop.run_in_executor(
+                self.executor,
+                verify_signatures,
+                [(i.msp_id, i.cert, i.message, i.signature) for i in batch]
+            ) for batch in batches
+        ])
+
+        result = SignatureVerificationResult(
+            block_number=block.header.number, checked=len(items)
+        )
+        for batch, batch_results in zip(batches, results):
+            result.invalid.extend(
+                item for item, valid in zip(batch, batch_results) if not valid
+            )
+        return result
+
+    def close(self):
+        """ Shuts down the executor if it was created by this verifier """
+        if self._owns_executor:
+            self.executor.shutdown()
@@ -0,0 +1,129 @@
+"""
+    Tests for the channel_config module
+"""
+
+import pytest
+
+from snakeskin.channel_config import ChannelConfigView, last_config_index
+from snakeskin.models.block import RawBlock
+from snakeskin.protos.common.common_pb2 import (
+    BlockData,
+    BlockHeader,
+    BlockMetadata,
+    Envelope,
+    LastConfig,
+    Metadata,
+    Payload,
+)
+from snakeskin.protos.common.configtx_pb2 import ConfigEnvelope
+from snakeskin.protos.common.configuration_pb2 import OrdererAddresses
+
+from .conftest import build_rwset_envelope
+
+
+def _config_block(genesis_block, number, addresses):
+    """ Builds a config block from the genesis config, with new orderer
+        addresses
+    """
+    envelope = Envelope.FromString(genesis_block.data.data[0])
+    payload = Payload.FromString(envelope.payload)
+    config_env = ConfigEnvelope.FromString(payload.data)
+    config_env.config.sequence = number
+    config_env.config.channel_group.values['OrdererAddresses'].value = (
+        OrdererAddresses(addresses=addresses).SerializeToString()
+    )
+    payload.data = config_env.SerializeToString()
+    envelope.payload = payload.SerializeToString()
+    return _block(number, [envelope.SerializeToString()], number)
+
+
+def _block(number, envelopes, last_config):
+    return RawBlock(
+        header=BlockHeader(number=number),
+        data=BlockData(data=envelopes),
+        metadata=BlockMetadata(metadata=[
+            b'',
+            Metadata(
+                value=LastConfig(index=last_config).SerializeToString()
+            ).SerializeToString(),
+            b'',
+        ])
+    )
+
+
+def test_apply_genesis_block(genesis_block):
+    """ Tests the view is loaded from a config block """
+    view = ChannelConfigView()
+    assert not view.loaded
+    assert view.apply_block(genesis_block)
+
+    assert view.loaded
+    assert view.block_number == 0
+    assert view.orderer_addresses == ['orderer:7050']
+    assert set(view.application_orgs) == {'Org1MSP', 'Org2MSP'}
+    assert set(view.orderer_orgs) == {'OrdererOrgMSP'}
+    assert view.anchor_peers('Org1MSP') == [('peer.org1.com', 7051)]
+    assert view.organization('Org2MSP').name == 'Org2'
+    assert view.root_certs('OrdererOrgMSP')[0].startswith(b'-----BEGIN')
+    with pytest.raises(KeyError):
+        view.organization('Org3MSP')
+
+
+def test_apply_blocks(genesis_block):
+    """ Tests only newer config blocks update the view """
+    view = ChannelConfigView()
+    view.apply_block(genesis_block)
+    orgs = view.application_orgs
+
+    assert not view.apply_block(_block(1, [build_rwset_envelope('mycc')], 0))
+    assert view.application_orgs is orgs
+
+    config_block = _config_block(genesis_block, 2, ['orderer2:7050'])
+    assert last_config_index(config_block) == 2
+    assert view.apply_block(config_block)
+    assert view.orderer_addresses == ['orderer2:7050']
+    assert view.sequence == 2
+
+    assert not view.apply_block(_config_block(genesis_block, 2, ['stale:7050']))
+    assert view.orderer_addresses == ['orderer2:7050']
+
+
+@pytest.mark.asyncio
+async def test_load_and_watch(genesis_block):
+    """ Tests the latest config is loaded through LAST_CONFIG, and later
+        config blocks in the stream are applied, with each watch resuming
+        after the newest block seen
+    """
+    blocks = [
+        genesis_block,
+        _config_block(genesis_block, 1, ['orderer1:7050']),
+        _block(2, [build_rwset_envelope('mycc')], 1),
+        _config_block(genesis_block, 3, ['orderer3:7050']),
+    ]
+    requested = []
+    starts = []
+
+    class _Events:
+        async def get_block(self, number=None):
+            requested.append(number)
+            return blocks[2 if number is None else number]
+
+        async def stream_blocks(self, start, stop):
+            starts.append(start)
+            for block in blocks[start:stop + 1]:
+                yield block
+
+    view = ChannelConfigView()
+    assert await view.load(_Events()) == 2
+    assert requested == [None, 1]
+    assert view.orderer_addresses == ['orderer1:7050']
+
+    await view.watch(_Events(), stop=3)
+    assert view.orderer_addresses == ['orderer3:7050']
+    assert view.block_number == 3
+
+    blocks.append(_block(4, [build_rwset_envelope('mycc')], 3))
+    await view.watch(_Events(), stop=4)
+    assert starts == [3, 4]
+    assert view.last_block_number == 4
+    assert view.block_number == 3
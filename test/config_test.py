@@ -2,9 +2,15 @@
     Tests for the config module
 """
 
+import json
+import os
+import stat
+from unittest.mock import Mock, patch
+
 import pytest
+import yaml
 
-from snakeskin.config import BlockchainConfig, GatewayConfig
+from snakeskin.config import BlockchainConfig, GatewayConfig, SNAPSHOT_MAGIC
 from snakeskin.models import Peer, Orderer, ChaincodeSpec, Channel
 from snakeskin.models.gateway import Gateway
 
@@ -74,3 +80,158 @@ def test_get_gateway(org1_user):
         channel=Channel(name='123'),
         requestor=org1_user
     )
+
+
+def test_snapshot_roundtrip(tmp_path):
+    """ Tests compiled snapshots restore the same config """
+    snapshot_path = str(tmp_path / 'network-config.snapshot')
+    config = BlockchainConfig.compile(
+        'network-config/network-config.yaml', snapshot_path
+    )
+
+    with patch('yaml.load') as yaml_load, \
+            patch('dacite.from_dict') as from_dict, \
+            patch('aiogrpc.secure_channel') as secure_channel, \
+            patch('builtins.open', wraps=open) as open_mock:
+        restored = BlockchainConfig.from_snapshot(snapshot_path)
+    yaml_load.assert_not_called()
+    from_dict.assert_not_called()
+    secure_channel.assert_not_called()
+    # Only the snapshot itself is read
+    open_mock.assert_called_once_with(snapshot_path, 'rb')
+
+    assert restored == config
+    assert restored.get_peer('org1_peer').tls_ca_cert
+    assert restored.get_user('org1_admin').private_key is (
+        config.get_user('org1_admin').private_key
+    )
+    assert restored.get_gateway('org1_gw') == config.get_gateway('org1_gw')
+
+
+def test_snapshot_bad_magic():
+    """ Tests only snapshots can be restored """
+    with pytest.raises(ValueError):
+        BlockchainConfig.from_snapshot('network-config/genesis.block')
+
+
+def test_snapshot_private(tmp_path):
+    """ Tests snapshots, which include private keys, are only readable by
+        their owner, even when overwriting an existing file
+    """
+    snapshot_path = tmp_path / 'network-config.snapshot'
+    snapshot_path.write_bytes(b'')
+    os.chmod(snapshot_path, 0o644)
+    BlockchainConfig.compile('network-config/network-config.yaml', str(snapshot_path))
+    assert stat.S_IMODE(os.stat(snapshot_path).st_mode) == 0o600
+
+
+def test_snapshot_python_version(tmp_path):
+    """ Tests snapshots compiled by another Python version are rejected """
+    snapshot_path = tmp_path / 'network-config.snapshot'
+    BlockchainConfig.compile('network-config/network-config.yaml', str(snapshot_path))
+    data = bytearray(snapshot_path.read_bytes())
+    data[len(SNAPSHOT_MAGIC) + 1] += 1
+    snapshot_path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match='compiled again'):
+        BlockchainConfig.from_snapshot(str(snapshot_path))
+
+
+def test_named_entities_kept(org1_user):
+    """ Tests entities that already have names are not rebuilt """
+    peer = Peer(endpoint='123', name='mypeer')
+    config = BlockchainConfig(peers={'abc': peer}, users={'def': org1_user})
+    assert config.get_peer('abc') is peer
+    assert config.get_user('def') is org1_user
+
+
+def _write_config(tmp_path, update):
+    with open('network-config/network-config.yaml') as inf:
+        values = yaml.load(inf, Loader=yaml.SafeLoader)
+    update(values)
+    path = str(tmp_path / 'network-config.json')
+    with open(path, 'w') as outf:
+        json.dump(values, outf)
+    return path
+
+
+def test_reload(tmp_path):
+    """ Tests BlockchainConfig().reload keeps unchanged entities and updates
+        live gateways
+    """
+    config = BlockchainConfig.from_file('network-config/network-config.yaml')
+    org1_peer = config.get_peer('org1_peer')
+    org2_peer = config.get_peer('org2_peer')
+    user = config.get_user('org1_admin')
+    gateway = config.get_gateway('org1_gw')
+    channel = org2_peer.__dict__['_channel'] = Mock()
+
+    def _update(values):
+        values['peers']['org2_peer']['endpoint'] = 'localhost:9999'
+        values['peers']['org3_peer'] = {'endpoint': 'localhost:7351'}
+        del values['users']['org2_admin']
+        values['gateways'] = {
+            name: gateway for name, gateway in values['gateways'].items()
+            if gateway['requestor'] != 'org2_admin'
+        }
+        values['gateways']['org1_gw']['endorsing_peers'].append('org3_peer')
+    diff = config.reload(_write_config(tmp_path, _update))
+
+    assert diff.added == {'peers': ['org3_peer']}
+    assert diff.changed == {'peers': ['org2_peer'], 'gateways': ['org1_gw']}
+    assert diff.removed['users'] == ['org2_admin']
+    assert config.get_peer('org1_peer') is org1_peer
+    assert config.get_user('org1_admin') is user
+    assert config.get_peer('org2_peer').endpoint == 'localhost:9999'
+    assert [peer.name for peer in gateway.endorsing_peers] == [
+        'org1_peer', 'org2_peer', 'org3_peer'
+    ]
+    assert gateway.endorsing_peers[0] is org1_peer
+    assert gateway.endorsing_peers[1].endpoint == 'localhost:9999'
+    channel.close.assert_called_once_with()
+    assert '_channel' not in org2_peer.__dict__
+
+
+def test_reload_keeps_used_connections(tmp_path):
+    """ Tests replaced peers are not closed while a gateway whose config was
+        removed still uses them, and dead gateways are pruned
+    """
+    config = BlockchainConfig.from_file('network-config/network-config.yaml')
+    org2_peer = config.get_peer('org2_peer')
+    channel = org2_peer.__dict__['_channel'] = Mock()
+    gateway = config.get_gateway('org2_gw')
+    for _ in range(3):
+        config.get_gateway('org1_gw')
+    assert len(config._live_gateways) == 2 # pylint: disable=protected-access
+
+    def _update(values):
+        values['peers']['org2_peer']['endpoint'] = 'localhost:9999'
+        del values['gateways']['org2_gw']
+    config.reload(_write_config(tmp_path, _update))
+    assert gateway.endorsing_peers[1] is org2_peer
+    channel.close.assert_not_called()
+
+
+def test_reload_unchanged(tmp_path):
+    """ Tests reloading an identical snapshot changes nothing """
+    snapshot_path = str(tmp_path / 'network-config.snapshot')
+    BlockchainConfig.compile('network-config/network-config.yaml', snapshot_path)
+    config = BlockchainConfig.from_file('network-config/network-config.yaml')
+    peers = dict(config.peers)
+    assert config.reload(snapshot_path).empty
+    assert all(config.peers[name] is peer for name, peer in peers.items())
+
+
+def test_reload_invalid(tmp_path):
+    """ Tests an invalid reload leaves the config and gateways unchanged """
+    config = BlockchainConfig.from_file('network-config/network-config.yaml')
+    gateway = config.get_gateway('org1_gw')
+    peers = gateway.endorsing_peers
+
+    def _update(values):
+        values['peers']['org2_peer']['endpoint'] = 'localhost:9999'
+        values['gateways']['org1_gw']['endorsing_peers'].append('missing')
+    with pytest.raises(KeyError):
+        config.reload(_write_config(tmp_path, _update))
+    assert config.get_peer('org2_peer').endpoint == 'localhost:7251'
+    assert gateway.endorsing_peers is peers
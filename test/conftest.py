@@ -8,8 +8,31 @@ from snakeskin.protos.common.common_pb2 import (
     BlockHeader,
     BlockData,
     BlockMetadata,
-    Block
+    Block,
+    Envelope,
+    Payload,
+    Header,
+    ChannelHeader,
 )
+from snakeskin.protos.ledger.rwset.rwset_pb2 import (
+    TxReadWriteSet,
+    NsReadWriteSet,
+)
+from snakeskin.protos.ledger.rwset.kvrwset.kv_rwset_pb2 import (
+    KVRWSet,
+    KVRead,
+    KVWrite,
+    Version,
+)
+from snakeskin.protos.peer.proposal_pb2 import ChaincodeAction
+from snakeskin.protos.peer.proposal_response_pb2 import ProposalResponsePayload
+from snakeskin.protos.peer.transaction_pb2 import (
+    Transaction,
+    TransactionAction,
+    ChaincodeActionPayload,
+    ChaincodeEndorsedAction,
+)
+from snakeskin.constants import TransactionType
 from snakeskin.models.block import RawBlock
 from snakeskin.models.transaction import DecodedTX
 from snakeskin.models import User
@@ -31,6 +54,63 @@ def raw_block():
         )
     )
 
+def build_rwset_envelope(namespace, writes=None, reads=None, tx_id=''):
+    """ Builds a serialized endorser transaction envelope with a single
+        namespace read/write set. ``writes`` is a list of
+        (key, value, is_delete) and ``reads`` a list of (key, version) where
+        version is a (block_num, tx_num) tuple or None
+    """
+    kv_rwset = KVRWSet(
+        writes=[
+            KVWrite(key=key, value=value, is_delete=is_delete)
+            for key, value, is_delete in writes or []
+        ],
+        reads=[
+            KVRead(key=key, version=Version(
+                block_num=version[0], tx_num=version[1]
+            ) if version else None)
+            for key, version in reads or []
+        ]
+    )
+    tx_rwset = TxReadWriteSet(ns_rwset=[
+        NsReadWriteSet(namespace=namespace, rwset=kv_rwset.SerializeToString())
+    ])
+    response_payload = ProposalResponsePayload(
+        extension=ChaincodeAction(
+            results=tx_rwset.SerializeToString()
+        ).SerializeToString()
+    )
+    transaction = Transaction(actions=[
+        TransactionAction(payload=ChaincodeActionPayload(
+            action=ChaincodeEndorsedAction(
+                proposal_response_payload=response_payload.SerializeToString()
+            )
+        ).SerializeToString())
+    ])
+    payload = Payload(
+        header=Header(channel_header=ChannelHeader(
+            type=TransactionType.EndorserTransaction.value,
+            tx_id=tx_id,
+        ).SerializeToString()),
+        data=transaction.SerializeToString()
+    )
+    return Envelope(payload=payload.SerializeToString()).SerializeToString()
+
+
+@pytest.fixture()
+def rwset_block_factory():
+    """ A factory for blocks of endorser transactions with read/write sets """
+    def _build(number, envelopes, validation_codes=b''):
+        return RawBlock(
+            header=BlockHeader(number=number),
+            data=BlockData(data=envelopes),
+            metadata=BlockMetadata(
+                metadata=[b'', b'', validation_codes]
+            )
+        )
+    yield _build
+
+
 @pytest.fixture()
 def genesis_block():
     """ A genesis block """
@@ -2,8 +2,15 @@
     Tests for the config module
 """
 
+import io
+import os
 from unittest.mock import patch
-from snakeskin.crypto import CryptoSuite
+
+import pytest
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from snakeskin.crypto import CryptoSuite, encrypt_stream, decrypt_stream
 
 @patch.object(CryptoSuite, 'default')
 def test_set_default_crypto(_):
@@ -11,3 +18,67 @@ def test_set_default_crypto(_):
     csuite = object()
     CryptoSuite.set_default(csuite)
     assert CryptoSuite.default is csuite
+
+
+@pytest.fixture(name='encryption_key')
+def _build_encryption_key():
+    yield ec.generate_private_key(ec.SECP256R1(), default_backend())
+
+
+@pytest.mark.parametrize('size', [0, 1, 1000, 200 * 1024 + 3])
+def test_stream_roundtrip(encryption_key, size):
+    """ Tests encrypt_stream and decrypt_stream round trip """
+    plain_text = os.urandom(size)
+    encrypted = io.BytesIO()
+    written = encrypt_stream(
+        encryption_key.public_key(), io.BytesIO(plain_text), encrypted
+    )
+    assert written == len(encrypted.getvalue()) == 65 + 16 + size + 32
+
+    decrypted = io.BytesIO()
+    encrypted.seek(0)
+    assert decrypt_stream(encryption_key, encrypted, decrypted) == size
+    assert decrypted.getvalue() == plain_text
+
+
+def test_stream_chunk_boundaries(encryption_key):
+    """ Tests streams decrypt regardless of how input is chunked """
+    plain_text = os.urandom(5000)
+    encrypted = io.BytesIO()
+    encrypt_stream(
+        encryption_key.public_key(),
+        (plain_text[idx:idx + 333] for idx in range(0, 5000, 333)),
+        encrypted,
+        chunk_size=17,
+    )
+    cipher_text = encrypted.getvalue()
+    for chunk_size in (1, 7, 64, 113, len(cipher_text)):
+        decrypted = io.BytesIO()
+        decrypt_stream(
+            encryption_key,
+            (cipher_text[idx:idx + chunk_size]
+             for idx in range(0, len(cipher_text), chunk_size)),
+            decrypted,
+        )
+        assert decrypted.getvalue() == plain_text
+
+
+def test_stream_tampered(encryption_key):
+    """ Tests decrypt_stream rejects tampered and truncated cipher text """
+    encrypted = io.BytesIO()
+    encrypt_stream(encryption_key.public_key(), [b'secret' * 100], encrypted)
+    cipher_text = bytearray(encrypted.getvalue())
+    cipher_text[100] ^= 1
+
+    with pytest.raises(ValueError, match='Hmac'):
+        decrypt_stream(encryption_key, io.BytesIO(cipher_text), io.BytesIO())
+    with pytest.raises(ValueError, match='length'):
+        decrypt_stream(encryption_key, [bytes(cipher_text[:100])], io.BytesIO())
+    with pytest.raises(ValueError, match='length'):
+        decrypt_stream(encryption_key, [bytes(cipher_text[:50])], io.BytesIO())
+    with pytest.raises(ValueError, match='security level'):
+        decrypt_stream(
+            ec.generate_private_key(ec.SECP384R1(), default_backend()),
+            [bytes(cipher_text)],
+            io.BytesIO(),
+        )
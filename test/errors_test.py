@@ -16,6 +16,7 @@ from snakeskin.errors import (
     TrasactionCommitError,
     TransactionProposalError,
     BlockRetrievalError,
+    BlockVerificationError,
     TransactionError,
     BlockchainConnectionError,
     TransactionValidationError,
@@ -103,6 +104,13 @@ def test_block_retreival_error_msg():
     assert error_msg == '123: status (403)'
 
 
+def test_block_verification_error_msg():
+    """ Tests for BlockVerificationError message """
+    error = BlockVerificationError('Bad hash', number=5)
+    assert str(error) == 'Bad hash (block 5)'
+    assert error.number == 5
+
+
 def test_bc_conn_err_msg():
     """ Tests for BlockchainConnectionError message """
     rpc_err_call = Mock()
@@ -0,0 +1,250 @@
+"""
+    Tests for the events module
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from google.protobuf.timestamp_pb2 import Timestamp
+from snakeskin.protos.common.common_pb2 import (
+    Block, BlockHeader, BlockData, Envelope, Payload, Header, ChannelHeader
+)
+from snakeskin.protos.peer.events_pb2 import DeliverResponse
+from snakeskin.events import (
+    BlockPrefetcher, PeerChannelMultiplexer, PeerEvents, PeerFilteredEvents
+)
+from snakeskin.models import Channel
+from snakeskin.models.block import RawBlock, FilteredBlock
+
+
+def _response(number):
+    return DeliverResponse(block=Block(header=BlockHeader(number=number)))
+
+
+async def _stream(count):
+    for number in range(count):
+        yield _response(number)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_yields_in_order():
+    """ Tests BlockPrefetcher().prefetch delivers every block in order """
+    prefetcher = BlockPrefetcher(max_blocks=2)
+    numbers = [
+        block.header.number
+        async for block in prefetcher.prefetch(_stream(5), lambda r: r.block)
+    ]
+    assert numbers == [0, 1, 2, 3, 4]
+    assert prefetcher.stats.blocks_read == 5
+    assert prefetcher.stats.queue_depth == 0
+    assert prefetcher.stats.queued_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_prefetch_bounded():
+    """ Tests BlockPrefetcher() never buffers more than max_blocks """
+    prefetcher = BlockPrefetcher(max_blocks=3)
+    async for _ in prefetcher.prefetch(_stream(10), lambda r: r.block):
+        await asyncio.sleep(0.001)
+        assert prefetcher.stats.queue_depth <= 3
+    assert prefetcher.stats.max_queue_depth == 3
+    assert prefetcher.stats.reader_stall_time > 0
+
+
+@pytest.mark.asyncio
+async def test_prefetch_bounded_bytes():
+    """ Tests BlockPrefetcher() honors max_bytes """
+    size = _response(1).ByteSize()
+    prefetcher = BlockPrefetcher(max_blocks=10, max_bytes=size * 2)
+    async for _ in prefetcher.prefetch(_stream(10), lambda r: r.block):
+        await asyncio.sleep(0.001)
+        assert prefetcher.stats.queued_bytes <= size * 2
+
+
+@pytest.mark.asyncio
+async def test_prefetch_raises_errors():
+    """ Tests BlockPrefetcher() re-raises reader errors to the consumer """
+    async def _failing():
+        yield _response(0)
+        raise ConnectionError('lost')
+
+    prefetcher = BlockPrefetcher()
+    blocks = []
+    with pytest.raises(ConnectionError):
+        async for block in prefetcher.prefetch(_failing(), lambda r: r.block):
+            blocks.append(block)
+    assert len(blocks) == 1
+
+
+def test_prefetch_invalid_size():
+    """ Tests BlockPrefetcher() requires room for a block """
+    with pytest.raises(ValueError):
+        BlockPrefetcher(max_blocks=0)
+
+
+def _fake_hub_stream(hub, count, fail_at=None):
+    starts = []
+
+    async def _stream(start=None):
+        starts.append(start)
+        for number in range(start or 0, count):
+            if number == fail_at:
+                raise ConnectionError('lost')
+            yield RawBlock(header=BlockHeader(number=number), data=None, metadata=None)
+            await asyncio.sleep(0)
+    hub.stream_blocks = _stream
+    return starts
+
+
+@pytest.mark.asyncio
+async def test_multiplexer_merges_channels(org1_user):
+    """ Tests PeerChannelMultiplexer().stream_blocks merges all channels """
+    mux = PeerChannelMultiplexer(
+        requestor=org1_user,
+        peer=Mock(),
+        channels=[Channel(name='chan1'), Channel(name='chan2')],
+    )
+    for hub in mux._hubs.values(): # pylint: disable=protected-access
+        assert isinstance(hub, PeerEvents)
+        _fake_hub_stream(hub, 3)
+
+    received = []
+    mux.start(start=0)
+    stream = mux.stream_blocks()
+    async for channel, block in stream:
+        received.append((channel.name, block.number))
+        if len(received) == 6:
+            break
+    await stream.aclose()
+
+    assert sorted(received) == [
+        ('chan1', 0), ('chan1', 1), ('chan1', 2),
+        ('chan2', 0), ('chan2', 1), ('chan2', 2),
+    ]
+    assert not mux._tasks # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_multiplexer_refresh_resumes(org1_user):
+    """ Tests PeerChannelMultiplexer().refresh resumes after the last block """
+    channel = Channel(name='chan1')
+    mux = PeerChannelMultiplexer(
+        requestor=org1_user, peer=Mock(), channels=[channel], filtered=True
+    )
+    hub = mux._hubs['chan1'] # pylint: disable=protected-access
+    assert isinstance(hub, PeerFilteredEvents)
+    starts = _fake_hub_stream(hub, 5)
+
+    # Nothing is streamed until the multiplexer starts
+    mux.refresh()
+    assert not mux._tasks # pylint: disable=protected-access
+
+    numbers = []
+    mux.start(start=0)
+    async for _, block in mux.stream_blocks():
+        numbers.append(block.number)
+        if block.number == 1:
+            mux.refresh(channel)
+        if block.number == 4:
+            break
+
+    assert numbers == [0, 1, 2, 3, 4]
+    assert starts == [0, 2]
+
+
+@pytest.mark.asyncio
+async def test_multiplexer_raises_errors(org1_user):
+    """ Tests PeerChannelMultiplexer().stream_blocks raises stream errors """
+    mux = PeerChannelMultiplexer(
+        requestor=org1_user, peer=Mock(), channels=[Channel(name='chan1')]
+    )
+    _fake_hub_stream(mux._hubs['chan1'], 5, fail_at=1) # pylint: disable=protected-access
+
+    with pytest.raises(ConnectionError):
+        async for _ in mux.stream_blocks():
+            pass
+
+
+EPOCH = datetime(2026, 1, 1)
+
+
+def _timed_block(number):
+    timestamp = Timestamp()
+    timestamp.FromDatetime(EPOCH + timedelta(minutes=10 * number))
+    payload = Payload(header=Header(
+        channel_header=ChannelHeader(timestamp=timestamp).SerializeToString()
+    ))
+    return RawBlock(
+        header=BlockHeader(number=number),
+        data=BlockData(data=[
+            Envelope(payload=payload.SerializeToString()).SerializeToString()
+        ]),
+        metadata=None
+    )
+
+
+@pytest.fixture(name='timed_events')
+def _build_timed_events(org1_user):
+    events = PeerEvents(
+        requestor=org1_user, channel=Channel(name='chan1'), peer=Mock()
+    )
+    events.probes = []
+    events.open_streams = 0
+
+    async def _stream(start=None, stop=None, behavior=None): # pylint: disable=unused-argument
+        number = 99 if start is None else start
+        events.probes.append(number)
+        events.open_streams += 1
+        try:
+            yield _timed_block(number)
+        finally:
+            events.open_streams -= 1
+    events.stream_blocks = _stream
+    yield events
+
+
+@pytest.mark.asyncio
+async def test_find_block_by_time(timed_events):
+    """ Tests PeerEvents().find_block_by_time binary searches blocks """
+    assert await timed_events.find_block_by_time(
+        EPOCH + timedelta(minutes=425)
+    ) == 43
+    assert len(timed_events.probes) <= 9
+
+    # Each stream is closed before the block is returned
+    assert (await timed_events.get_block(3)).header.number == 3
+    assert timed_events.open_streams == 0
+
+    assert await timed_events.find_block_by_time(EPOCH) == 0
+    assert await timed_events.find_block_by_time(
+        (EPOCH + timedelta(minutes=100)).replace(tzinfo=timezone.utc)
+    ) == 10
+    assert await timed_events.find_block_by_time(
+        EPOCH + timedelta(days=1)
+    ) is None
+    assert await timed_events.find_block_by_time(
+        EPOCH + timedelta(minutes=15), newest=5
+    ) == 2
+
+
+@pytest.mark.asyncio
+async def test_find_block_by_time_filtered(org1_user):
+    """ Tests PeerFilteredEvents() cannot seek by time, without reading
+        any blocks
+    """
+    events = PeerFilteredEvents(
+        requestor=org1_user, channel=Channel(name='chan1'), peer=Mock()
+    )
+    probes = []
+
+    async def _stream(**_):
+        probes.append(None)
+        yield FilteredBlock(channel_id='chan1', number=0, transactions=[])
+    events.stream_blocks = _stream
+
+    with pytest.raises(NotImplementedError):
+        await events.find_block_by_time(EPOCH)
+    assert not probes
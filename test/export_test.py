@@ -0,0 +1,100 @@
+"""
+    Tests for the export module
+"""
+
+import io
+import json
+from dataclasses import dataclass
+from hashlib import sha256
+
+import pytest
+
+from snakeskin.protos.common.common_pb2 import BlockHeader
+from snakeskin.models._decoded import DecodedBlock, _DecodedBlockData
+from snakeskin.export import BlockJSONWriter
+
+
+def test_write_block(genesis_block):
+    """ Tests BlockJSONWriter().write_block writes a single JSON line """
+    out = io.StringIO()
+    BlockJSONWriter(out).write_block(genesis_block)
+    line = out.getvalue()
+
+    assert line.endswith('\n')
+    assert line.count('\n') == 1
+    block = json.loads(line)
+    assert block['header']['number'] == 0
+
+    header = block['data']['data'][0]['payload']['header']
+    assert header['channel_header']['type'] == 1
+    assert header['channel_header']['channel_id'] == 'genesis-channel'
+    assert header['channel_header']['timestamp'] == '2019-08-29T01:25:15Z'
+    assert set(header['signature_header']['creator']) == {'mspid', 'cert_sha256'}
+
+
+def test_write_block_identities(channel_tx):
+    """ Tests identities are summarized by MSP id and certificate hash """
+    out = io.StringIO()
+    BlockJSONWriter(out).write_block(_single_tx_block(channel_tx))
+    tx_json = json.loads(out.getvalue())['data']['data'][0]
+    creator = channel_tx.payload.header.signature_header.creator
+
+    assert tx_json['payload']['header']['signature_header']['creator'] == {
+        'mspid': creator.mspid,
+        'cert_sha256': sha256(creator.id_bytes).hexdigest(),
+    }
+    assert '-----BEGIN' not in out.getvalue()
+
+
+def test_write_block_hex(genesis_block):
+    """ Tests bytes can be written as hex """
+    out = io.StringIO()
+    BlockJSONWriter(out, bytes_encoding='hex').write_block(genesis_block)
+    block = json.loads(out.getvalue())
+    assert block['header']['data_hash'] == genesis_block.header.data_hash.hex()
+
+
+def test_write_non_finite_floats():
+    """ Tests non-finite floats are written as strings, keeping lines valid
+        JSON
+    """
+    @dataclass
+    class _Values:
+        values: list
+
+    out = io.StringIO()
+    BlockJSONWriter(out).write_block(
+        _Values([1.5, float('nan'), float('inf'), float('-inf')])
+    )
+    assert json.loads(
+        out.getvalue(), parse_constant=pytest.fail
+    ) == {'values': [1.5, 'NaN', 'Infinity', '-Infinity']}
+
+
+def test_bad_bytes_encoding():
+    """ Tests unsupported bytes encodings """
+    with pytest.raises(ValueError):
+        BlockJSONWriter(io.StringIO(), bytes_encoding='base32')
+
+
+@pytest.mark.asyncio
+async def test_write_stream(genesis_block):
+    """ Tests BlockJSONWriter().write_stream writes JSON lines """
+    async def _blocks():
+        for _ in range(3):
+            yield genesis_block
+
+    out = io.StringIO()
+    assert await BlockJSONWriter(out).write_stream(_blocks()) == 3
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 3
+    assert all(json.loads(line) for line in lines)
+
+
+def _single_tx_block(decoded_tx):
+    """ Wraps a decoded transaction in a minimal decoded block """
+    return DecodedBlock(
+        header=BlockHeader(number=1),
+        data=_DecodedBlockData(data=[decoded_tx]),
+        metadata=None,
+    )
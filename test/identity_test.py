@@ -0,0 +1,99 @@
+"""
+    Tests for the identity module
+"""
+
+from hashlib import sha256
+
+import pytest
+
+from snakeskin.protos.common.common_pb2 import (
+    Envelope, Payload, Header, ChannelHeader, SignatureHeader
+)
+from snakeskin.protos.msp.identities_pb2 import SerializedIdentity
+from snakeskin.protos.peer.proposal_response_pb2 import Endorsement
+from snakeskin.protos.peer.transaction_pb2 import (
+    Transaction,
+    TransactionAction,
+    ChaincodeActionPayload,
+    ChaincodeEndorsedAction,
+)
+from snakeskin.constants import TransactionType
+from snakeskin.models.transaction import DecodedTX
+from snakeskin.identity import IdentityResolver, resolve_identity
+
+
+def test_resolve(org1_user):
+    """ Tests IdentityResolver().resolve parses certificate attributes """
+    resolver = IdentityResolver()
+    identity = resolver.resolve(
+        SerializedIdentity(mspid='Org1MSP', id_bytes=org1_user.cert)
+    )
+    assert identity.msp_id == 'Org1MSP'
+    assert identity.cert_sha256 == sha256(org1_user.cert).digest()
+    assert identity.common_name == 'Admin@org1.com'
+    assert identity.expiry.tzinfo is not None
+    assert identity.public_key.public_numbers() == (
+        org1_user.private_key.public_key().public_numbers()
+    )
+    assert not hasattr(identity, '__dict__')
+
+
+def test_resolve_cached(org1_user):
+    """ Tests IdentityResolver() returns cached identities """
+    resolver = IdentityResolver()
+    first = resolver.resolve_cert('Org1MSP', org1_user.cert)
+    assert resolver.resolve_cert('Org1MSP', org1_user.cert) is first
+    assert resolver.resolve_cert('OtherMSP', org1_user.cert) is not first
+    assert (resolver.hits, resolver.misses) == (1, 2)
+
+
+def test_resolve_evicts(org1_user):
+    """ Tests IdentityResolver() evicts the least recently used identity """
+    resolver = IdentityResolver(max_size=2)
+    first = resolver.resolve_cert('A', org1_user.cert)
+    resolver.resolve_cert('B', org1_user.cert)
+    assert resolver.resolve_cert('A', org1_user.cert) is first
+    resolver.resolve_cert('C', org1_user.cert)
+    assert len(resolver) == 2
+    assert resolver.resolve_cert('A', org1_user.cert) is first
+    assert resolver.misses == 3
+
+
+def test_resolve_invalid():
+    """ Tests IdentityResolver() rejects invalid certificates and sizes """
+    with pytest.raises(ValueError):
+        IdentityResolver().resolve_cert('Org1MSP', b'not a cert')
+    with pytest.raises(ValueError):
+        IdentityResolver(max_size=0)
+
+
+def test_decoded_identities(org1_user):
+    """ Tests decoded transactions expose resolved identities """
+    serialized = SerializedIdentity(
+        mspid='Org1MSP', id_bytes=org1_user.cert
+    ).SerializeToString()
+    transaction = Transaction(actions=[TransactionAction(
+        payload=ChaincodeActionPayload(action=ChaincodeEndorsedAction(
+            endorsements=[Endorsement(endorser=serialized, signature=b'sig')]
+        )).SerializeToString()
+    )])
+    payload = Payload(
+        header=Header(
+            channel_header=ChannelHeader(
+                type=TransactionType.EndorserTransaction.value
+            ).SerializeToString(),
+            signature_header=SignatureHeader(
+                creator=serialized
+            ).SerializeToString(),
+        ),
+        data=transaction.SerializeToString()
+    )
+    decoded = DecodedTX.decode(
+        Envelope(payload=payload.SerializeToString()).SerializeToString()
+    )
+
+    creator = decoded.payload.header.signature_header.creator
+    assert decoded.creator_identity is resolve_identity(creator)
+    assert decoded.creator_identity.common_name == 'Admin@org1.com'
+    endorsement = decoded.payload.data.actions[0].payload.action.endorsements[0]
+    assert endorsement.endorser_identity is decoded.creator_identity
@@ -23,6 +23,8 @@ from snakeskin.protos.peer.transaction_pb2 import (
 
 from snakeskin.models.block import RawBlock, FilteredBlock
 
+from .conftest import build_rwset_envelope
+
 def test_raw_block_from_proto(raw_block):
     """ Tests RawBlock.from_proto() """
     proto_block = Block(
@@ -96,3 +98,55 @@ def test_filt_block_from_proto(tx_from_proto):
 def test_decode_block_transactions(genesis_block):
     """ Tests DecodedBlock().transactions """
     assert len(genesis_block.decode().transactions) == 1
+
+
+def test_raw_block_tx_validation_codes(raw_block, rwset_block_factory):
+    """ Tests RawBlock().tx_validation_codes """
+    assert raw_block.tx_validation_codes == b''
+    block = rwset_block_factory(1, [b'', b''], bytes([0, 11]))
+    assert block.tx_validation_codes == bytes([0, 11])
+    assert block.is_valid_transaction(0)
+    assert not block.is_valid_transaction(1)
+    assert block.is_valid_transaction(2)
+
+
+def test_raw_block_to_rwset_batch(rwset_block_factory):
+    """ Tests RawBlock().to_rwset_batch """
+    block = rwset_block_factory(7, [
+        build_rwset_envelope(
+            'mycc',
+            writes=[('a', b'1', False), ('b', b'', True)],
+            reads=[('a', (3, 1)), ('c', None)]
+        ),
+        build_rwset_envelope('mycc', writes=[('z', b'invalid', False)]),
+        build_rwset_envelope('lscc', writes=[('mycc', b'def', False)]),
+    ], bytes([0, 11, 0]))
+
+    batch = block.to_rwset_batch()
+    writes = batch.writes
+    assert len(writes) == 3
+    assert list(writes.block_number) == [7, 7, 7]
+    assert list(writes.tx_index) == [0, 0, 2]
+    assert writes.namespace == ['mycc', 'mycc', 'lscc']
+    assert writes.key == ['a', 'b', 'mycc']
+    assert list(writes.is_delete) == [0, 1, 0]
+    assert bytes(writes.values) == b'1def'
+    assert [bytes(writes.value(i)) for i in range(3)] == [b'1', b'', b'def']
+
+    reads = batch.reads
+    assert len(reads) == 2
+    assert reads.key == ['a', 'c']
+    assert list(reads.has_version) == [1, 0]
+    assert list(reads.version_block_num) == [3, 0]
+    assert list(reads.version_tx_num) == [1, 0]
+
+    # Appends to an existing batch
+    block.to_rwset_batch(batch=batch)
+    assert len(batch.writes) == 6
+
+
+def test_config_block_to_rwset_batch(genesis_block):
+    """ Tests RawBlock().to_rwset_batch skips non-endorser transactions """
+    batch = genesis_block.to_rwset_batch()
+    assert not batch.writes
+    assert not batch.reads
@@ -94,7 +94,35 @@ async def test_gw_transact(generate_tx, tx_builder_mock, gateway, org1_user, cc_
 
 
 @pytest.mark.asyncio
-@asynctest.patch('snakeskin.models.gateway.generate_cc_tx', autospec=True)
+@asynctest.patch('snakeskin.models.gateway.generate_cc_tx_async', autospec=True)
+async def test_gw_transact_async(generate_tx, tx_builder_mock, gateway, org1_user, cc_spec):
+    """ Tests Gateway().transact_async """
+    await _assert_gw_required(
+        gateway,
+        lambda gw: gw.transact_async(fcn='abc'),
+        ['channel', 'endorsing_peers', 'requestor', 'chaincode']
+    )
+
+    res = await gateway.transact_async(fcn='abc', args=['1', '2'])
+    generate_tx.assert_awaited()
+    generate_tx.assert_called_with(
+        requestor=org1_user,
+        cc_name=cc_spec.name,
+        channel=CHANNEL,
+        fcn='abc',
+        args=['1', '2'],
+        transient_map=None
+    )
+    assert res == tx_builder_mock.return_value
+
+    tx_builder_mock.assert_called_with(
+        gateway=gateway,
+        generated_tx=generate_tx.return_value
+    )
+
+
+@pytest.mark.asyncio
+@asynctest.patch('snakeskin.models.gateway.generate_cc_tx_async', autospec=True)
 async def test_gw_invoke(generate_tx, tx_builder_mock, gateway, org1_user, cc_spec):
     """ Tests Gateway().invoke """
 
@@ -118,11 +146,12 @@ async def test_gw_invoke(generate_tx, tx_builder_mock, gateway, org1_user, cc_sp
     tx_builder.propose.assert_called_with()
     tx_builder.submit.assert_called_with()
     tx_builder.wait_for_commit.assert_called_with(timeout=100)
-    tx_builder.assert_awaited_once()
+    # Awaited to endorse, broadcast and wait for the commit in turn
+    assert tx_builder.await_count == 3
 
 
 @pytest.mark.asyncio
-@asynctest.patch('snakeskin.models.gateway.generate_cc_tx', autospec=True)
+@asynctest.patch('snakeskin.models.gateway.generate_cc_tx_async', autospec=True)
 async def test_gw_query(generate_tx, tx_builder_mock, gateway, org1_user, cc_spec):
     """ Tests Gateway().query """
 
@@ -170,8 +199,10 @@ async def test_gw_create_channel(create_channel, gateway, org1_user, orderer):
 
 
 @pytest.mark.asyncio
+@asynctest.patch('snakeskin.models.gateway.fetch_genesis_block', autospec=True)
 @asynctest.patch('snakeskin.models.gateway.join_channel', autospec=True)
-async def test_gw_join_channel(join_channel, gateway, org1_user, orderer, peer):
+async def test_gw_join_channel(join_channel, fetch_block, gateway, org1_user,
+                               orderer, peer):
     """ Tests Gateway().join_channel """
 
     await _assert_gw_required(
@@ -179,40 +210,68 @@ async def test_gw_join_channel(join_channel, gateway, org1_user, orderer, peer):
     )
 
     res = await gateway.join_channel()
+    fetch_block.assert_called_once_with(
+        requestor=org1_user,
+        orderers=[orderer],
+        channel=CHANNEL,
+    )
     join_channel.assert_called_with(
         requestor=org1_user,
         orderers=[orderer],
         channel=CHANNEL,
-        peer=peer
+        peer=peer,
+        genesis_block=fetch_block.return_value,
     )
     assert res is None
 
 
 @pytest.mark.asyncio
+@asynctest.patch('snakeskin.models.gateway.fetch_genesis_block', autospec=True)
 @asynctest.patch('snakeskin.models.gateway.join_channel', autospec=True)
-async def test_gw_join_channel_mult(join_channel, gateway, org1_user, orderer, peer):
-    """ Tests Gateway().join_channel for multiple peers """
+async def test_gw_join_channel_mult(join_channel, fetch_block, gateway,
+                                    org1_user, orderer, peer):
+    """ Tests Gateway().join_channel for multiple peers, retrieving the
+        origin block once
+    """
 
     peer2 = Peer(endpoint='org2peer.com')
 
     res = await gateway.join_channel(peers=[peer, peer2])
+    await gateway.join_channel(peers=[peer2])
+    fetch_block.assert_called_once()
     join_channel.assert_has_calls([
         call(
             requestor=org1_user,
             orderers=[orderer],
             channel=CHANNEL,
-            peer=peer
+            peer=peer,
+            genesis_block=fetch_block.return_value,
         ),
         call(
             requestor=org1_user,
             orderers=[orderer],
             channel=CHANNEL,
-            peer=peer2
+            peer=peer2,
+            genesis_block=fetch_block.return_value,
         ),
-    ])
+    ], any_order=True)
     assert res is None
 
 
+@pytest.mark.asyncio
+@asynctest.patch('snakeskin.models.gateway.fetch_genesis_block', autospec=True)
+@asynctest.patch('snakeskin.models.gateway.join_channel', autospec=True)
+async def test_gw_join_channel_error(join_channel, fetch_block, gateway, peer):
+    """ Tests Gateway().join_channel joins every peer before raising """
+
+    peer2 = Peer(endpoint='org2peer.com')
+    join_channel.side_effect = [BlockchainError('Failed'), None]
+
+    with pytest.raises(BlockchainError):
+        await gateway.join_channel(peers=[peer, peer2])
+    assert join_channel.call_count == 2
+
+
 @pytest.mark.asyncio
 @asynctest.patch('snakeskin.models.gateway.query_instantiated_chaincodes', autospec=True)
 async def test_gw_query_inst_cc(query_cc, gateway, org1_user, peer):
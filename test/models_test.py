@@ -2,13 +2,17 @@
     Tests for the models package
 """
 
+import subprocess
+import sys
+from dataclasses import replace
 from unittest.mock import patch
 
 import pytest
 
+from snakeskin import models
 from snakeskin.models import (
     User, DEFAULT_CRYPTO_BACKEND, Orderer,
-    EndorsementPolicyRole, EndorsementPolicy, PolicyExpression
+    EndorsementPolicyRole, EndorsementPolicy, PolicyExpression, Peer
 )
 
 
@@ -25,9 +29,34 @@ def test_user_post_init(load_pem_mock):
     assert user.key == b'notactuallyakey'
     assert user.cert == b'notactuallyacert'
 
+    # The private key is only parsed when first used
+    load_pem_mock.assert_not_called()
+    assert user.private_key is load_pem_mock.return_value
     load_pem_mock.assert_called_with(
         b'notactuallyakey', None, DEFAULT_CRYPTO_BACKEND
     )
+    models._PRIVATE_KEYS.clear() # pylint: disable=protected-access
+
+
+def test_user_shares_private_keys(org1_user):
+    """ Tests users with identical keys share the parsed private key """
+    user = User(msp_id='Org1MSP', cert=org1_user.cert, key=org1_user.key)
+    assert user.private_key is org1_user.private_key
+
+
+def test_user_parsed_private_key(org1_user):
+    """ Tests a user can be created with a parsed private key instead of a
+        key, which is ignored when a key is provided
+    """
+    private_key = org1_user.private_key
+    user = User(msp_id='Org1MSP', cert=org1_user.cert, private_key=private_key)
+    assert user.private_key is private_key
+    assert replace(user, name='Copy').private_key is private_key
+
+    other_key = object()
+    user = User(msp_id='Org1MSP', cert=org1_user.cert, key=org1_user.key,
+                private_key=other_key)
+    assert user.private_key is private_key
 
 
 def test_user_missing_key():
@@ -55,14 +84,18 @@ def test_orderer_no_certs(insecure_channel):
     """ Tests creates an insecure channel for an orderer if no certs
         provided
     """
-    Orderer(endpoint='notactuallyahost:7050')
+    orderer = Orderer(endpoint='notactuallyahost:7050')
+    # The channel is only created when first used
+    insecure_channel.assert_not_called()
+    assert orderer.broadcaster
     insecure_channel.assert_called_with('notactuallyahost:7050', [])
 
 
 @patch('aiogrpc.insecure_channel', autospec=True)
 def test_orderer_ssl_target_name(insecure_channel):
     """ Instantiates connection with ssl target name override """
-    Orderer(endpoint='notactuallyahost:7050', ssl_target_name='otherhostname')
+    orderer = Orderer(endpoint='notactuallyahost:7050', ssl_target_name='otherhostname')
+    assert orderer.broadcaster
     insecure_channel.assert_called_with(
         'notactuallyahost:7050',
         [('grpc.ssl_target_name_override', 'otherhostname')]
@@ -74,10 +107,11 @@ def test_orderer_ssl_target_name(insecure_channel):
 def test_orderer_tls_cert(secure_channel, ssl_creds):
     """ Tests creates an secure channel if a tls ca cert is provided
     """
-    Orderer(
+    orderer = Orderer(
         endpoint='notactuallyahost:7050',
         tls_ca_cert_path='test/resources/certfile'
     )
+    assert orderer.broadcaster
     ssl_creds.assert_called_with(b'notactuallyacert')
     secure_channel.assert_called_with(
         'notactuallyahost:7050', ssl_creds.return_value, []
@@ -89,12 +123,13 @@ def test_orderer_tls_cert(secure_channel, ssl_creds):
 def test_orderer_client_auth(secure_channel, ssl_creds):
     """ Tests creates a client-authenticated channel if client creds provided
     """
-    Orderer(
+    orderer = Orderer(
         endpoint='notactuallyahost:7050',
         tls_ca_cert_path='test/resources/certfile',
         client_cert_path='test/resources/client_certfile',
         client_key_path='test/resources/client_keyfile'
     )
+    assert orderer.broadcaster
     ssl_creds.assert_called_with(
         b'notactuallyacert',
         private_key=b'notactuallyaclientkey',
@@ -105,6 +140,31 @@ def test_orderer_client_auth(secure_channel, ssl_creds):
     )
 
 
+def test_models_import_no_grpc():
+    """ Tests importing models does not load gRPC or the service stubs """
+    loaded = subprocess.run(
+        [sys.executable, '-c', (
+            'import sys, snakeskin.models; '
+            'print(" ".join(m for m in sys.modules if "grpc" in m))'
+        )],
+        stdout=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    ).stdout.split()
+    assert loaded == []
+
+
+@patch('aiogrpc.insecure_channel', autospec=True)
+def test_peer_lazy_stubs(insecure_channel):
+    """ Tests peer stubs are created on first access, and then reused """
+    peer = Peer(endpoint='notactuallyahost:7051')
+    assert 'discovery' not in peer.__dict__
+    discovery = peer.discovery
+    assert type(discovery).__name__ == 'DiscoveryStub'
+    assert peer.discovery is discovery
+    insecure_channel.assert_called_once()
+
+
 def test_end_policy_all_roles():
     """ Tests EndorsementPolicy.all_roles getter """
     role1 = EndorsementPolicyRole(
@@ -21,7 +21,7 @@ from snakeskin.protos.peer.proposal_pb2 import Proposal, SignedProposal
 from snakeskin.protos.peer.proposal_response_pb2 import ProposalResponse, Response
 
 from snakeskin.models.transaction import (
-    EndorsedTX, GeneratedTX, TXContext, FilteredTX
+    EndorsedTX, GeneratedTX, TXContext, FilteredTX, DecodedTX
 )
 from snakeskin.constants import TransactionType
 
@@ -139,3 +139,20 @@ def test_decoded_tx_tx_id(genesis_block):
     assert genesis_block.decode().transactions[0].tx_id == (
         'f0e9c28f528210b234dd613fa5ed20fa49082df15e96ad35590080ae3d357c5d'
     )
+
+
+def test_decoded_tx_slotted(channel_tx):
+    """ Tests decoded models do not allocate instance dictionaries """
+    assert not hasattr(channel_tx, '__dict__')
+    assert not hasattr(channel_tx.payload.header, '__dict__')
+
+
+def test_decoded_tx_interns_identities():
+    """ Tests identical creators are decoded into a shared object """
+    with open('network-config/channel.tx', 'rb') as chan_bytes:
+        envelope_bytes = chan_bytes.read()
+    first = DecodedTX.decode(envelope_bytes)
+    second = DecodedTX.decode(envelope_bytes)
+    assert first.payload.header.signature_header.creator is (
+        second.payload.header.signature_header.creator
+    )
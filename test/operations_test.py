@@ -0,0 +1,231 @@
+"""
+    Tests for the operations module
+"""
+
+from hashlib import sha256
+
+import pytest
+
+from snakeskin.constants import ChaincodeLanguage
+from snakeskin.errors import TransactionProposalError
+from snakeskin.models import ChaincodeSpec, Channel, Orderer, Peer
+from snakeskin.models.transaction import EndorsedTX
+from snakeskin.operations import (
+    ensure_chaincode_installed,
+    fetch_genesis_block,
+    lifecycle_install_chaincode,
+    lifecycle_package,
+)
+from snakeskin.packaging import PackageCache
+from snakeskin.protos.peer.proposal_response_pb2 import ProposalResponse, Response
+from snakeskin.protos.peer.query_pb2 import ChaincodeQueryResponse, ChaincodeInfo
+from snakeskin.protos.peer.chaincode_pb2 import ChaincodeInvocationSpec
+from snakeskin.protos.peer.proposal_pb2 import ChaincodeProposalPayload
+from snakeskin.protos.peer.lifecycle.lifecycle_pb2 import (
+    InstallChaincodeArgs,
+    QueryInstalledChaincodeArgs,
+    QueryInstalledChaincodeResult,
+)
+
+
+@pytest.fixture()
+def installable(org1_user, tmp_path, monkeypatch):
+    """ A user and a chaincode spec for a small source tree """
+    # Loads the user's key before leaving the repository directory
+    assert org1_user.private_key
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'mycc').mkdir()
+    (tmp_path / 'mycc' / 'main.go').write_bytes(b'package main\n')
+    cc_spec = ChaincodeSpec(
+        name='mycc', version='2', language=ChaincodeLanguage.GOLANG, path='mycc'
+    )
+    return org1_user, cc_spec
+
+
+@pytest.mark.asyncio
+async def test_ensure_chaincode_installed(installable, tmp_path, monkeypatch):
+    """ Tests chaincode is only installed on the peers missing it, and that
+        failures are reported per peer
+    """
+    requestor, cc_spec = installable
+    peers = [Peer(name=f'peer{idx}', endpoint='localhost:7051') for idx in range(4)]
+    installed = {
+        'peer0': [ChaincodeInfo(name='mycc', version='1')],
+        'peer1': [ChaincodeInfo(name='mycc', version='2')],
+        'peer2': [],
+    }
+    proposals = []
+
+    async def _query_installed_chaincodes(requestor, peer):
+        if peer.name not in installed:
+            raise ConnectionError('unreachable')
+        return ChaincodeQueryResponse(chaincodes=installed[peer.name])
+
+    async def _propose_tx(peers, generated_tx):
+        proposals.append((peers[0].name, generated_tx))
+        status = 500 if peers[0].name == 'peer2' else 200
+        return EndorsedTX(
+            peer_responses=[ProposalResponse(response=Response(status=status))],
+            proposal=generated_tx.proposal,
+            header=generated_tx.header,
+            tx_context=generated_tx.tx_context,
+        )
+
+    monkeypatch.setattr(
+        'snakeskin.operations.query_installed_chaincodes',
+        _query_installed_chaincodes
+    )
+    monkeypatch.setattr('snakeskin.operations.propose_tx', _propose_tx)
+    results = await ensure_chaincode_installed(
+        requestor=requestor,
+        peers=peers,
+        cc_spec=cc_spec,
+        package_cache=PackageCache(str(tmp_path / 'cache')),
+    )
+
+    assert [r.peer.name for r in results] == ['peer0', 'peer1', 'peer2', 'peer3']
+    assert [r.status for r in results] == [
+        'installed', 'already_installed', 'failed', 'failed'
+    ]
+    assert results[0].endorsed_tx.fully_endorsed
+    assert 'peer2' in str(results[2].error)
+    assert isinstance(results[3].error, ConnectionError)
+    # A single proposal is generated for every peer that needs it
+    assert [name for name, _ in proposals] == ['peer0', 'peer2']
+    assert proposals[0][1] is proposals[1][1]
+
+
+@pytest.mark.asyncio
+async def test_ensure_chaincode_installed_everywhere(installable, monkeypatch):
+    """ Tests nothing is packaged when every peer has the chaincode """
+    requestor, cc_spec = installable
+
+    async def _query_installed_chaincodes(requestor, peer):
+        return ChaincodeQueryResponse(
+            chaincodes=[ChaincodeInfo(name='mycc', version='2')]
+        )
+
+    def _build_install_tx(*args):
+        raise AssertionError('Should not package chaincode')
+
+    monkeypatch.setattr(
+        'snakeskin.operations.query_installed_chaincodes',
+        _query_installed_chaincodes
+    )
+    monkeypatch.setattr('snakeskin.operations._build_install_tx', _build_install_tx)
+    results = await ensure_chaincode_installed(
+        requestor=requestor,
+        peers=[Peer(name='peer0', endpoint='localhost:7051')],
+        cc_spec=cc_spec,
+    )
+    assert [r.status for r in results] == ['already_installed']
+
+    with pytest.raises(ValueError):
+        await ensure_chaincode_installed(
+            requestor=requestor, peers=[], cc_spec=cc_spec, max_concurrency=0
+        )
+
+
+@pytest.mark.asyncio
+async def test_fetch_genesis_block(org1_user, genesis_block, monkeypatch):
+    """ Tests the origin block comes from the first orderer that delivers it,
+        and the last error is raised if none do. Streams are closed once the
+        block is delivered.
+    """
+    streamed = []
+    closed = []
+
+    class _OrdererEvents:
+        def __init__(self, requestor, channel, orderer):
+            self.orderer = orderer
+
+        async def stream_blocks(self, start, stop):
+            streamed.append(self.orderer.name)
+            if self.orderer.name == 'down':
+                raise ConnectionError('unreachable')
+            try:
+                yield genesis_block
+            finally:
+                closed.append(self.orderer.name)
+
+    monkeypatch.setattr('snakeskin.operations.OrdererEvents', _OrdererEvents)
+    channel = Channel(name='mychannel')
+    orderers = [Orderer(name=name, endpoint='localhost:7050')
+                for name in ('down', 'up', 'unused')]
+
+    block = await fetch_genesis_block(org1_user, orderers, channel)
+    assert block is genesis_block
+    assert streamed == ['down', 'up']
+    assert closed == ['up']
+
+    with pytest.raises(ConnectionError):
+        await fetch_genesis_block(org1_user, orderers[:1], channel)
+    with pytest.raises(ValueError):
+        await fetch_genesis_block(org1_user, [], channel)
+
+
+@pytest.mark.asyncio
+async def test_lifecycle_install_chaincode(installable, tmp_path, monkeypatch):
+    """ Tests +lifecycle installs are skipped on peers with the same package
+        hash, and fail on peers with a different one or a failed query
+    """
+    requestor, cc_spec = installable
+    package_cache = PackageCache(str(tmp_path / 'cache'))
+    package_hash = sha256(lifecycle_package(cc_spec, package_cache)).digest()
+    installed = {
+        'peer0': None, 'peer1': package_hash, 'peer2': b'other', 'peer3': None
+    }
+    proposals = []
+
+    async def _propose_tx(peers, generated_tx):
+        spec = ChaincodeInvocationSpec.FromString(
+            ChaincodeProposalPayload.FromString(generated_tx.proposal.payload).input
+        ).chaincode_spec
+        function, args = spec.input.args
+        proposals.append((function, peers[0].name))
+        assert spec.chaincode_id.name == '+lifecycle'
+        if function == b'QueryInstalledChaincode':
+            query = QueryInstalledChaincodeArgs.FromString(args)
+            assert (query.name, query.version) == ('mycc', '2')
+            installed_hash = installed[peers[0].name]
+            if peers[0].name == 'peer3':
+                response = Response(status=500, message='access denied')
+            elif installed_hash is None:
+                response = Response(
+                    status=500,
+                    message="chaincode install package 'mycc:2' not found",
+                )
+            else:
+                response = Response(
+                    status=200,
+                    payload=QueryInstalledChaincodeResult(
+                        hash=installed_hash
+                    ).SerializeToString(),
+                )
+        else:
+            install = InstallChaincodeArgs.FromString(args)
+            assert sha256(install.chaincode_install_package).digest() == package_hash
+            response = Response(status=200)
+        return EndorsedTX(
+            peer_responses=[ProposalResponse(response=response)],
+            proposal=generated_tx.proposal,
+            header=generated_tx.header,
+            tx_context=generated_tx.tx_context,
+        )
+
+    monkeypatch.setattr('snakeskin.operations.propose_tx', _propose_tx)
+    results = await lifecycle_install_chaincode(
+        requestor=requestor,
+        peers=[Peer(name=name, endpoint='localhost:7051') for name in installed],
+        cc_spec=cc_spec,
+        package_cache=package_cache,
+    )
+
+    assert [r.status for r in results] == [
+        'installed', 'already_installed', 'failed', 'failed'
+    ]
+    assert 'different package' in str(results[2].error)
+    assert isinstance(results[3].error, TransactionProposalError)
+    assert [p for p in proposals if p[0] == b'InstallChaincode'] == [
+        (b'InstallChaincode', 'peer0')
+    ]
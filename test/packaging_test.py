@@ -0,0 +1,181 @@
+"""
+    Tests for the packaging module
+"""
+
+import gzip
+import io
+import os
+import tarfile
+
+import pytest
+
+from snakeskin.constants import ChaincodeLanguage
+from snakeskin.models import ChaincodeSpec
+from snakeskin.operations import package_chaincode
+from snakeskin.packaging import PackageCache, package_fingerprint, write_package
+
+
+@pytest.fixture()
+def cc_spec(tmp_path, monkeypatch):
+    """ A chaincode spec for a small source tree, relative to the working
+        directory
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('GOPATH', str(tmp_path / 'gopath'))
+    source = tmp_path / 'mycc'
+    (source / 'lib').mkdir(parents=True)
+    (source / 'main.go').write_bytes(b'package main\n')
+    (source / 'lib' / 'lib.go').write_bytes(b'package lib\n')
+    return ChaincodeSpec(
+        name='mycc', version='1', language=ChaincodeLanguage.GOLANG, path='mycc'
+    )
+
+
+def test_write_package(cc_spec):
+    """ Tests packages contain the source under src with normalized metadata """
+    out = io.BytesIO()
+    write_package(cc_spec, out)
+    package = out.getvalue()
+
+    assert package[4:8] == b'\x00\x00\x00\x00'
+    with tarfile.open(fileobj=io.BytesIO(package), mode='r:gz') as dist:
+        members = {member.name: member for member in dist.getmembers()}
+        assert set(members) == {'src/mycc/main.go', 'src/mycc/lib/lib.go'}
+        assert all(m.mtime == 0 and m.uid == 500 for m in members.values())
+        assert dist.extractfile('src/mycc/main.go').read() == b'package main\n'
+    assert gzip.decompress(package)
+
+
+def test_package_cache(cc_spec, tmp_path):
+    """ Tests unchanged chaincode is served from the cache """
+    cache = PackageCache(str(tmp_path / 'cache'))
+    package = cache.package(cc_spec)
+    assert cache.package(cc_spec) == package
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert os.listdir(cache.cache_dir) == [
+        f'{package_fingerprint(cc_spec)}.tar.gz'
+    ]
+
+    out = io.BytesIO()
+    write_package(cc_spec, out)
+    assert out.getvalue() == package
+
+
+def test_package_cache_invalidated(cc_spec, tmp_path):
+    """ Tests changing, adding or renaming a file repackages the chaincode """
+    cache = PackageCache(str(tmp_path / 'cache'))
+    fingerprints = {package_fingerprint(cc_spec)}
+
+    (tmp_path / 'mycc' / 'main.go').write_bytes(b'package main\n\n')
+    fingerprints.add(package_fingerprint(cc_spec))
+    (tmp_path / 'mycc' / 'extra.go').write_bytes(b'')
+    fingerprints.add(package_fingerprint(cc_spec))
+    (tmp_path / 'mycc' / 'extra.go').rename(tmp_path / 'mycc' / 'other.go')
+    fingerprints.add(package_fingerprint(cc_spec))
+    assert len(fingerprints) == 4
+
+    package = cache.package(cc_spec)
+    with tarfile.open(fileobj=io.BytesIO(package), mode='r:gz') as dist:
+        assert 'src/mycc/other.go' in dist.getnames()
+    assert cache.misses == 1
+
+
+def test_package_chaincode(cc_spec, tmp_path, monkeypatch):
+    """ Tests package_chaincode uses the cache directory from the environment """
+    monkeypatch.setenv('SNAKESKIN_PACKAGE_CACHE', str(tmp_path / 'env-cache'))
+    monkeypatch.setattr('snakeskin.packaging._DEFAULT_CACHE', None)
+    package = package_chaincode(cc_spec)
+    assert os.listdir(tmp_path / 'env-cache') == [
+        f'{package_fingerprint(cc_spec)}.tar.gz'
+    ]
+    assert package_chaincode(cc_spec) == package
+
+
+def test_package_chaincode_uncached(cc_spec, tmp_path, monkeypatch):
+    """ Tests package_chaincode writes nothing to disk unless a cache
+        directory is set
+    """
+    monkeypatch.delenv('SNAKESKIN_PACKAGE_CACHE', raising=False)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'xdg'))
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    out = io.BytesIO()
+    write_package(cc_spec, out)
+    assert package_chaincode(cc_spec) == out.getvalue()
+    assert not (tmp_path / 'xdg').exists()
+    assert not (tmp_path / 'home').exists()
+
+
+def test_package_cache_evicts(cc_spec, tmp_path):
+    """ Tests the least recently used packages are removed once the cache
+        is full
+    """
+    cache = PackageCache(str(tmp_path / 'cache'), max_entries=2)
+    main_go = tmp_path / 'mycc' / 'main.go'
+    paths = []
+    for idx in range(3):
+        main_go.write_bytes(f'package main // {idx}\n'.encode())
+        paths.append(cache.package_path(cc_spec))
+        # Keeps modification times distinct on coarse clocks
+        os.utime(paths[-1], (idx, idx))
+    assert not os.path.exists(paths[0])
+
+    main_go.write_bytes(b'package main // 1\n')
+    assert cache.package_path(cc_spec) == paths[1]
+    main_go.write_bytes(b'package main // 3\n')
+    cache.package_path(cc_spec)
+    assert os.path.exists(paths[1])
+    assert not os.path.exists(paths[2])
+    assert len(os.listdir(cache.cache_dir)) == 2
+
+    with pytest.raises(ValueError):
+        PackageCache(str(tmp_path / 'cache'), max_entries=0)
+
+
+def test_package_chaincode_errors(cc_spec, tmp_path):
+    """ Tests unsupported or missing chaincode """
+    cache = PackageCache(str(tmp_path / 'cache'))
+    with pytest.raises(ValueError):
+        cache.package(ChaincodeSpec(
+            name='mycc', language=ChaincodeLanguage.NODE, path='mycc'
+        ))
+    with pytest.raises(ValueError):
+        cache.package(ChaincodeSpec(
+            name='mycc', language=ChaincodeLanguage.GOLANG, path='missing'
+        ))
+    assert not os.path.exists(cache.cache_dir)
+
+
+def test_write_package_parallel(cc_spec, tmp_path, monkeypatch):
+    """ Tests parallel packages are multi-member gzip streams of the same tar,
+        independent of the number of workers
+    """
+    monkeypatch.setattr('snakeskin.packaging.PARALLEL_CHUNK_SIZE', 1024)
+    (tmp_path / 'mycc' / 'data.bin').write_bytes(os.urandom(5000))
+
+    serial = io.BytesIO()
+    write_package(cc_spec, serial)
+    packages = []
+    for workers in (1, 4):
+        out = io.BytesIO()
+        write_package(cc_spec, out, workers=workers)
+        packages.append(out.getvalue())
+
+    assert packages[0] == packages[1]
+    assert packages[0].count(b'\x1f\x8b\x08') > 1
+    assert gzip.decompress(packages[0]) == gzip.decompress(serial.getvalue())
+    with tarfile.open(fileobj=io.BytesIO(packages[0]), mode='r:gz') as dist:
+        assert 'src/mycc/data.bin' in dist.getnames()
+
+    with pytest.raises(ValueError):
+        write_package(cc_spec, io.BytesIO(), workers=0)
+
+
+def test_package_cache_parallel(cc_spec, tmp_path):
+    """ Tests the compression mode is part of the cache key """
+    serial = PackageCache(str(tmp_path / 'cache'))
+    parallel = PackageCache(str(tmp_path / 'cache'), workers=2)
+    assert serial.package_path(cc_spec) != parallel.package_path(cc_spec)
+    assert PackageCache(str(tmp_path / 'cache'), workers=8).package_path(
+        cc_spec
+    ) == parallel.package_path(cc_spec)
+    assert parallel.misses == 1
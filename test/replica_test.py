@@ -0,0 +1,87 @@
+"""
+    Tests for the replica module
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from snakeskin.replica import StateReplica
+
+from .conftest import build_rwset_envelope
+
+
+@pytest.fixture(name='blocks')
+def _build_blocks(rwset_block_factory):
+    yield [
+        rwset_block_factory(0, [
+            build_rwset_envelope('mycc', writes=[
+                ('a', b'1', False), ('b', b'2', False)
+            ]),
+        ]),
+        rwset_block_factory(1, [
+            build_rwset_envelope('mycc', writes=[('a', b'3', False)]),
+            build_rwset_envelope('mycc', writes=[('c', b'invalid', False)]),
+            build_rwset_envelope('mycc', writes=[
+                ('b', b'', True), ('a', b'4', False)
+            ]),
+        ], bytes([0, 11, 0])),
+    ]
+
+
+def test_apply_block(blocks):
+    """ Tests StateReplica().apply_block """
+    replica = StateReplica(':memory:')
+    assert replica.height == 0
+
+    replica.apply_block(blocks[0])
+    assert replica.height == 1
+    assert replica.get_state('mycc', 'a') == b'1'
+    assert replica.get_state('mycc', 'b') == b'2'
+
+    replica.apply_block(blocks[1])
+    assert replica.height == 2
+    assert replica.get_state('mycc', 'a') == b'4'
+    assert replica.get_state('mycc', 'b') is None
+    assert replica.get_state('mycc', 'c') is None
+
+    # Replayed blocks are ignored
+    replica.apply_block(blocks[0])
+    assert replica.get_state('mycc', 'a') == b'4'
+
+
+def test_apply_block_out_of_order(blocks):
+    """ Tests StateReplica().apply_block rejects gaps """
+    replica = StateReplica(':memory:')
+    with pytest.raises(ValueError):
+        replica.apply_block(blocks[1])
+
+
+def test_resumes_from_height(blocks, tmp_path):
+    """ Tests the replica height persists across connections """
+    db_path = str(tmp_path / 'state.db')
+    replica = StateReplica(db_path)
+    replica.apply_block(blocks[0])
+    replica.close()
+
+    replica = StateReplica(db_path)
+    assert replica.height == 1
+    assert replica.get_state('mycc', 'b') == b'2'
+
+
+@pytest.mark.asyncio
+async def test_sync(blocks):
+    """ Tests StateReplica().sync streams from the current height """
+    replica = StateReplica(':memory:')
+    replica.apply_block(blocks[0])
+
+    async def _stream(start, stop):
+        for block in blocks[start:stop + 1]:
+            yield block
+
+    events = Mock()
+    events.stream_blocks.side_effect = _stream
+    await replica.sync(events, stop=1)
+
+    events.stream_blocks.assert_called_with(start=1, stop=1)
+    assert replica.height == 2
@@ -0,0 +1,237 @@
+"""
+    Tests for the retry module
+"""
+
+from enum import Enum
+from types import SimpleNamespace
+
+import pytest
+
+from snakeskin.errors import (
+    BlockchainConnectionError,
+    CommitStatusUnknownError,
+    TrasactionCommitError,
+    TransactionValidationError,
+)
+from snakeskin.models import Peer, Orderer, Channel, ChaincodeSpec
+from snakeskin.models.gateway import Gateway
+from snakeskin.protos.common.common_pb2 import Status
+from snakeskin.protos.orderer.ab_pb2 import BroadcastResponse
+from snakeskin.protos.peer.transaction_pb2 import TxValidationCode
+from snakeskin.retry import RetryBudget, RetryPolicy
+
+
+class _StatusCode(Enum):
+    """ Stands in for grpc.StatusCode """
+    UNAVAILABLE = 14
+    DEADLINE_EXCEEDED = 4
+
+
+class _RpcError:
+    def __init__(self, code):
+        self._code = code
+
+    def code(self):
+        return self._code
+
+    @staticmethod
+    def details():
+        return 'details'
+
+
+def _policy(**kwargs):
+    return RetryPolicy(base_delay=0, budget=RetryBudget(), **kwargs)
+
+
+def _failing(errors, result='done'):
+    """ An operation raising each error in turn, then returning the result """
+    calls = []
+
+    async def _operation():
+        calls.append(None)
+        if errors:
+            raise errors.pop(0)
+        return result
+    return _operation, calls
+
+
+def test_is_retryable():
+    """ Tests errors are classified by their codes """
+    policy = RetryPolicy()
+    assert policy.is_retryable(
+        TransactionValidationError(TxValidationCode.MVCC_READ_CONFLICT)
+    )
+    assert not policy.is_retryable(
+        TransactionValidationError(TxValidationCode.ENDORSEMENT_POLICY_FAILURE)
+    )
+    assert not policy.is_retryable(
+        TransactionValidationError(TxValidationCode.DUPLICATE_TXID)
+    )
+    assert policy.is_retryable(
+        BlockchainConnectionError(_RpcError(_StatusCode.UNAVAILABLE))
+    )
+    assert not policy.is_retryable(
+        BlockchainConnectionError(_RpcError(_StatusCode.DEADLINE_EXCEEDED))
+    )
+    assert policy.is_retryable(TrasactionCommitError(
+        'Failed', 'tx', BroadcastResponse(status=Status.SERVICE_UNAVAILABLE)
+    ))
+    assert not policy.is_retryable(TrasactionCommitError(
+        'Failed', 'tx', BroadcastResponse(status=Status.BAD_REQUEST)
+    ))
+    assert not policy.is_retryable(ValueError())
+
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+def test_backoff():
+    """ Tests backoff is jittered, growing and capped """
+    policy = RetryPolicy(base_delay=1, max_delay=3)
+    delays = [policy.backoff(retry) for retry in range(5) for _ in range(20)]
+    assert all(0 <= delay <= 3 for delay in delays)
+    assert len(set(delays)) > 1
+    assert all(policy.backoff(0) <= 1 for _ in range(20))
+
+
+@pytest.mark.asyncio
+async def test_run_retries():
+    """ Tests retryable errors are retried up to max_attempts """
+    conflict = TransactionValidationError(TxValidationCode.MVCC_READ_CONFLICT)
+    operation, calls = _failing([conflict, conflict])
+    assert await _policy(max_attempts=3).run(operation) == 'done'
+    assert len(calls) == 3
+
+    operation, calls = _failing([conflict, conflict])
+    with pytest.raises(TransactionValidationError):
+        await _policy(max_attempts=2).run(operation)
+    assert len(calls) == 2
+
+    operation, calls = _failing([ValueError()])
+    with pytest.raises(ValueError):
+        await _policy().run(operation)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_run_budget():
+    """ Tests retries stop once the shared budget is spent, and resume as
+        operations succeed
+    """
+    budget = RetryBudget(max_tokens=2, token_ratio=0.5)
+    policy = RetryPolicy(base_delay=0, max_attempts=10, budget=budget)
+    conflict = TransactionValidationError(TxValidationCode.MVCC_READ_CONFLICT)
+
+    operation, calls = _failing([conflict] * 5)
+    with pytest.raises(TransactionValidationError):
+        await policy.run(operation)
+    assert len(calls) == 3
+    assert budget.tokens == 0
+
+    operation, calls = _failing([])
+    await policy.run(operation)
+    await policy.run(operation)
+    assert budget.tokens == 1
+    operation, calls = _failing([conflict] * 5)
+    with pytest.raises(TransactionValidationError):
+        await policy.run(operation)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_gateway_invoke_retry(org1_user, monkeypatch):
+    """ Tests Gateway().invoke generates a new transaction for each retry """
+    gateway = Gateway(
+        endorsing_peers=[Peer(endpoint='peer.host.com')],
+        orderers=[Orderer(endpoint='orderer.host.com')],
+        requestor=org1_user,
+        channel=Channel(name='mychannel'),
+        chaincode=ChaincodeSpec(name='mycc'),
+    )
+    errors = [TransactionValidationError(TxValidationCode.MVCC_READ_CONFLICT)]
+    transactions = []
+
+    class _Builder:
+        def __init__(self, tx_id):
+            self.tx_id = tx_id
+
+        def propose(self):
+            return self
+
+        def submit(self):
+            return self
+
+        def wait_for_commit(self, timeout):
+            return self
+
+        def __await__(self):
+            return self._run().__await__()
+
+        async def _run(self):
+            if errors:
+                raise errors.pop(0)
+            return self.tx_id
+
+    async def _transact_async(fcn, args, transient_map):
+        transactions.append(fcn)
+        return _Builder(len(transactions))
+
+    monkeypatch.setattr(gateway, 'transact_async', _transact_async)
+    assert await gateway.invoke('move', retry_policy=_policy()) == 2
+    assert transactions == ['move', 'move']
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('phase', ['submit', 'wait'])
+async def test_gateway_invoke_no_retry_after_broadcast(org1_user, monkeypatch, phase):
+    """ Tests connection failures are only retried while endorsing, as the
+        transaction may commit once it is broadcast
+    """
+    gateway = Gateway(
+        endorsing_peers=[Peer(endpoint='peer.host.com')],
+        orderers=[Orderer(endpoint='orderer.host.com')],
+        requestor=org1_user,
+        channel=Channel(name='mychannel'),
+        chaincode=ChaincodeSpec(name='mycc'),
+    )
+    unavailable = BlockchainConnectionError(_RpcError(_StatusCode.UNAVAILABLE))
+    # The phase each await of a transaction fails in
+    failures = {(1, 'propose'): unavailable, (2, phase): unavailable}
+    transactions = []
+
+    class _Builder:
+        def __init__(self, tx_id):
+            self.transaction = SimpleNamespace(tx_id=str(tx_id))
+            self.phase = None
+
+        def propose(self):
+            self.phase = 'propose'
+            return self
+
+        def submit(self):
+            self.phase = 'submit'
+            return self
+
+        def wait_for_commit(self, timeout):
+            self.phase = 'wait'
+            return self
+
+        def __await__(self):
+            return self._run().__await__()
+
+        async def _run(self):
+            error = failures.get((len(transactions), self.phase))
+            if error:
+                raise error
+            return self.transaction
+
+    async def _transact_async(fcn, args, transient_map):
+        transactions.append(fcn)
+        return _Builder(len(transactions))
+
+    monkeypatch.setattr(gateway, 'transact_async', _transact_async)
+    with pytest.raises(CommitStatusUnknownError) as err:
+        await gateway.invoke('move', retry_policy=_policy())
+    assert err.value.tx_id == '2'
+    assert err.value.__cause__ is unavailable
+    assert transactions == ['move', 'move']
@@ -0,0 +1,172 @@
+"""
+    Tests for the scheduler module
+"""
+
+import asyncio
+
+import pytest
+
+from snakeskin.models import Peer, Orderer, Channel, ChaincodeSpec
+from snakeskin.models.gateway import Gateway
+from snakeskin.models.transaction import EndorsedTX, TXContext
+from snakeskin.protos.ledger.rwset.rwset_pb2 import TxReadWriteSet, NsReadWriteSet
+from snakeskin.protos.ledger.rwset.kvrwset.kv_rwset_pb2 import KVRWSet, KVRead, KVWrite
+from snakeskin.protos.peer.proposal_pb2 import ChaincodeAction, Proposal
+from snakeskin.protos.peer.proposal_response_pb2 import (
+    ProposalResponse,
+    ProposalResponsePayload,
+)
+from snakeskin.protos.common.common_pb2 import Header
+from snakeskin.scheduler import KeyConflictScheduler, read_write_keys
+
+
+def _endorsed_tx(tx_id, reads=(), writes=()):
+    """ An endorsed transaction reading and writing keys in mycc """
+    kv_rwset = KVRWSet(
+        reads=[KVRead(key=key) for key in reads],
+        writes=[KVWrite(key=key, value=b'value') for key in writes],
+    )
+    payload = ProposalResponsePayload(extension=ChaincodeAction(
+        results=TxReadWriteSet(ns_rwset=[
+            NsReadWriteSet(namespace='mycc', rwset=kv_rwset.SerializeToString())
+        ]).SerializeToString()
+    ).SerializeToString())
+    return EndorsedTX(
+        peer_responses=[ProposalResponse(payload=payload.SerializeToString())],
+        proposal=Proposal(),
+        header=Header(),
+        tx_context=TXContext(identity=None, nonce=b'', tx_id=tx_id),
+    )
+
+
+def test_read_write_keys():
+    """ Tests keys are read from the first peer response """
+    reads, writes = read_write_keys(_endorsed_tx('tx', ['a', 'b'], ['b']))
+    assert reads == {('mycc', 'a'), ('mycc', 'b')}
+    assert writes == {('mycc', 'b')}
+
+
+@pytest.mark.asyncio
+async def test_admit():
+    """ Tests transactions reading keys written in flight wait for the
+        writer to be released
+    """
+    scheduler = KeyConflictScheduler()
+    assert await scheduler.admit(_endorsed_tx('writer', ['a'], ['a']))
+    assert await scheduler.admit(_endorsed_tx('other', ['b'], ['b']))
+    # Blind writes do not conflict
+    assert await scheduler.admit(_endorsed_tx('blind', [], ['a']))
+    assert scheduler.in_flight == 3
+
+    reader = asyncio.ensure_future(scheduler.admit(_endorsed_tx('reader', ['a'])))
+    await asyncio.sleep(0)
+    scheduler.release('writer')
+    await asyncio.sleep(0)
+    assert not reader.done()
+    scheduler.release('blind')
+    assert await reader is False
+    assert scheduler.in_flight == 1
+
+    scheduler.release('other')
+    scheduler.release('other')
+    assert await scheduler.admit(_endorsed_tx('reader', ['a']))
+
+
+@pytest.mark.asyncio
+async def test_endorse():
+    """ Tests conflicting transactions are endorsed again once the writer
+        is released
+    """
+    scheduler = KeyConflictScheduler()
+    await scheduler.admit(_endorsed_tx('writer', ['a'], ['a']))
+    endorsements = []
+
+    async def _endorse():
+        endorsements.append(None)
+        if len(endorsements) == 1:
+            asyncio.get_event_loop().call_soon(scheduler.release, 'writer')
+        return _endorsed_tx(f'tx{len(endorsements)}', ['a'], ['a'])
+
+    endorsed_tx = await scheduler.endorse(_endorse)
+    assert endorsed_tx.tx_id == 'tx2'
+    assert scheduler.reendorsements == 1
+    assert scheduler.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_endorse_max_reendorsements():
+    """ Tests transactions are admitted once re-endorsements run out """
+    scheduler = KeyConflictScheduler(max_reendorsements=0)
+    await scheduler.admit(_endorsed_tx('writer', ['a'], ['a']))
+
+    async def _endorse():
+        return _endorsed_tx('reader', ['a'], ['a'])
+
+    assert (await scheduler.endorse(_endorse)).tx_id == 'reader'
+    assert scheduler.in_flight == 2
+
+    with pytest.raises(ValueError):
+        KeyConflictScheduler(max_reendorsements=-1)
+
+
+@pytest.mark.asyncio
+async def test_gateway_invoke_scheduled(org1_user, monkeypatch):
+    """ Tests Gateway().invoke holds conflicting invokes until the writer
+        commits, and releases transactions after they commit or fail
+    """
+    gateway = Gateway(
+        endorsing_peers=[Peer(endpoint='peer.host.com')],
+        orderers=[Orderer(endpoint='orderer.host.com')],
+        requestor=org1_user,
+        channel=Channel(name='mychannel'),
+        chaincode=ChaincodeSpec(name='mycc'),
+    )
+    scheduler = KeyConflictScheduler()
+    committed = []
+    first_commit = asyncio.Event()
+
+    class _Builder:
+        def __init__(self, tx_id):
+            self.endorsed_tx = _endorsed_tx(tx_id, ['a'], ['a'])
+            self._committing = False
+
+        def propose(self):
+            return self
+
+        def submit(self):
+            return self
+
+        def wait_for_commit(self, timeout):
+            self._committing = True
+            return self
+
+        def __await__(self):
+            return self._run().__await__()
+
+        async def _run(self):
+            if self._committing:
+                if self.endorsed_tx.tx_id == 'tx1':
+                    await first_commit.wait()
+                committed.append(self.endorsed_tx.tx_id)
+            return self.endorsed_tx
+
+    count = 0
+
+    async def _transact_async(fcn, args, transient_map):
+        nonlocal count
+        count += 1
+        return _Builder(f'tx{count}')
+
+    monkeypatch.setattr(gateway, 'transact_async', _transact_async)
+    first = asyncio.ensure_future(gateway.invoke('move', scheduler=scheduler))
+    await asyncio.sleep(0.01)
+    second = asyncio.ensure_future(gateway.invoke('move', scheduler=scheduler))
+    await asyncio.sleep(0.01)
+    assert not committed
+    first_commit.set()
+
+    assert (await first).tx_id == 'tx1'
+    assert (await second).tx_id == 'tx3'
+    assert committed == ['tx1', 'tx3']
+    assert scheduler.reendorsements == 1
+    assert scheduler.in_flight == 0
@@ -0,0 +1,182 @@
+"""
+    Tests for the signing module
+"""
+
+import asyncio
+import os
+import stat
+from dataclasses import replace
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from snakeskin.errors import SigningError
+from snakeskin.factories import (
+    sign, sign_async, build_generated_tx, build_generated_tx_async
+)
+from snakeskin.models import User
+from snakeskin.signing import (
+    Signer, InProcessSigner, ThreadPoolSigner, SigningDaemon, SocketSigner
+)
+
+
+def _verify(user, message, signature):
+    return user.crypto_suite.verify(
+        user.private_key.public_key(), message, signature
+    )
+
+
+def test_user_default_signer(org1_user):
+    """ Tests users sign in process by default """
+    assert org1_user.signer is None
+    assert isinstance(org1_user.active_signer, InProcessSigner)
+    assert _verify(org1_user, b'message', sign(org1_user, b'message'))
+
+
+ORG2_KEY_PATH = (
+    'network-config/crypto/peerOrganizations/org2.com/users/Admin@org2.com/'
+    'msp/keystore/5a490a6a8529ed9a2a4442ed44f24cc53c2db733bb025b63ce605719f3184ae2_sk'
+)
+
+
+def test_user_replace_signs_with_new_key(org1_user):
+    """ Tests copies of a user with a different key sign with that key """
+    org2_user = User(msp_id='Org2MSP', cert=org1_user.cert, key_path=ORG2_KEY_PATH)
+    sign(org1_user, b'message')
+    user = replace(org1_user, key=org2_user.key)
+    assert user.active_signer is not org1_user.active_signer
+    assert _verify(org2_user, b'message', sign(user, b'message'))
+
+    user = replace(org1_user, key=None, key_path=org2_user.key_path)
+    assert _verify(org2_user, b'message', sign(user, b'message'))
+
+    user.key = org1_user.key
+    assert _verify(org1_user, b'message', sign(user, b'message'))
+
+
+def test_user_signer_without_key(org1_user):
+    """ Tests users don't require a private key if given a signer """
+    user = User(
+        msp_id='Org1MSP', cert=org1_user.cert, signer=org1_user.active_signer
+    )
+    assert user.private_key is None
+    assert _verify(org1_user, b'message', sign(user, b'message'))
+
+
+@pytest.mark.asyncio
+async def test_thread_pool_signer(org1_user):
+    """ Tests ThreadPoolSigner() signs concurrently on an executor """
+    with ThreadPoolExecutor(4) as executor:
+        org1_user.signer = ThreadPoolSigner(org1_user.private_key, executor=executor)
+        messages = [f'message-{idx}'.encode() for idx in range(8)]
+        signatures = await asyncio.gather(*[
+            sign_async(org1_user, message) for message in messages
+        ])
+    assert all(
+        _verify(org1_user, message, signature)
+        for message, signature in zip(messages, signatures)
+    )
+
+
+async def _start_daemon(user, tmp_path):
+    daemon = SigningDaemon(
+        str(tmp_path / 'signer.sock'), InProcessSigner(user.private_key)
+    )
+    await daemon.start()
+    return daemon
+
+
+@pytest.mark.asyncio
+async def test_socket_signer(org1_user, tmp_path):
+    """ Tests SocketSigner() signs through the signing daemon """
+    daemon = await _start_daemon(org1_user, tmp_path)
+    signer = SocketSigner(daemon.socket_path, max_connections=2)
+    messages = [f'message-{idx}'.encode() for idx in range(5)]
+    signatures = await asyncio.gather(*[
+        signer.sign(message) for message in messages
+    ])
+    assert all(
+        _verify(org1_user, message, signature)
+        for message, signature in zip(messages, signatures)
+    )
+    assert len(signer._idle) <= 2 # pylint: disable=protected-access
+
+    loop = asyncio.get_event_loop()
+    signature = await loop.run_in_executor(None, signer.sign_sync, b'sync')
+    assert _verify(org1_user, b'sync', signature)
+    signer.close()
+    await daemon.close()
+
+
+@pytest.mark.asyncio
+async def test_signing_daemon_socket_private(org1_user, tmp_path):
+    """ Tests only the owner can connect to the signing daemon's socket """
+    daemon = await _start_daemon(org1_user, tmp_path)
+    assert not stat.S_IMODE(os.stat(daemon.socket_path).st_mode) & 0o077
+    await daemon.close()
+
+
+@pytest.mark.asyncio
+async def test_socket_signer_errors(org1_user, tmp_path):
+    """ Tests SocketSigner() raises signing errors """
+    class _FailingSigner(Signer):
+        def sign_sync(self, message):
+            raise ValueError('no key')
+
+    daemon = await _start_daemon(org1_user, tmp_path)
+    daemon.signer = _FailingSigner()
+    with pytest.raises(SigningError, match='no key'):
+        await SocketSigner(daemon.socket_path).sign(b'message')
+    await daemon.close()
+
+    with pytest.raises(SigningError):
+        await SocketSigner(str(tmp_path / 'missing.sock')).sign(b'message')
+    with pytest.raises(SigningError):
+        SocketSigner(str(tmp_path / 'missing.sock')).sign_sync(b'message')
+
+
+@pytest.mark.asyncio
+async def test_socket_signer_cancelled(org1_user, tmp_path, monkeypatch):
+    """ Tests SocketSigner() closes connections interrupted by cancellation,
+        rather than reusing them
+    """
+    release = asyncio.Event()
+
+    class _SlowSigner(InProcessSigner):
+        async def sign(self, message):
+            await release.wait()
+            return await super().sign(message)
+
+    daemon = await _start_daemon(org1_user, tmp_path)
+    daemon.signer = _SlowSigner(org1_user.private_key)
+    writers = []
+    open_unix_connection = asyncio.open_unix_connection
+
+    async def _open(path):
+        reader, writer = await open_unix_connection(path)
+        writers.append(writer)
+        return reader, writer
+    monkeypatch.setattr(asyncio, 'open_unix_connection', _open)
+
+    signer = SocketSigner(daemon.socket_path)
+    signing = asyncio.ensure_future(signer.sign(b'message'))
+    await asyncio.sleep(0.05)
+    signing.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await signing
+    assert not signer._idle # pylint: disable=protected-access
+    assert writers[0].is_closing()
+
+    release.set()
+    assert _verify(org1_user, b'message', await signer.sign(b'message'))
+    signer.close()
+    await daemon.close()
+
+
+@pytest.mark.asyncio
+async def test_generated_tx_signed(org1_user):
+    """ Tests proposals are signed the same way synchronously and async """
+    generated = build_generated_tx(org1_user, 'mycc', [b'fcn'])
+    generated_async = await build_generated_tx_async(org1_user, 'mycc', [b'fcn'])
+    for signed in (generated.signed_proposal, generated_async.signed_proposal):
+        assert _verify(org1_user, signed.proposal_bytes, signed.signature)
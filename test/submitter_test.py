@@ -0,0 +1,157 @@
+"""
+    Tests for the submitter module
+"""
+
+import asyncio
+
+import pytest
+
+from snakeskin.errors import TrasactionCommitError, TransactionValidationError
+from snakeskin.models import Peer, Orderer, Channel, ChaincodeSpec
+from snakeskin.models.gateway import Gateway
+from snakeskin.protos.common.common_pb2 import Status
+from snakeskin.protos.orderer.ab_pb2 import BroadcastResponse
+from snakeskin.protos.peer.transaction_pb2 import TxValidationCode
+from snakeskin.submitter import TransactionSubmitter
+
+
+class _Gateway:
+    """ Stands in for a gateway, recording how many transactions are in each
+        stage
+    """
+
+    def __init__(self, delay=0.01, errors=None):
+        self.delay = delay
+        self.errors = errors or {}
+        self.active = {'propose': 0, 'submit': 0, 'wait_for_commit': 0, 'all': 0}
+        self.peak = dict(self.active)
+        self.count = 0
+
+    async def transact_async(self, fcn, args, transient_map):
+        self.count += 1
+        return _Builder(self, fcn, args)
+
+
+class _Builder:
+    def __init__(self, gateway, fcn, args):
+        self.gateway = gateway
+        self.fcn = fcn
+        self.args = args
+
+    def propose(self):
+        return self._stage('propose')
+
+    def submit(self):
+        return self._stage('submit')
+
+    def wait_for_commit(self, timeout):
+        return self._stage('wait_for_commit')
+
+    async def _stage(self, name):
+        active, peak = self.gateway.active, self.gateway.peak
+        if name == 'propose':
+            active['all'] += 1
+            peak['all'] = max(peak['all'], active['all'])
+        active[name] += 1
+        peak[name] = max(peak[name], active[name])
+        try:
+            await asyncio.sleep(self.gateway.delay)
+            if name == 'wait_for_commit' and self.fcn in self.gateway.errors:
+                raise self.gateway.errors[self.fcn]
+        finally:
+            active[name] -= 1
+            if name == 'wait_for_commit':
+                active['all'] -= 1
+        return (self.fcn, self.args)
+
+
+@pytest.mark.asyncio
+async def test_submitter_limits():
+    """ Tests the in-flight and per-stage limits, and that every future
+        resolves to its transaction
+    """
+    gateway = _Gateway()
+    async with TransactionSubmitter(
+            gateway, max_in_flight=4, max_broadcasting=1) as submitter:
+        futures = [await submitter.submit('move', [str(idx)]) for idx in range(12)]
+    assert [await future for future in futures] == [
+        ('move', [str(idx)]) for idx in range(12)
+    ]
+    assert gateway.peak['all'] == 4
+    assert gateway.peak['submit'] == 1
+    assert submitter.stats.succeeded == 12
+    assert submitter.in_flight == 0
+
+    with pytest.raises(ValueError):
+        await submitter.submit('move')
+
+
+@pytest.mark.asyncio
+async def test_submitter_backpressure():
+    """ Tests submitting waits while the queue is full """
+    submitter = TransactionSubmitter(_Gateway(delay=0.05), max_in_flight=1, max_queued=1)
+    await submitter.submit('move')
+    await asyncio.sleep(0)
+    await submitter.submit('move')
+    blocked = asyncio.ensure_future(submitter.submit('move'))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    assert submitter.queue_depth == 1
+    await (await blocked)
+    await submitter.close()
+
+
+@pytest.mark.asyncio
+async def test_submitter_aimd():
+    """ Tests the limit halves on overload errors, is not cut by
+        transaction errors, and grows while transactions are queued
+    """
+    gateway = _Gateway(errors={
+        'timeout': asyncio.TimeoutError(),
+        'conflict': TransactionValidationError(TxValidationCode.MVCC_READ_CONFLICT),
+        'rejected': TrasactionCommitError(
+            'Failed', 'tx', BroadcastResponse(status=Status.BAD_REQUEST)
+        ),
+    })
+    submitter = TransactionSubmitter(gateway, max_in_flight=8, min_in_flight=2)
+
+    with pytest.raises(TransactionValidationError):
+        await (await submitter.submit('conflict'))
+    assert submitter.limit == 8
+
+    with pytest.raises(TrasactionCommitError):
+        await (await submitter.submit('rejected'))
+    assert submitter.limit == 8
+
+    with pytest.raises(asyncio.TimeoutError):
+        await (await submitter.submit('timeout'))
+    assert submitter.limit == 4
+    assert submitter.stats.overloaded == 1
+
+    futures = [await submitter.submit('move') for _ in range(20)]
+    await asyncio.gather(*futures)
+    assert 4 < submitter.limit <= 8
+    assert gateway.peak['all'] <= 8
+    await submitter.close()
+
+    with pytest.raises(ValueError):
+        TransactionSubmitter(gateway, max_in_flight=2, min_in_flight=3)
+
+
+def test_gateway_submitter(org1_user):
+    """ Tests Gateway().submitter requires a transactable gateway """
+    gateway = Gateway(
+        endorsing_peers=[Peer(endpoint='peer.host.com')],
+        orderers=[Orderer(endpoint='orderer.host.com')],
+        requestor=org1_user,
+        channel=Channel(name='mychannel'),
+        chaincode=ChaincodeSpec(name='mycc'),
+    )
+    submitter = gateway.submitter(max_in_flight=16)
+    assert submitter.gateway is gateway
+    assert submitter.limit == 16
+    assert submitter.options.max_in_flight == 16
+
+    gateway.channel = None
+    with pytest.raises(ValueError):
+        gateway.submitter()
@@ -0,0 +1,249 @@
+"""
+    Tests for the verify module
+"""
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from hashlib import sha256
+
+import pytest
+
+from snakeskin.protos.common.common_pb2 import (
+    BlockHeader,
+    BlockData,
+    BlockMetadata,
+    Envelope,
+    Payload,
+    Header,
+    ChannelHeader,
+    SignatureHeader,
+    Metadata,
+    MetadataSignature,
+)
+from snakeskin.protos.msp.identities_pb2 import SerializedIdentity
+from snakeskin.protos.peer.proposal_response_pb2 import Endorsement
+from snakeskin.protos.peer.transaction_pb2 import (
+    Transaction,
+    TransactionAction,
+    ChaincodeActionPayload,
+    ChaincodeEndorsedAction,
+)
+from snakeskin.constants import TransactionType
+from snakeskin.models.block import RawBlock
+from snakeskin.errors import BlockVerificationError
+from snakeskin.verify import (
+    BlockChainVerifier,
+    SignatureVerifier,
+    block_header_bytes,
+    block_header_hash,
+    block_data_hash,
+    collect_signed_items,
+    verify_signatures,
+)
+
+
+def _build_chain(length):
+    blocks = []
+    previous_hash = b''
+    for number in range(length):
+        data = BlockData(data=[f'tx-{number}-{idx}'.encode() for idx in range(3)])
+        header = BlockHeader(
+            number=number,
+            previous_hash=previous_hash,
+            data_hash=block_data_hash(data),
+        )
+        blocks.append(RawBlock(header=header, data=data, metadata=BlockMetadata()))
+        previous_hash = block_header_hash(header)
+    return blocks
+
+
+def test_block_header_bytes():
+    """ Tests the ASN.1 DER encoding of block headers """
+    header = BlockHeader(number=0, previous_hash=b'', data_hash=b'\x01' * 32)
+    assert block_header_bytes(header) == (
+        b'\x30\x27' b'\x02\x01\x00' b'\x04\x00' b'\x04\x20' + b'\x01' * 32
+    )
+    header = BlockHeader(number=128, previous_hash=b'\x02' * 200, data_hash=b'')
+    assert block_header_bytes(header) == (
+        b'\x30\x81\xd1' b'\x02\x02\x00\x80' b'\x04\x81\xc8' + b'\x02' * 200
+        + b'\x04\x00'
+    )
+
+
+def test_block_data_hash(genesis_block):
+    """ Tests block data hashes match the genesis block header """
+    assert block_data_hash(genesis_block.data) == genesis_block.header.data_hash
+    assert block_data_hash(BlockData()) == sha256().digest()
+
+
+def test_verify_chain():
+    """ Tests BlockChainVerifier().verify accepts a valid chain """
+    verifier = BlockChainVerifier()
+    for block in _build_chain(5):
+        assert verifier.verify(block) == block_header_hash(block.header)
+    assert verifier.previous_hash == block_header_hash(block.header)
+
+
+def test_verify_bad_data():
+    """ Tests BlockChainVerifier().verify detects tampered data """
+    blocks = _build_chain(2)
+    blocks[1].data.data[0] = b'tampered'
+    verifier = BlockChainVerifier()
+    verifier.verify(blocks[0])
+    with pytest.raises(BlockVerificationError, match='data hash'):
+        verifier.verify(blocks[1])
+
+
+def test_verify_broken_chain():
+    """ Tests BlockChainVerifier().verify detects a broken hash chain """
+    blocks = _build_chain(3)
+    verifier = BlockChainVerifier()
+    verifier.verify(blocks[0])
+    with pytest.raises(BlockVerificationError, match='previous hash'):
+        verifier.verify(blocks[2])
+
+
+@pytest.mark.asyncio
+async def test_verify_stream():
+    """ Tests BlockChainVerifier().verify_stream on a thread pool """
+    blocks = _build_chain(10)
+
+    async def _stream():
+        for block in blocks:
+            yield block
+
+    verifier = BlockChainVerifier()
+    with ThreadPoolExecutor(2) as executor:
+        verified = [
+            block async for block in verifier.verify_stream(_stream(), executor)
+        ]
+    assert verified == blocks
+
+
+@pytest.mark.asyncio
+async def test_verify_stream_tampered():
+    """ Tests BlockChainVerifier().verify_stream raises on tampering """
+    blocks = _build_chain(4)
+    blocks[2].header.previous_hash = b'nope'
+
+    async def _stream():
+        for block in blocks:
+            yield block
+
+    verified = []
+    with pytest.raises(BlockVerificationError):
+        async for block in BlockChainVerifier().verify_stream(_stream()):
+            verified.append(block)
+    assert verified == blocks[:2]
+
+
+def _sign(user, message):
+    return user.crypto_suite.sign(user.private_key, message)
+
+
+def _endorsed_envelope(user, prp_bytes, tamper=False):
+    endorser = SerializedIdentity(
+        mspid=user.msp_id, id_bytes=user.cert
+    ).SerializeToString()
+    signature = _sign(user, prp_bytes + endorser)
+    if tamper:
+        prp_bytes += b'tampered'
+    transaction = Transaction(actions=[
+        TransactionAction(payload=ChaincodeActionPayload(
+            action=ChaincodeEndorsedAction(
+                proposal_response_payload=prp_bytes,
+                endorsements=[
+                    Endorsement(endorser=endorser, signature=signature)
+                ],
+            )
+        ).SerializeToString())
+    ])
+    payload = Payload(
+        header=Header(channel_header=ChannelHeader(
+            type=TransactionType.EndorserTransaction.value,
+        ).SerializeToString()),
+        data=transaction.SerializeToString()
+    )
+    return Envelope(payload=payload.SerializeToString()).SerializeToString()
+
+
+def _signed_block(user, envelopes):
+    header = BlockHeader(number=3, data_hash=b'\x05' * 32)
+    signature_header = SignatureHeader(
+        creator=SerializedIdentity(
+            mspid=user.msp_id, id_bytes=user.cert
+        ).SerializeToString(),
+        nonce=b'nonce'
+    ).SerializeToString()
+    value = b'metadata-value'
+    signatures = Metadata(value=value, signatures=[MetadataSignature(
+        signature_header=signature_header,
+        signature=_sign(
+            user, value + signature_header + block_header_bytes(header)
+        ),
+    )]).SerializeToString()
+    return RawBlock(
+        header=header,
+        data=BlockData(data=envelopes),
+        metadata=BlockMetadata(metadata=[signatures, signatures, b''])
+    )
+
+
+def test_collect_signed_items(org1_user):
+    """ Tests collect_signed_items finds endorsements and orderer signatures """
+    block = _signed_block(org1_user, [
+        _endorsed_envelope(org1_user, b'prp-0'),
+        _endorsed_envelope(org1_user, b'prp-1'),
+    ])
+    items = collect_signed_items(block)
+    assert [(item.kind, item.tx_index) for item in items] == [
+        ('endorsement', 0),
+        ('endorsement', 1),
+        ('block_signature', None),
+        ('last_config_signature', None),
+    ]
+    assert all(item.msp_id == 'Org1MSP' for item in items)
+    assert all(item.cert == org1_user.cert for item in items)
+    assert all(verify_signatures(
+        [(item.msp_id, item.cert, item.message, item.signature) for item in items]
+    ))
+
+
+def test_verify_signatures_malformed(org1_user):
+    """ Tests verify_signatures reports malformed signatures as invalid """
+    assert verify_signatures([
+        ('Org1MSP', org1_user.cert, b'message', b'not a signature'),
+        ('Org1MSP', b'not a cert', b'message', _sign(org1_user, b'message')),
+        ('Org1MSP', org1_user.cert, b'message', _sign(org1_user, b'message')),
+    ]) == [False, False, True]
+
+
+@pytest.mark.asyncio
+async def test_signature_verifier(org1_user):
+    """ Tests SignatureVerifier().verify_block reports invalid signatures """
+    block = _signed_block(org1_user, [
+        _endorsed_envelope(org1_user, b'prp-0'),
+        _endorsed_envelope(org1_user, b'prp-1', tamper=True),
+        _endorsed_envelope(org1_user, b'prp-2'),
+    ])
+    with ThreadPoolExecutor(2) as executor:
+        verifier = SignatureVerifier(executor, batch_size=2)
+        result = await verifier.verify_block(block)
+        verifier.close()
+        assert not executor._shutdown # pylint: disable=protected-access
+
+    assert result.block_number == 3
+    assert result.checked == 5
+    assert not result.valid
+    assert [(item.kind, item.tx_index) for item in result.invalid] == [
+        ('endorsement', 1)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_signature_verifier_processes(org1_user):
+    """ Tests SignatureVerifier() verifies on worker processes """
+    block = _signed_block(org1_user, [_endorsed_envelope(org1_user, b'prp')])
+    with ProcessPoolExecutor(2) as executor:
+        result = await SignatureVerifier(executor).verify_block(block)
+    assert result.valid
+    assert result.checked == 3